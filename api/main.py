@@ -6,6 +6,7 @@ Main entry point for the web API
 
 import os
 import torch
+from typing import List, Literal
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Query, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
@@ -16,7 +17,8 @@ from pathlib import Path
 
 from api.models import (
     SearchResponse, SearchFilters, HealthResponse, ErrorResponse,
-    SearchMode, GroupedSearchResponse, BatchSearchRequest, BatchSearchResponse
+    SearchMode, GroupedSearchResponse, BatchSearchRequest, BatchSearchResponse,
+    StatsResponse, SearchResult, OrderedPage
 )
 from api.search_service import SearchService
 
@@ -28,6 +30,38 @@ QDRANT_API_KEY = os.getenv('QDRANT_API_KEY')
 QDRANT_URL = os.getenv('QDRANT_URL')
 COLLECTION_NAME = os.getenv('COLLECTION_NAME')
 MODEL_NAME = os.getenv('MODEL_NAME', 'BAAI/bge-m3')
+EMBEDDING_CACHE_PATH = os.getenv('EMBEDDING_CACHE_PATH')  # Optional on-disk query embedding cache
+
+# Shared Qdrant connection pool
+QDRANT_TIMEOUT = int(os.getenv('QDRANT_TIMEOUT', 60))
+QDRANT_MAX_CONNECTIONS = int(os.getenv('QDRANT_MAX_CONNECTIONS', 20))
+QDRANT_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv('QDRANT_MAX_KEEPALIVE_CONNECTIONS', 10))
+QDRANT_KEEPALIVE_EXPIRY = float(os.getenv('QDRANT_KEEPALIVE_EXPIRY', 30))
+
+# Concurrent BGE-M3 query encodes (CPU-bound, run off the event loop)
+QUERY_ENCODE_WORKERS = int(os.getenv('QUERY_ENCODE_WORKERS', 2))
+
+# Micro-batching: concurrent queries arriving within the window share one forward pass
+QUERY_BATCH_MAX_SIZE = int(os.getenv('QUERY_BATCH_MAX_SIZE', 16))
+QUERY_BATCH_MAX_WAIT_MS = float(os.getenv('QUERY_BATCH_MAX_WAIT_MS', 5))
+
+# In-memory query embedding cache (size 0 disables it, TTL 0 never expires)
+QUERY_CACHE_SIZE = int(os.getenv('QUERY_CACHE_SIZE', 1024))
+QUERY_CACHE_TTL = float(os.getenv('QUERY_CACHE_TTL', 3600))
+
+# Search response cache, invalidated when the collection version changes
+RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', 512))
+RESPONSE_CACHE_TTL = float(os.getenv('RESPONSE_CACHE_TTL', 0))  # 0 = until the collection changes
+COLLECTION_VERSION_POLL_SECONDS = float(os.getenv('COLLECTION_VERSION_POLL_SECONDS', 10))
+
+# Dense vector search defaults: the collection profile's, unless overridden
+COLLECTION_PROFILE = os.getenv('COLLECTION_PROFILE', 'standard')
+HNSW_EF = int(os.getenv('HNSW_EF', 0)) or None
+QUANTIZATION_OVERSAMPLING = float(os.getenv('QUANTIZATION_OVERSAMPLING', 0)) or None
+
+# Hybrid fusion: "server" (Qdrant prefetch + RRF) or client-side "rrf" / "weighted" / "max"
+HYBRID_FUSION = os.getenv('HYBRID_FUSION', 'server')
+HYBRID_DENSE_WEIGHT = float(os.getenv('HYBRID_DENSE_WEIGHT', 0.5))
 
 # Device detection
 DEVICE = "mps" if torch.backends.mps.is_available() else "cuda" if torch.cuda.is_available() else "cpu"
@@ -36,7 +70,7 @@ DEVICE = "mps" if torch.backends.mps.is_available() else "cuda" if torch.cuda.is
 # Lifespan context manager for startup/shutdown
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Load model once at startup, cleanup on shutdown"""
+    """Load model and open the Qdrant connection pool at startup, close both on shutdown"""
     # Startup: Load model
     print(f"Loading BGE-M3 model on device: {DEVICE}...")
     app.state.search_service = SearchService(
@@ -44,15 +78,35 @@ async def lifespan(app: FastAPI):
         qdrant_api_key=QDRANT_API_KEY,
         collection_name=COLLECTION_NAME,
         model_name=MODEL_NAME,
-        device=DEVICE
+        device=DEVICE,
+        embedding_cache_path=EMBEDDING_CACHE_PATH,
+        timeout=QDRANT_TIMEOUT,
+        max_connections=QDRANT_MAX_CONNECTIONS,
+        max_keepalive_connections=QDRANT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=QDRANT_KEEPALIVE_EXPIRY,
+        fusion=HYBRID_FUSION,
+        dense_weight=HYBRID_DENSE_WEIGHT,
+        encode_workers=QUERY_ENCODE_WORKERS,
+        query_batch_max_size=QUERY_BATCH_MAX_SIZE,
+        query_batch_max_wait_ms=QUERY_BATCH_MAX_WAIT_MS,
+        collection_profile=COLLECTION_PROFILE,
+        hnsw_ef=HNSW_EF,
+        oversampling=QUANTIZATION_OVERSAMPLING,
+        query_cache_size=QUERY_CACHE_SIZE,
+        query_cache_ttl=QUERY_CACHE_TTL or None,
+        response_cache_size=RESPONSE_CACHE_SIZE,
+        response_cache_ttl=RESPONSE_CACHE_TTL or None,
+        version_poll_seconds=COLLECTION_VERSION_POLL_SECONDS
     )
     app.state.search_service.load_model()
     print("Model loaded successfully")
+    app.state.search_service.connect()
 
     yield
 
-    # Shutdown: Cleanup if needed
+    # Shutdown: close pooled Qdrant connections
     print("Shutting down...")
+    await app.state.search_service.close()
 
 
 # Create FastAPI app
@@ -87,7 +141,7 @@ async def root():
 @app.get("/api/health", response_model=HealthResponse)
 async def health_check():
     """Health check endpoint"""
-    health = app.state.search_service.health_check()
+    health = await app.state.search_service.health_check()
     return HealthResponse(
         status="healthy" if health["model_loaded"] and health["qdrant_connected"] else "degraded",
         model_loaded=health["model_loaded"],
@@ -95,6 +149,33 @@ async def health_check():
     )
 
 
+@app.get("/api/stats", response_model=StatsResponse)
+async def stats():
+    """Cache hit/miss/eviction counters"""
+    return StatsResponse(**app.state.search_service.cache_stats())
+
+
+def build_search_response(
+    query: str,
+    results: List[SearchResult] | OrderedPage,
+    execution_time_ms: float,
+    filters: SearchFilters
+) -> SearchResponse:
+    """SearchResponse for a result list, or an order_by page with its cursor"""
+    next_cursor = None
+    if isinstance(results, OrderedPage):
+        results, next_cursor = results.results, results.next_cursor
+
+    return SearchResponse(
+        query=query,
+        total_results=len(results),
+        execution_time_ms=round(execution_time_ms, 2),
+        results=results,
+        filters=filters,
+        next_cursor=next_cursor
+    )
+
+
 @app.get("/api/search")
 async def search(
     q: str = Query(..., description="Search query", min_length=1),
@@ -107,11 +188,22 @@ async def search(
 
     # Search mode parameters
     search_mode: SearchMode = Query(SearchMode.VECTOR, description="Search mode"),
+    dense_prefetch: int = Query(None, ge=1, le=1000, description="Dense candidates fused per query"),
+    sparse_prefetch: int = Query(None, ge=1, le=1000, description="Sparse candidates fused per query"),
+    fusion: Literal["server", "rrf", "weighted", "max"] = Query(None, description="Hybrid fusion strategy"),
+    dense_weight: float = Query(None, ge=0, le=1, description="Dense score weight for weighted fusion"),
+    hnsw_ef: int = Query(None, ge=1, le=4096, description="HNSW search breadth for the dense branch"),
+    oversampling: float = Query(None, ge=1, le=16, description="Quantized candidates per result before rescoring"),
     positive_ids: str = Query(None, description="Comma-separated positive IDs for recommend mode"),
     negative_ids: str = Query(None, description="Comma-separated negative IDs for recommend mode"),
     order_by_field: str = Query(None, description="Field to order by (e.g., 'timestamp')"),
     order_direction: str = Query("desc", description="Sort direction (asc/desc)"),
+    order_by_candidates: int = Query(None, ge=1, le=1000, description="Only order the top N matches of the query"),
+    score_threshold: float = Query(None, description="Only order points whose dense score reaches this threshold"),
+    cursor: str = Query(None, description="Cursor from a previous order_by page"),
     mmr_diversity: float = Query(None, ge=0, le=1, description="MMR diversity (0=relevance, 1=diversity)"),
+    mmr_candidates: int = Query(None, ge=1, le=1000, description="Candidates re-ranked by MMR (default 2x limit)"),
+    mmr_relevance: Literal["dense", "sparse", "hybrid"] = Query("dense", description="Score used as MMR relevance"),
     group_by: str = Query(None, description="Field to group by (e.g., 'platform')"),
     group_size: int = Query(3, ge=1, le=10, description="Results per group")
 ):
@@ -119,11 +211,12 @@ async def search(
     Execute search across conversation history.
 
     Supports multiple search modes:
-    - vector: Standard hybrid vector search (dense + sparse)
+    - vector: Hybrid search (dense + sparse, fused server-side with RRF)
     - recommend: Find similar using positive/negative examples
-    - order_by: Sort by field instead of relevance
+    - order_by: Browse matches sorted by a numeric field (default timestamp), paged by cursor
     - mmr: Maximal Marginal Relevance for diverse results
     - groups: Group results by field
+    - rerank: Hybrid candidates reranked by ColBERT MaxSim (collection uploaded with --colbert)
 
     Returns relevant conversation chunks with scores and metadata.
     """
@@ -141,17 +234,28 @@ async def search(
             date_to=date_to,
             metadata_filter=metadata_filter,
             search_mode=search_mode,
+            dense_prefetch_limit=dense_prefetch,
+            sparse_prefetch_limit=sparse_prefetch,
+            fusion=fusion,
+            dense_weight=dense_weight,
+            hnsw_ef=hnsw_ef,
+            oversampling=oversampling,
             positive_ids=positive_list,
             negative_ids=negative_list,
             order_by_field=order_by_field,
             order_direction=order_direction,
+            order_by_candidates=order_by_candidates,
+            score_threshold=score_threshold,
+            cursor=cursor,
             mmr_diversity=mmr_diversity,
+            mmr_candidates=mmr_candidates,
+            mmr_relevance=mmr_relevance,
             group_by=group_by,
             group_size=group_size
         )
 
         # Execute search
-        results, execution_time_ms = app.state.search_service.search(q, filters)
+        results, execution_time_ms = await app.state.search_service.search(q, filters)
 
         # Return appropriate response based on search mode
         if search_mode == SearchMode.GROUPS:
@@ -163,13 +267,7 @@ async def search(
                 filters=filters
             )
         else:
-            return SearchResponse(
-                query=q,
-                total_results=len(results),
-                execution_time_ms=round(execution_time_ms, 2),
-                results=results,
-                filters=filters
-            )
+            return build_search_response(q, results, execution_time_ms, filters)
 
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -177,6 +275,33 @@ async def search(
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
 
 
+@app.post("/api/search/batch", response_model=BatchSearchResponse)
+async def search_batch(request: BatchSearchRequest):
+    """
+    Execute many searches with shared filters in one call.
+
+    In vector mode all queries are encoded with a single BGE-M3 call and
+    searched with a single Qdrant batch request. Groups mode is not supported.
+
+    Returns one SearchResponse per query, in request order.
+    """
+    try:
+        outcomes, total_time_ms = await app.state.search_service.search_batch(request.queries, request.filters)
+
+        return BatchSearchResponse(
+            results=[
+                build_search_response(query, results, execution_time_ms, request.filters)
+                for query, (results, execution_time_ms) in zip(request.queries, outcomes)
+            ],
+            total_execution_time_ms=round(total_time_ms, 2)
+        )
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch search failed: {str(e)}")
+
+
 # Mount static files for frontend assets
 frontend_dir = Path(__file__).parent.parent / "frontend"
 if frontend_dir.exists():
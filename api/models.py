@@ -7,6 +7,9 @@ from typing import Optional, List, Dict, Any, Literal
 from datetime import datetime
 from enum import Enum
 
+# Upper bound on queries per /api/search/batch request (one encode + one Qdrant call)
+MAX_BATCH_QUERIES = 256
+
 
 class SearchMode(str, Enum):
     """Available search modes"""
@@ -16,33 +19,86 @@ class SearchMode(str, Enum):
     ORDER_BY = "order_by"  # Sort by field instead of relevance
     MMR = "mmr"  # Maximal Marginal Relevance (diverse results)
     GROUPS = "groups"  # Group results by field
+    RERANK = "rerank"  # Hybrid candidates reranked by ColBERT MaxSim
+
+
+def payload_indexes(*declarations: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Field metadata naming the payload indexes a filter reads
+
+    Collected by retrieval/payload_indexes.py, which creates them on the
+    collection. Each declaration is {"field", "type", optional "is_tenant" /
+    "is_principal"}; type is keyword, bool, integer, float or datetime.
+    """
+    return {"payload_indexes": list(declarations)}
 
 
 class SearchFilters(BaseModel):
     """Search filter parameters"""
-    platform: Optional[str] = Field(None, description="Filter by platform (chatgpt, claude, claude-projects)")
+    platform: Optional[str] = Field(
+        None, description="Filter by platform (chatgpt, claude, claude-projects)",
+        json_schema_extra=payload_indexes({"field": "platform", "type": "keyword", "is_tenant": True})
+    )
     limit: int = Field(10, ge=1, le=100, description="Number of results to return")
-    with_interpretations: bool = Field(False, description="Only return results with AI interpretations")
-    date_from: Optional[str] = Field(None, description="Filter by date (ISO format)")
-    date_to: Optional[str] = Field(None, description="Filter by date (ISO format)")
+    with_interpretations: bool = Field(
+        False, description="Only return results with AI interpretations",
+        json_schema_extra=payload_indexes({"field": "has_interpretations", "type": "bool"})
+    )
+    date_from: Optional[str] = Field(
+        None, description="Filter by date (ISO format)",
+        json_schema_extra=payload_indexes({"field": "timestamp", "type": "float", "is_principal": True})
+    )
+    date_to: Optional[str] = Field(
+        None, description="Filter by date (ISO format)",
+        json_schema_extra=payload_indexes({"field": "timestamp", "type": "float", "is_principal": True})
+    )
     metadata_filter: Optional[str] = Field(None, description="Metadata filter in format 'key:value'")
 
     # Search mode parameters
     search_mode: SearchMode = Field(SearchMode.VECTOR, description="Search mode to use")
 
+    # Hybrid fusion parameters
+    dense_prefetch_limit: Optional[int] = Field(None, ge=1, le=1000, description="Dense candidates fused (or reranked) per query (server default if unset)")
+    sparse_prefetch_limit: Optional[int] = Field(None, ge=1, le=1000, description="Sparse candidates fused (or reranked) per query (server default if unset)")
+    fusion: Optional[Literal["server", "rrf", "weighted", "max"]] = Field(None, description="Hybrid fusion strategy (server default if unset)")
+    dense_weight: Optional[float] = Field(None, ge=0, le=1, description="Dense score weight for weighted fusion (sparse gets the rest)")
+
+    # Dense vector search parameters (collection profile defaults if unset)
+    hnsw_ef: Optional[int] = Field(None, ge=1, le=4096, description="HNSW search breadth (higher = better recall, slower)")
+    oversampling: Optional[float] = Field(None, ge=1, le=16, description="Quantized candidates per result before rescoring")
+
     # Recommend mode parameters
     positive_ids: Optional[List[str]] = Field(None, description="Positive example point IDs for recommend mode")
     negative_ids: Optional[List[str]] = Field(None, description="Negative example point IDs for recommend mode")
 
     # Order by parameters
-    order_by_field: Optional[str] = Field(None, description="Field to order results by (e.g., 'timestamp')")
+    order_by_field: Optional[str] = Field(
+        None, description="Field to order results by (e.g., 'timestamp')",
+        json_schema_extra=payload_indexes(
+            {"field": "timestamp", "type": "float", "is_principal": True},
+            {"field": "conversation_start", "type": "float"},
+            {"field": "turn_number", "type": "integer"},
+        )
+    )
     order_direction: Literal["asc", "desc"] = Field("desc", description="Sort direction")
+    order_by_candidates: Optional[int] = Field(None, ge=1, le=1000, description="Only order the top N hybrid matches of the query")
+    score_threshold: Optional[float] = Field(None, description="Only order points whose dense score reaches this threshold")
+    cursor: Optional[str] = Field(None, description="Cursor from a previous order_by page")
 
     # MMR parameters
     mmr_diversity: Optional[float] = Field(None, ge=0, le=1, description="MMR diversity lambda (0=relevance, 1=diversity)")
+    mmr_candidates: Optional[int] = Field(None, ge=1, le=1000, description="Candidates re-ranked by MMR (default 2x limit)")
+    mmr_relevance: Literal["dense", "sparse", "hybrid"] = Field("dense", description="Score used as MMR relevance")
 
     # Groups parameters
-    group_by: Optional[str] = Field(None, description="Field to group results by (e.g., 'platform', 'conversation_id')")
+    group_by: Optional[str] = Field(
+        None, description="Field to group results by (e.g., 'platform', 'conversation_id')",
+        json_schema_extra=payload_indexes(
+            {"field": "platform", "type": "keyword", "is_tenant": True},
+            {"field": "conversation_id", "type": "keyword"},
+            {"field": "assistant_model", "type": "keyword"},
+        )
+    )
     group_size: Optional[int] = Field(3, ge=1, le=10, description="Number of results per group")
 
 
@@ -74,6 +130,13 @@ class SearchResponse(BaseModel):
     execution_time_ms: float = Field(..., description="Search execution time in milliseconds")
     results: List[SearchResult] = Field(..., description="Search results")
     filters: SearchFilters = Field(..., description="Applied filters")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page (order_by mode)")
+
+
+class OrderedPage(BaseModel):
+    """One page of an order_by scan"""
+    results: List[SearchResult] = Field(..., description="Results in field order")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, None on the last page")
 
 
 class HealthResponse(BaseModel):
@@ -83,6 +146,35 @@ class HealthResponse(BaseModel):
     qdrant_connected: bool = Field(..., description="Whether Qdrant is accessible")
 
 
+class CacheStats(BaseModel):
+    """Counters for an in-memory cache"""
+    size: int = Field(..., description="Entries currently cached")
+    max_size: int = Field(..., description="Maximum number of entries")
+    ttl_seconds: Optional[float] = Field(None, description="Entry lifetime in seconds (None = no expiry)")
+    hits: int = Field(..., description="Lookups served from the cache")
+    misses: int = Field(..., description="Lookups not in the cache (or expired)")
+    evictions: int = Field(..., description="Entries dropped to stay within max_size")
+    expirations: int = Field(..., description="Entries dropped after their TTL")
+    hit_rate: float = Field(..., description="hits / (hits + misses)")
+
+
+class BatcherStats(BaseModel):
+    """Counters for the query encoding micro-batcher"""
+    batches: int = Field(..., description="Forward passes run")
+    queries: int = Field(..., description="Queries encoded through the batcher")
+    avg_batch_size: float = Field(..., description="queries / batches")
+    max_batch_size: int = Field(..., description="Most queries per forward pass")
+    max_wait_ms: float = Field(..., description="Collection window in milliseconds")
+
+
+class StatsResponse(BaseModel):
+    """Service statistics response"""
+    query_embedding_cache: CacheStats = Field(..., description="Query embedding cache counters")
+    response_cache: CacheStats = Field(..., description="Search response cache counters")
+    query_batcher: BatcherStats = Field(..., description="Query encoding micro-batcher counters")
+    colbert_batcher: BatcherStats = Field(..., description="Micro-batcher counters for rerank (ColBERT) queries")
+
+
 class ErrorResponse(BaseModel):
     """Error response"""
     error: str = Field(..., description="Error message")
@@ -106,7 +198,7 @@ class GroupedSearchResponse(BaseModel):
 
 class BatchSearchRequest(BaseModel):
     """Request for batch search"""
-    queries: List[str] = Field(..., description="List of search queries", min_length=1, max_length=10)
+    queries: List[str] = Field(..., description="List of search queries", min_length=1, max_length=MAX_BATCH_QUERIES)
     filters: SearchFilters = Field(default_factory=SearchFilters, description="Filters to apply to all searches")
 
 
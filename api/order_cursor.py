@@ -0,0 +1,45 @@
+"""
+Opaque cursors for order_by pagination
+
+Qdrant's order_by scroll cannot use a point offset; a page continues from
+the last value seen (start_from, inclusive). Points sharing that value may
+straddle the page boundary, so the cursor also carries the IDs already
+returned at that value, which the next page excludes.
+"""
+
+import base64
+import json
+from typing import Any, List, Tuple
+
+
+def encode_cursor(last_value: Any, seen_ids: List[Any]) -> str:
+    """URL-safe cursor for the page after one ending at last_value"""
+    raw = json.dumps({"value": last_value, "ids": seen_ids}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, List[Any]]:
+    """
+    Parse a cursor from encode_cursor
+
+    Returns:
+        Tuple of (start_from value, IDs to skip)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.b64decode(padded.encode(), altchars=b"-_", validate=True))
+        value, ids = data["value"], data["ids"]
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+    # A tampered cursor must fail here (400), not inside the Qdrant call
+    if (
+        isinstance(value, bool) or not isinstance(value, (int, float, type(None)))
+        or not isinstance(ids, list)
+        or any(isinstance(point_id, bool) or not isinstance(point_id, (int, str)) for point_id in ids)
+    ):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return value, ids
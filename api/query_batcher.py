@@ -0,0 +1,153 @@
+"""
+Micro-batching coalescer for query encoding
+
+Concurrent requests each need one query encoded; running them through
+BGE-M3 one at a time wastes most of the CPU's matrix-multiply throughput.
+QueryEncodeBatcher collects queries that arrive within a short window (up
+to a maximum batch size), encodes them in a single forward pass on the
+encode pool, and resolves each caller's future with its own result.
+"""
+
+import asyncio
+from concurrent.futures import Executor
+from typing import Any, Callable, List, Optional, Tuple
+
+
+class QueryEncodeBatcher:
+    """
+    Coalesce concurrent encode requests into batched forward passes
+
+    Args:
+        encode_batch: Blocking callable mapping a list of texts to a list of
+            results (same order); runs on the executor
+        executor: Pool the batches run on; its size bounds concurrent batches
+        max_batch_size: Most texts per forward pass
+        max_wait_ms: How long the first query of a batch waits for company
+        max_concurrent_batches: Batches encoding at once (match the pool size)
+    """
+
+    def __init__(
+        self,
+        encode_batch: Callable[[List[str]], List[Any]],
+        executor: Executor,
+        max_batch_size: int = 16,
+        max_wait_ms: float = 5.0,
+        max_concurrent_batches: int = 1,
+    ):
+        self.encode_batch = encode_batch
+        self.executor = executor
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._collector: Optional[asyncio.Task] = None
+        self._batch_slots = asyncio.Semaphore(max(1, max_concurrent_batches))
+        self._batch_tasks: set = set()
+
+        self.batches = 0
+        self.queries = 0
+
+    async def encode(self, text: str) -> Any:
+        """Encode one text, sharing a forward pass with concurrent callers"""
+        if self._collector is None:
+            self._queue = asyncio.Queue()
+            self._collector = asyncio.create_task(self._collect())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def _collect(self):
+        """Form batches: first item opens a window, close on size or deadline"""
+        loop = asyncio.get_running_loop()
+        batch: List[Tuple[str, asyncio.Future]] = []
+
+        try:
+            while True:
+                batch = [await self._queue.get()]
+                deadline = loop.time() + self.max_wait
+
+                while len(batch) < self.max_batch_size:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        # Window closed; still take whatever is already queued
+                        while len(batch) < self.max_batch_size and not self._queue.empty():
+                            batch.append(self._queue.get_nowait())
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        continue
+
+                # Keep collecting the next batch while this one encodes
+                await self._batch_slots.acquire()
+                task = asyncio.create_task(self._run_batch(batch))
+                self._batch_tasks.add(task)
+                task.add_done_callback(self._batch_tasks.discard)
+                batch = []
+        except asyncio.CancelledError:
+            # Closed while a batch was still forming
+            self._fail(batch, RuntimeError("Query batcher closed"))
+            raise
+
+    @staticmethod
+    def _fail(batch: List[Tuple[str, asyncio.Future]], error: BaseException):
+        """Resolve every still-waiting caller in batch with error"""
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+    async def _run_batch(self, batch: List[Tuple[str, asyncio.Future]]):
+        """Encode one batch on the executor and fan results back out"""
+        try:
+            # Identical queries in the same window are encoded once
+            texts = list(dict.fromkeys(text for text, _ in batch))
+            self.batches += 1
+            self.queries += len(batch)
+
+            try:
+                loop = asyncio.get_running_loop()
+                results = await loop.run_in_executor(self.executor, self.encode_batch, texts)
+                if len(results) != len(texts):
+                    raise RuntimeError(f"encode_batch returned {len(results)} results for {len(texts)} texts")
+            except Exception as e:
+                self._fail(batch, e)
+                return
+
+            by_text = dict(zip(texts, results))
+            for text, future in batch:
+                if not future.done():
+                    future.set_result(by_text[text])
+        finally:
+            self._batch_slots.release()
+
+    def stats(self) -> dict:
+        """Batching counters for monitoring"""
+        return {
+            "batches": self.batches,
+            "queries": self.queries,
+            "avg_batch_size": round(self.queries / self.batches, 2) if self.batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+        }
+
+    async def close(self):
+        """
+        Stop the collector and wait for in-flight batches
+
+        Batches already encoding complete normally; callers whose query was
+        still queued or in a forming batch get a RuntimeError.
+        """
+        if self._collector is not None:
+            self._collector.cancel()
+            try:
+                await self._collector
+            except asyncio.CancelledError:
+                pass
+            self._collector = None
+
+            queued = []
+            while not self._queue.empty():
+                queued.append(self._queue.get_nowait())
+            self._fail(queued, RuntimeError("Query batcher closed"))
+        if self._batch_tasks:
+            await asyncio.gather(*self._batch_tasks, return_exceptions=True)
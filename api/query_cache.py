@@ -0,0 +1,106 @@
+"""
+In-process LRU + TTL cache
+
+Used by SearchService to keep recent query embeddings in memory, so
+re-running a query with different filters, modes or pages skips the BGE-M3
+forward pass. Thread-safe: entries are written from the encode pool and
+read from the event loop.
+"""
+
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+def normalize_query(query: str) -> str:
+    """
+    Canonical form of a query for cache keys
+
+    Applies Unicode NFC normalization and collapses whitespace. Case is kept
+    because BGE-M3's tokenizer is case-sensitive.
+    """
+    return " ".join(unicodedata.normalize("NFC", query).split())
+
+
+class LRUTTLCache:
+    """
+    Bounded mapping that evicts the least recently used entry when full and
+    treats entries older than ttl_seconds as missing
+
+    A max_size of 0 disables the cache; a ttl_seconds of 0 or None means
+    entries never expire. clock returns the current time in seconds
+    (monotonic by default; injectable for tests).
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl_seconds: Optional[float] = 3600,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Cached value for key, or None on a miss or expired entry"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, stored_at = entry
+            if self.ttl_seconds and self.clock() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entries if full"""
+        if self.max_size <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (value, self.clock())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all entries (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters and occupancy for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
@@ -1,7 +1,10 @@
 """
 Search service wrapper for API
 
-Provides clean interface to search_engine.py for FastAPI
+Provides clean interface to search_engine.py for FastAPI. The service is
+async end to end: Qdrant I/O goes through AsyncQdrantClient and CPU-bound
+BGE-M3 encoding runs in a bounded thread pool, so the event loop is never
+blocked and one worker can serve many concurrent searches.
 """
 
 import sys
@@ -12,15 +15,44 @@ import numpy as np
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timezone
 import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import httpx
 
 # Add parent to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from qdrant_client import QdrantClient
-from qdrant_client.models import Filter, FieldCondition, MatchValue, SparseVector, Range
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.exceptions import UnexpectedResponse
+from qdrant_client.models import (
+    Filter, FieldCondition, MatchValue, SparseVector, Range, OrderBy, Direction, QueryRequest, HasIdCondition,
+    SearchParams, PayloadSchemaType
+)
 from FlagEmbedding import BGEM3FlagModel
 
-from api.models import SearchResult, SearchFilters, SearchMode, GroupedResults
+from api.models import SearchResult, SearchFilters, SearchMode, GroupedResults, OrderedPage
+from api.query_cache import LRUTTLCache, normalize_query
+from api.query_batcher import QueryEncodeBatcher
+from api.order_cursor import encode_cursor, decode_cursor
+from retrieval.collection_versions import INGESTED_AT_FIELD
+from retrieval.embedding_cache import EmbeddingCache, cached_encode
+from retrieval.search_engine import hybrid_query_request, rerank_query_request, HYBRID_PREFETCH_LIMIT
+from retrieval.fusion import fuse, FUSION_METHODS
+from retrieval.mmr import mmr_rerank
+from retrieval.collection_profiles import get_profile
+
+# Embedding-cache mode used for query vectors (kept apart from document modes)
+QUERY_EMBEDDING_MODE = "query"
+
+# Payload fields with a numeric range index, which order_by requires
+ORDER_BY_FIELDS = ("timestamp", "conversation_start", "turn_number")
+ORDER_BY_INDEX_TYPES = (PayloadSchemaType.INTEGER, PayloadSchemaType.FLOAT)
+
+# Statuses an older Qdrant without prefetch/fusion returns for a fused /points/query
+SERVER_FUSION_UNSUPPORTED_STATUSES = (400, 404)
+
+# Relevant points an order_by scan is restricted to when only a score threshold is set
+ORDER_BY_MAX_CANDIDATES = 1000
 
 
 class SearchService:
@@ -36,7 +68,25 @@ class SearchService:
         qdrant_api_key: str,
         collection_name: str,
         model_name: str,
-        device: str = "cpu"
+        device: str = "cpu",
+        embedding_cache_path: Optional[str] = None,
+        timeout: int = 60,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        fusion: str = "server",
+        dense_weight: float = 0.5,
+        encode_workers: int = 2,
+        query_batch_max_size: int = 16,
+        query_batch_max_wait_ms: float = 5.0,
+        query_cache_size: int = 1024,
+        query_cache_ttl: Optional[float] = 3600,
+        response_cache_size: int = 512,
+        response_cache_ttl: Optional[float] = None,
+        version_poll_seconds: float = 10.0,
+        collection_profile: str = "balanced",
+        hnsw_ef: Optional[int] = None,
+        oversampling: Optional[float] = None
     ):
         self.qdrant_url = qdrant_url
         self.qdrant_api_key = qdrant_api_key
@@ -44,29 +94,123 @@ class SearchService:
         self.model_name = model_name
         self.device = device
 
+        # One long-lived async client shared by all requests
+        self.timeout = timeout
+        self.connection_limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.client: Optional[AsyncQdrantClient] = None
+
+        # Hybrid fusion: "server" (prefetch + RRF) or client-side rrf/weighted/max
+        if fusion != "server" and fusion not in FUSION_METHODS:
+            raise ValueError(f"Unknown fusion method '{fusion}' (choose from server, {', '.join(FUSION_METHODS)})")
+        self.fusion = fusion
+        self.dense_weight = dense_weight
+        self._server_fusion_supported = True
+
+        # Dense search breadth / quantization rescoring, defaulting to the
+        # collection profile's values (requests may override per query)
+        self.collection_profile = get_profile(collection_profile)
+        self.hnsw_ef = hnsw_ef
+        self.oversampling = oversampling
+
+        # Bounded pool for CPU-bound query encoding, off the event loop
+        self.encode_executor = ThreadPoolExecutor(
+            max_workers=encode_workers, thread_name_prefix="query-encode"
+        )
+
+        # Coalesces concurrent cache misses into one forward pass per window
+        self.query_batcher = QueryEncodeBatcher(
+            self._encode_queries_sync,
+            self.encode_executor,
+            max_batch_size=query_batch_max_size,
+            max_wait_ms=query_batch_max_wait_ms,
+            max_concurrent_batches=encode_workers,
+        )
+
+        # Same for rerank queries, which also need ColBERT token vectors
+        self.colbert_batcher = QueryEncodeBatcher(
+            self._encode_queries_colbert_sync,
+            self.encode_executor,
+            max_batch_size=query_batch_max_size,
+            max_wait_ms=query_batch_max_wait_ms,
+            max_concurrent_batches=encode_workers,
+        )
+
         # Model will be loaded once and cached
         self.model: Optional[BGEM3FlagModel] = None
 
+        # In-memory LRU + TTL cache of (dense, sparse[, colbert]) query vectors
+        self.query_embedding_cache = LRUTTLCache(max_size=query_cache_size, ttl_seconds=query_cache_ttl)
+
+        # Full-response cache, keyed by collection version + query + filters and
+        # cleared whenever the collection version changes
+        self.response_cache = LRUTTLCache(max_size=response_cache_size, ttl_seconds=response_cache_ttl)
+        self.version_poll_seconds = version_poll_seconds
+        self._collection_version: Optional[tuple] = None
+        self._version_checked_at = float('-inf')
+        self._version_lock = asyncio.Lock()
+        self._payload_schema: Optional[tuple] = None  # (collection version, payload_schema)
+
+        # Optional persistent cache of query embeddings (shared with uploads)
+        self.embedding_cache: Optional[EmbeddingCache] = (
+            EmbeddingCache(embedding_cache_path, model_name) if embedding_cache_path else None
+        )
+
     def load_model(self):
         """Load BGE-M3 model (called once at startup)"""
         if self.model is None:
             use_fp16 = self.device in ['cuda', 'mps']
             self.model = BGEM3FlagModel(self.model_name, use_fp16=use_fp16, device=self.device)
 
-    def search(
+    def connect(self) -> AsyncQdrantClient:
+        """Create the shared, pooled Qdrant client (called once at startup)"""
+        if self.client is None:
+            self.client = AsyncQdrantClient(
+                url=self.qdrant_url,
+                api_key=self.qdrant_api_key,
+                timeout=self.timeout,
+                prefer_grpc=False,
+                limits=self.connection_limits,  # Forwarded to the httpx connection pool
+            )
+        return self.client
+
+    async def close(self):
+        """Close pooled connections, the encode pool and the embedding cache (called at shutdown)"""
+        if self.client is not None:
+            await self.client.close()
+            self.client = None
+        await self.query_batcher.close()
+        await self.colbert_batcher.close()
+        self.encode_executor.shutdown(wait=True)
+        if self.embedding_cache is not None:
+            self.embedding_cache.close()
+            self.embedding_cache = None
+
+    def _get_client(self) -> AsyncQdrantClient:
+        """Shared client, connecting lazily if startup did not"""
+        return self.client or self.connect()
+
+    async def search(
         self,
         query: str,
         filters: SearchFilters
-    ) -> tuple[List[SearchResult] | List[GroupedResults], float]:
+    ) -> tuple[List[SearchResult] | List[GroupedResults] | OrderedPage, float]:
         """
         Execute search and return structured results.
 
+        Identical (query, filters) requests against an unchanged collection
+        are answered from the response cache without model or Qdrant work.
+
         Supports multiple search modes:
-        - VECTOR: Standard hybrid vector search
+        - VECTOR: Hybrid vector search (server-side RRF fusion)
         - RECOMMEND: Find similar with positive/negative examples
-        - ORDER_BY: Sort by field instead of relevance
+        - ORDER_BY: Page through matches sorted by a numeric field
         - MMR: Maximal Marginal Relevance for diversity
         - GROUPS: Group results by field
+        - RERANK: Hybrid candidates reranked by ColBERT MaxSim
 
         Args:
             query: Search query text
@@ -77,26 +221,216 @@ class SearchService:
         """
         start_time = time.time()
 
-        # Dispatch to appropriate search method based on mode
+        version = await self._get_collection_version()
+        cache_key = None
+        if version is not None:
+            cache_key = (version, normalize_query(query), filters.model_dump_json())
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached, (time.time() - start_time) * 1000
+
+        results, execution_time_ms = await self._dispatch(query, filters, start_time)
+
+        if cache_key is not None:
+            self.response_cache.put(cache_key, results)
+        return results, execution_time_ms
+
+    async def search_batch(
+        self,
+        queries: List[str],
+        filters: SearchFilters
+    ) -> tuple[List[tuple[List[SearchResult] | OrderedPage, float]], float]:
+        """
+        Execute many searches with the same filters.
+
+        In VECTOR mode, queries not in the response cache are encoded in one
+        BGE-M3 call and sent to Qdrant as a single query_batch_points request.
+        Other modes run the per-query searches concurrently.
+
+        Args:
+            queries: Search query texts
+            filters: Search filters applied to every query
+
+        Returns:
+            Tuple of ([(results list, execution_time_ms) per query], total_execution_time_ms)
+
+        Raises:
+            ValueError: For GROUPS mode, whose grouped results have no batch response shape
+        """
+        start_time = time.time()
+
+        if filters.search_mode == SearchMode.GROUPS:
+            raise ValueError("Batch search does not support the groups search mode")
+
+        if filters.search_mode != SearchMode.VECTOR:
+            outcomes = await asyncio.gather(*(self.search(query, filters) for query in queries))
+            return list(outcomes), (time.time() - start_time) * 1000
+
+        version = await self._get_collection_version()
+        filters_key = filters.model_dump_json()
+        cache_keys: List[Optional[tuple]] = [
+            (version, normalize_query(query), filters_key) if version is not None else None
+            for query in queries
+        ]
+
+        results: List[Optional[List[SearchResult]]] = [
+            self.response_cache.get(key) if key is not None else None
+            for key in cache_keys
+        ]
+        pending = [i for i, cached in enumerate(results) if cached is None]
+
+        if pending:
+            encoded = await self._encode_queries([queries[i] for i in pending])
+            fused = await self._batch_hybrid(encoded, self._build_filter(filters), filters)
+
+            for i, points in zip(pending, fused):
+                results[i] = self._convert_to_search_results(points)
+                if cache_keys[i] is not None:
+                    self.response_cache.put(cache_keys[i], results[i])
+
+        # The queries share one round-trip, so each reports the batch latency
+        execution_time_ms = (time.time() - start_time) * 1000
+        return [(query_results, execution_time_ms) for query_results in results], execution_time_ms
+
+    async def _batch_hybrid(
+        self,
+        encoded: List[tuple],
+        query_filter: Optional[Filter],
+        filters: SearchFilters
+    ) -> List[list]:
+        """
+        Hybrid search for many encoded queries in one query_batch_points call
+
+        Server-side fusion sends one prefetch + RRF request per query;
+        client-side fusion sends a dense and a sparse request per query and
+        fuses each pair locally.
+
+        Returns:
+            Fused scored points per query, in input order
+        """
+        client = self._get_client()
+        fusion = filters.fusion or self.fusion
+
+        if fusion == "server" and self._server_fusion_supported:
+            requests = []
+            for query_dense, query_sparse in encoded:
+                request = hybrid_query_request(
+                    self.collection_name,
+                    query_dense,
+                    query_sparse,
+                    query_filter,
+                    filters.limit,
+                    dense_prefetch_limit=filters.dense_prefetch_limit,
+                    sparse_prefetch_limit=filters.sparse_prefetch_limit,
+                    search_params=self._search_params(filters),
+                )
+                del request["collection_name"]
+                requests.append(QueryRequest(**request))
+
+            async def server_fused():
+                responses = await client.query_batch_points(
+                    collection_name=self.collection_name,
+                    requests=requests,
+                )
+                return [response.points for response in responses]
+
+            return await self._fuse_on_server(
+                server_fused,
+                lambda: self._batch_client_side(encoded, query_filter, filters, "rrf"),
+            )
+
+        method = "rrf" if fusion == "server" else fusion
+        return await self._batch_client_side(encoded, query_filter, filters, method)
+
+    async def _batch_client_side(
+        self,
+        encoded: List[tuple],
+        query_filter: Optional[Filter],
+        filters: SearchFilters,
+        method: str
+    ) -> List[list]:
+        """Dense and sparse requests per query in one batch call, fused locally"""
+        client = self._get_client()
+        dense_limit = max(filters.dense_prefetch_limit or HYBRID_PREFETCH_LIMIT, filters.limit)
+        sparse_limit = max(filters.sparse_prefetch_limit or HYBRID_PREFETCH_LIMIT, filters.limit)
+
+        requests = []
+        for query_dense, query_sparse in encoded:
+            requests.append(QueryRequest(
+                query=query_dense.tolist(), using="dense", filter=query_filter,
+                params=self._search_params(filters), limit=dense_limit, with_payload=True,
+            ))
+            requests.append(QueryRequest(
+                query=query_sparse, using="sparse", filter=query_filter,
+                limit=sparse_limit, with_payload=True,
+            ))
+
+        responses = await client.query_batch_points(
+            collection_name=self.collection_name,
+            requests=requests,
+        )
+
+        dense_weight = filters.dense_weight if filters.dense_weight is not None else self.dense_weight
+        return [
+            fuse(method, dense.points, sparse.points, filters.limit, dense_weight=dense_weight)
+            for dense, sparse in zip(responses[::2], responses[1::2])
+        ]
+
+    async def _fuse_on_server(self, server_fused, client_fused):
+        """
+        Run a server-fused request, falling back to client-side fusion
+
+        Only the statuses an older server without prefetch/fusion returns
+        trigger the fallback, and server fusion is switched off for the
+        process only once that fallback has succeeded. Anything else (auth,
+        rate limiting, 5xx) is raised unchanged.
+
+        Args:
+            server_fused: Coroutine function running the server-fused request
+            client_fused: Coroutine function running the client-side equivalent
+        """
+        try:
+            return await server_fused()
+        except UnexpectedResponse as e:
+            if e.status_code not in SERVER_FUSION_UNSUPPORTED_STATUSES:
+                raise
+            results = await client_fused()
+            print(f"⚠️  Server-side fusion unavailable ({e.status_code}); using client-side RRF")
+            self._server_fusion_supported = False
+            return results
+
+    async def _dispatch(
+        self,
+        query: str,
+        filters: SearchFilters,
+        start_time: float
+    ) -> tuple[List[SearchResult] | List[GroupedResults] | OrderedPage, float]:
+        """Run the search method for the requested mode"""
         if filters.search_mode == SearchMode.RECOMMEND:
-            return self._search_recommend(query, filters, start_time)
+            return await self._search_recommend(query, filters, start_time)
         elif filters.search_mode == SearchMode.ORDER_BY:
-            return self._search_order_by(query, filters, start_time)
+            return await self._search_order_by(query, filters, start_time)
         elif filters.search_mode == SearchMode.MMR:
-            return self._search_mmr(query, filters, start_time)
+            return await self._search_mmr(query, filters, start_time)
         elif filters.search_mode == SearchMode.GROUPS:
-            return self._search_groups(query, filters, start_time)
+            return await self._search_groups(query, filters, start_time)
+        elif filters.search_mode == SearchMode.RERANK:
+            return await self._search_rerank(query, filters, start_time)
         else:  # VECTOR mode (default)
-            return self._search_vector(query, filters, start_time)
+            return await self._search_vector(query, filters, start_time)
 
-    def _search_vector(
+    async def _search_vector(
         self,
         query: str,
         filters: SearchFilters,
         start_time: float
     ) -> tuple[List[SearchResult], float]:
         """
-        Standard hybrid vector search (dense + sparse).
+        Hybrid vector search (dense + sparse).
+
+        By default both branches are prefetched and fused with RRF in one
+        request. With client-side fusion configured, or if the server cannot
+        fuse, the branches run concurrently and are fused locally.
 
         Args:
             query: Search query text
@@ -107,54 +441,149 @@ class SearchService:
             Tuple of (results list, execution_time_ms)
         """
         # Encode query into vectors
-        query_dense, query_sparse = self._encode_query(query)
+        query_dense, query_sparse = await self._encode_query(query)
         query_filter = self._build_filter(filters)
 
-        # Connect to Qdrant
-        client = QdrantClient(
-            url=self.qdrant_url,
-            api_key=self.qdrant_api_key,
-            timeout=60,
-            prefer_grpc=False,
-        )
+        fusion = filters.fusion or self.fusion
+
+        if fusion == "server" and self._server_fusion_supported:
+            async def server_fused():
+                # Single round-trip: dense + sparse prefetch fused server-side with RRF
+                response = await self._get_client().query_points(**hybrid_query_request(
+                    self.collection_name,
+                    query_dense,
+                    query_sparse,
+                    query_filter,
+                    filters.limit,
+                    dense_prefetch_limit=filters.dense_prefetch_limit,
+                    sparse_prefetch_limit=filters.sparse_prefetch_limit,
+                    search_params=self._search_params(filters),
+                ))
+                return response.points
+
+            fused_results = await self._fuse_on_server(
+                server_fused,
+                lambda: self._client_side_hybrid(query_dense, query_sparse, query_filter, filters, "rrf"),
+            )
+        else:
+            method = "rrf" if fusion == "server" else fusion
+            fused_results = await self._client_side_hybrid(query_dense, query_sparse, query_filter, filters, method)
+
+        # Convert to SearchResult models
+        results = self._convert_to_search_results(fused_results)
+        execution_time_ms = (time.time() - start_time) * 1000
+        return results, execution_time_ms
+
+    async def _search_rerank(
+        self,
+        query: str,
+        filters: SearchFilters,
+        start_time: float
+    ) -> tuple[List[SearchResult], float]:
+        """
+        Hybrid retrieval reranked by ColBERT late interaction.
+
+        Dense and sparse candidates (dense_prefetch_limit /
+        sparse_prefetch_limit each) are prefetched and rescored by MaxSim
+        over the stored ColBERT multi-vectors in the same Qdrant request, so
+        long chunks are ranked on token-level matches without a separate
+        cross-encoder pass.
+
+        Args:
+            query: Search query text
+            filters: Search filters
+            start_time: Start time for execution tracking
+
+        Returns:
+            Tuple of (results list, execution_time_ms)
+
+        Raises:
+            ValueError: If the collection was uploaded without ColBERT vectors
+        """
+        query_dense, query_sparse, query_colbert = await self._encode_query(query, colbert=True)
 
         try:
-            # Dense search
-            dense_results = client.query_points(
+            response = await self._get_client().query_points(**rerank_query_request(
+                self.collection_name,
+                query_dense,
+                query_sparse,
+                query_colbert,
+                self._build_filter(filters),
+                filters.limit,
+                dense_prefetch_limit=filters.dense_prefetch_limit,
+                sparse_prefetch_limit=filters.sparse_prefetch_limit,
+                search_params=self._search_params(filters),
+            ))
+        except UnexpectedResponse as e:
+            if e.status_code == 400 and b"colbert" in (e.content or b""):
+                raise ValueError(
+                    f"Collection '{self.collection_name}' has no ColBERT vectors; "
+                    f"re-upload it with --colbert to use rerank mode"
+                ) from e
+            raise
+
+        results = self._convert_to_search_results(response.points)
+        execution_time_ms = (time.time() - start_time) * 1000
+        return results, execution_time_ms
+
+    async def _client_side_hybrid(
+        self,
+        query_dense,
+        query_sparse: SparseVector,
+        query_filter: Optional[Filter],
+        filters: SearchFilters,
+        method: str
+    ) -> list:
+        """
+        Run the dense and sparse searches concurrently and fuse them locally.
+
+        Latency is max(dense, sparse) rather than their sum.
+
+        Args:
+            method: Fusion strategy ("rrf", "weighted" or "max")
+
+        Returns:
+            Fused scored points, best first
+        """
+        client = self._get_client()
+        dense_limit = max(filters.dense_prefetch_limit or HYBRID_PREFETCH_LIMIT, filters.limit)
+        sparse_limit = max(filters.sparse_prefetch_limit or HYBRID_PREFETCH_LIMIT, filters.limit)
+
+        dense_response, sparse_response = await asyncio.gather(
+            client.query_points(
                 collection_name=self.collection_name,
                 query=query_dense.tolist(),
                 using="dense",
                 query_filter=query_filter,
-                limit=filters.limit,
+                search_params=self._search_params(filters),
+                limit=dense_limit,
                 with_payload=True,
-            ).points
-
-            # Sparse search
-            sparse_results = client.query_points(
+            ),
+            client.query_points(
                 collection_name=self.collection_name,
                 query=query_sparse,
                 using="sparse",
                 query_filter=query_filter,
-                limit=filters.limit,
+                limit=sparse_limit,
                 with_payload=True,
-            ).points
-
-            # Combine and re-rank results
-            combined_results = {result.id: result for result in dense_results}
-            for result in sparse_results:
-                if result.id not in combined_results:
-                    combined_results[result.id] = result
-
-            # Sort by score (descending)
-            sorted_results = sorted(combined_results.values(), key=lambda r: r.score, reverse=True)[:filters.limit]
+            ),
+        )
 
-            # Convert to SearchResult models
-            results = self._convert_to_search_results(sorted_results)
-            execution_time_ms = (time.time() - start_time) * 1000
-            return results, execution_time_ms
+        dense_weight = filters.dense_weight if filters.dense_weight is not None else self.dense_weight
+        return fuse(
+            method,
+            dense_response.points,
+            sparse_response.points,
+            filters.limit,
+            dense_weight=dense_weight,
+        )
 
-        finally:
-            client.close()
+    def _search_params(self, filters: SearchFilters) -> SearchParams:
+        """HNSW and quantization params for dense queries (request, then service, then profile)"""
+        return self.collection_profile.search_params(
+            hnsw_ef=filters.hnsw_ef or self.hnsw_ef,
+            oversampling=filters.oversampling or self.oversampling,
+        )
 
     def _build_filter(self, filters: SearchFilters) -> Optional[Filter]:
         """Build Qdrant filter from SearchFilters"""
@@ -195,56 +624,149 @@ class SearchService:
 
         return Filter(must=filter_conditions) if filter_conditions else None
 
-    def _encode_query(self, query: str) -> tuple:
-        """Encode query into dense and sparse vectors"""
+    async def _encode_query(self, query: str, colbert: bool = False) -> tuple:
+        """
+        Encode query into dense and sparse vectors without blocking the event loop
+
+        Recently seen queries (after whitespace/Unicode normalization) are
+        served from the in-memory cache without touching the model; misses
+        from concurrent requests are encoded together by the query batcher.
+
+        With colbert=True the ColBERT token vectors are returned as a third
+        element (cached separately from the plain pair).
+        """
+        key = normalize_query(query)
+        cache_key = (key, "colbert") if colbert else key
+        cached = self.query_embedding_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        batcher = self.colbert_batcher if colbert else self.query_batcher
+        encoded = await batcher.encode(key)
+        self.query_embedding_cache.put(cache_key, encoded)
+        return encoded
+
+    async def _encode_queries(self, queries: List[str]) -> List[tuple]:
+        """
+        Encode many queries into (dense, sparse) pairs with one model call
+
+        Cached queries are skipped; the remaining distinct queries go to
+        BGE-M3 as a single batch on the encode pool.
+        """
+        keys = [normalize_query(query) for query in queries]
+        encoded: Dict[str, tuple] = {}
+        for key in keys:
+            if key not in encoded:
+                cached = self.query_embedding_cache.get(key)
+                if cached is not None:
+                    encoded[key] = cached
+
+        missing = [key for key in dict.fromkeys(keys) if key not in encoded]
+        if missing:
+            loop = asyncio.get_running_loop()
+            vectors = await loop.run_in_executor(self.encode_executor, self._encode_queries_sync, missing)
+            for key, vector in zip(missing, vectors):
+                self.query_embedding_cache.put(key, vector)
+                encoded[key] = vector
+
+        return [encoded[key] for key in keys]
+
+    def _encode_queries_sync(self, queries: List[str]) -> List[tuple]:
+        """Encode a batch of queries into (dense, sparse) pairs (blocking; runs in encode_executor)"""
+        dense_vecs, sparse_weights = cached_encode(
+            queries, QUERY_EMBEDDING_MODE, self._encode_texts, cache=self.embedding_cache
+        )
+
+        return [
+            (dense, SparseVector(indices=list(weights.keys()), values=list(weights.values())))
+            for dense, weights in zip(dense_vecs, sparse_weights)
+        ]
+
+    def _encode_queries_colbert_sync(self, queries: List[str]) -> List[tuple]:
+        """
+        Encode a batch of queries into (dense, sparse, colbert) triples (blocking; runs in encode_executor)
+
+        ColBERT vectors are not kept in the persistent embedding cache, so
+        these queries always go to the model.
+        """
+        dense_vecs, sparse_weights, colbert_vecs = self._encode_texts(queries, colbert=True)
+
+        return [
+            (dense, SparseVector(indices=list(weights.keys()), values=list(weights.values())), vecs)
+            for dense, weights, vecs in zip(dense_vecs, sparse_weights, colbert_vecs)
+        ]
+
+    def _encode_texts(self, texts: List[str], colbert: bool = False) -> tuple:
+        """
+        Run BGE-M3 on a batch of texts
+
+        Returns:
+            tuple: (list of dense numpy vectors, list of {token_id: weight} dicts),
+                plus a list of [num_tokens, dim] ColBERT arrays with colbert=True
+        """
         if self.model is None:
             self.load_model()
 
         output = self.model.encode(
-            [query],
+            texts,
             return_dense=True,
             return_sparse=True,
-            return_colbert_vecs=False
+            return_colbert_vecs=colbert
         )
 
-        # Handle dense vector
-        dense_vec = output['dense_vecs'][0]
-        if isinstance(dense_vec, torch.Tensor):
-            query_dense = dense_vec.cpu().numpy()
-        else:
-            query_dense = np.asarray(dense_vec)
-
-        # Handle sparse vector
-        query_sparse_weights = output['lexical_weights'][0]
-        if isinstance(query_sparse_weights, dict):
-            sparse_indices = [int(idx) for idx in query_sparse_weights.keys()]
-            sparse_values = list(query_sparse_weights.values())
-        else:
-            if isinstance(query_sparse_weights, torch.Tensor):
-                arr = query_sparse_weights.cpu().numpy()
+        dense_vecs = []
+        sparse_weights = []
+        for dense_vec, weights in zip(output['dense_vecs'], output['lexical_weights']):
+            # Handle dense vector
+            if isinstance(dense_vec, torch.Tensor):
+                dense_vecs.append(dense_vec.cpu().numpy())
             else:
-                arr = np.asarray(query_sparse_weights)
-            nonzero = np.nonzero(arr)[0]
-            sparse_indices = nonzero.tolist()
-            sparse_values = arr[nonzero].tolist()
+                dense_vecs.append(np.asarray(dense_vec))
 
-        query_sparse = SparseVector(indices=sparse_indices, values=sparse_values)
-        return query_dense, query_sparse
+            # Handle sparse vector
+            if isinstance(weights, dict):
+                sparse_weights.append({int(idx): float(w) for idx, w in weights.items()})
+            else:
+                if isinstance(weights, torch.Tensor):
+                    arr = weights.cpu().numpy()
+                else:
+                    arr = np.asarray(weights)
+                nonzero = np.nonzero(arr)[0]
+                sparse_weights.append(dict(zip(nonzero.tolist(), arr[nonzero].tolist())))
+
+        if colbert:
+            colbert_vecs = [
+                vecs.cpu().numpy() if isinstance(vecs, torch.Tensor) else np.asarray(vecs)
+                for vecs in output['colbert_vecs']
+            ]
+            return dense_vecs, sparse_weights, colbert_vecs
+
+        return dense_vecs, sparse_weights
+
+    def _convert_to_search_results(
+        self,
+        qdrant_points,
+        start_index: int = 0,
+        scores: Optional[Dict[Any, float]] = None
+    ) -> List[SearchResult]:
+        """
+        Convert Qdrant points to SearchResult models
 
-    def _convert_to_search_results(self, qdrant_points, start_index: int = 0) -> List[SearchResult]:
-        """Convert Qdrant points to SearchResult models"""
+        Scrolled records carry no score; pass scores (by point ID, default 0)
+        to fill it in.
+        """
         results = []
         for i, result in enumerate(qdrant_points, start=start_index):
             payload = result.payload if result.payload is not None else {}
 
-            # Convert timestamp to ISO format string if it's a float
-            timestamp = payload.get('timestamp')
+            # Prefer the stored display string; older points only have one field
+            timestamp = payload.get('timestamp_iso') or payload.get('timestamp')
             if isinstance(timestamp, (int, float)):
                 timestamp = datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
 
             results.append(SearchResult(
                 id=i,
-                score=round(result.score, 4),
+                score=round(result.score if scores is None else scores.get(result.id, 0.0), 4),
                 platform=payload.get('platform', 'unknown'),
                 conversation_title=payload.get('conversation_title', 'Untitled'),
                 timestamp=timestamp,
@@ -260,7 +782,7 @@ class SearchService:
             ))
         return results
 
-    def _search_recommend(
+    async def _search_recommend(
         self,
         query: str,
         filters: SearchFilters,
@@ -272,67 +794,173 @@ class SearchService:
         Uses Qdrant's recommend API to find points similar to positive examples
         and dissimilar to negative examples.
         """
-        client = QdrantClient(
-            url=self.qdrant_url,
-            api_key=self.qdrant_api_key,
-            timeout=60,
-            prefer_grpc=False,
+        client = self._get_client()
+
+        query_filter = self._build_filter(filters)
+
+        # Build positive and negative point IDs
+        positive = filters.positive_ids if filters.positive_ids else []
+        negative = filters.negative_ids if filters.negative_ids else []
+
+        if not positive:
+            raise ValueError("Recommend mode requires at least one positive_id")
+
+        # Perform recommendation
+        results = await client.recommend(
+            collection_name=self.collection_name,
+            positive=positive,
+            negative=negative,
+            query_filter=query_filter,
+            search_params=self._search_params(filters),
+            limit=filters.limit,
+            with_payload=True,
         )
 
-        try:
-            query_filter = self._build_filter(filters)
+        search_results = self._convert_to_search_results(results)
+        execution_time_ms = (time.time() - start_time) * 1000
+        return search_results, execution_time_ms
 
-            # Build positive and negative point IDs
-            positive = filters.positive_ids if filters.positive_ids else []
-            negative = filters.negative_ids if filters.negative_ids else []
+    async def _search_order_by(
+        self,
+        query: str,
+        filters: SearchFilters,
+        start_time: float
+    ) -> tuple[OrderedPage, float]:
+        """
+        Order by search - browse matches sorted by a numeric payload field.
 
-            if not positive:
-                raise ValueError("Recommend mode requires at least one positive_id")
+        Uses Qdrant's order_by scroll over the field's range index, so pages
+        are the true newest/oldest matches of the filters, not a re-sort of
+        the top hits. The query only matters when the scan is restricted to
+        relevant points (filters.order_by_candidates or score_threshold).
+        Pages continue from filters.cursor.
 
-            # Perform recommendation
-            results = client.recommend(
-                collection_name=self.collection_name,
-                positive=positive,
-                negative=negative,
-                query_filter=query_filter,
-                limit=filters.limit,
-                with_payload=True,
-            )
+        Returns:
+            Tuple of (page with results and next cursor, execution_time_ms)
+        """
+        field = filters.order_by_field or "timestamp"
+        if field not in ORDER_BY_FIELDS:
+            raise ValueError(f"Cannot order by '{field}' (choose from {', '.join(ORDER_BY_FIELDS)})")
+
+        await self._check_order_by_index(field)
+
+        direction = Direction.DESC if filters.order_direction == "desc" else Direction.ASC
+        client = self._get_client()
+
+        must = []
+        base_filter = self._build_filter(filters)
+        if base_filter is not None:
+            must.extend(base_filter.must)
+
+        scores = None
+        if filters.order_by_candidates or filters.score_threshold is not None:
+            scores = await self._relevant_candidates(query, base_filter, filters)
+            if not scores:
+                return OrderedPage(results=[], next_cursor=None), (time.time() - start_time) * 1000
+            must.append(HasIdCondition(has_id=list(scores)))
+
+        start_from, seen_ids = None, []
+        if filters.cursor:
+            start_from, seen_ids = decode_cursor(filters.cursor)
+
+        # start_from is inclusive; points already returned at that value are skipped
+        must_not = [HasIdCondition(has_id=seen_ids)] if seen_ids else None
+        scroll_filter = Filter(must=must or None, must_not=must_not) if must or must_not else None
+
+        records, _ = await client.scroll(
+            collection_name=self.collection_name,
+            scroll_filter=scroll_filter,
+            limit=filters.limit,
+            order_by=OrderBy(key=field, direction=direction, start_from=start_from),
+            with_payload=True,
+            with_vectors=False,
+        )
 
-            search_results = self._convert_to_search_results(results)
-            execution_time_ms = (time.time() - start_time) * 1000
-            return search_results, execution_time_ms
+        next_cursor = None
+        if len(records) == filters.limit:
+            last_value = records[-1].payload.get(field)
+            tied_ids = [record.id for record in records if record.payload.get(field) == last_value]
+            if last_value == start_from:
+                tied_ids = seen_ids + tied_ids
+            next_cursor = encode_cursor(last_value, tied_ids)
+
+        page = OrderedPage(
+            results=self._convert_to_search_results(records, scores=scores or {}),
+            next_cursor=next_cursor
+        )
+        execution_time_ms = (time.time() - start_time) * 1000
+        return page, execution_time_ms
 
-        finally:
-            client.close()
+    async def _check_order_by_index(self, field: str):
+        """
+        Refuse order_by on a field without a numeric index
+
+        Collections uploaded before timestamps were stored as epoch floats
+        keep ISO strings (and a keyword or datetime index) in timestamp and
+        conversation_start, which the numeric order_by scroll and its cursor
+        cannot page through.
+
+        Raises:
+            ValueError: If the field is not indexed as integer or float
+        """
+        version = await self._get_collection_version()
+        if self._payload_schema is None or version is None or self._payload_schema[0] != version:
+            info = await self._get_client().get_collection(self.collection_name)
+            self._payload_schema = (version, info.payload_schema or {})
+
+        index = self._payload_schema[1].get(field)
+        if index is None or index.data_type not in ORDER_BY_INDEX_TYPES:
+            indexed_as = index.data_type.value if index is not None else "not indexed"
+            raise ValueError(
+                f"Cannot order by '{field}': the collection indexes it as {indexed_as}, not as a number. "
+                f"Re-upload the collection to store it as epoch seconds with a numeric index."
+            )
 
-    def _search_order_by(
+    async def _relevant_candidates(
         self,
         query: str,
-        filters: SearchFilters,
-        start_time: float
-    ) -> tuple[List[SearchResult], float]:
+        query_filter: Optional[Filter],
+        filters: SearchFilters
+    ) -> Dict[Any, float]:
         """
-        Order by search - sort by field instead of relevance.
+        Point IDs relevant to the query, with their scores
 
-        Performs vector search but re-sorts results by specified field.
+        With a score threshold, dense (cosine) hits above it are kept; scores
+        of fused results are rank-based and cannot be thresholded. Otherwise
+        the top order_by_candidates hybrid results are used.
         """
-        # First perform vector search
-        results, _ = self._search_vector(query, filters, time.time())
+        query_dense, query_sparse = await self._encode_query(query)
+        client = self._get_client()
+        candidates = filters.order_by_candidates or ORDER_BY_MAX_CANDIDATES
 
-        # Re-sort by specified field
-        if filters.order_by_field:
-            reverse = (filters.order_direction == "desc")
-            results = sorted(
-                results,
-                key=lambda r: getattr(r, filters.order_by_field, ''),
-                reverse=reverse
+        if filters.score_threshold is not None:
+            response = await client.query_points(
+                collection_name=self.collection_name,
+                query=query_dense.tolist(),
+                using="dense",
+                query_filter=query_filter,
+                search_params=self._search_params(filters),
+                score_threshold=filters.score_threshold,
+                limit=candidates,
+                with_payload=False,
+            )
+        else:
+            request = hybrid_query_request(
+                self.collection_name,
+                query_dense,
+                query_sparse,
+                query_filter,
+                candidates,
+                dense_prefetch_limit=filters.dense_prefetch_limit,
+                sparse_prefetch_limit=filters.sparse_prefetch_limit,
+                search_params=self._search_params(filters),
             )
+            request["with_payload"] = False
+            response = await client.query_points(**request)
 
-        execution_time_ms = (time.time() - start_time) * 1000
-        return results, execution_time_ms
+        return {point.id: point.score for point in response.points}
 
-    def _search_mmr(
+    async def _search_mmr(
         self,
         query: str,
         filters: SearchFilters,
@@ -341,93 +969,58 @@ class SearchService:
         """
         MMR (Maximal Marginal Relevance) search - diverse results.
 
-        Re-ranks results to maximize both relevance and diversity.
+        Fetches a candidate pool with dense vectors attached, then re-ranks it
+        on a normalized candidate matrix to balance relevance against
+        similarity to already-selected results. Relevance comes from the
+        dense, sparse or hybrid (RRF) score, per filters.mmr_relevance.
         """
-        query_dense, query_sparse = self._encode_query(query)
+        query_dense, query_sparse = await self._encode_query(query)
         query_filter = self._build_filter(filters)
 
-        client = QdrantClient(
-            url=self.qdrant_url,
-            api_key=self.qdrant_api_key,
-            timeout=60,
-            prefer_grpc=False,
-        )
-
-        try:
-            # Use Qdrant's query API with MMR
-            from qdrant_client.models import QueryRequest, NearestQuery
-
-            diversity_lambda = filters.mmr_diversity if filters.mmr_diversity else 0.5
-
-            # Search with MMR enabled (need vectors for similarity calculation)
-            results = client.query_points(
+        client = self._get_client()
+
+        diversity = filters.mmr_diversity if filters.mmr_diversity is not None else 0.5
+        candidates = max(filters.mmr_candidates or filters.limit * 2, filters.limit)
+        relevance = filters.mmr_relevance
+
+        # Only the dense vector is needed for similarity; skip the sparse one
+        if relevance == "hybrid":
+            request = hybrid_query_request(
+                self.collection_name,
+                query_dense,
+                query_sparse,
+                query_filter,
+                candidates,
+                dense_prefetch_limit=filters.dense_prefetch_limit,
+                sparse_prefetch_limit=filters.sparse_prefetch_limit,
+                search_params=self._search_params(filters),
+            )
+            response = await client.query_points(**request, with_vectors=["dense"])
+        else:
+            response = await client.query_points(
                 collection_name=self.collection_name,
-                query=query_dense.tolist(),
-                using="dense",
+                query=query_dense.tolist() if relevance == "dense" else query_sparse,
+                using=relevance,
                 query_filter=query_filter,
-                limit=filters.limit * 2,  # Get more results for diversity selection
+                search_params=self._search_params(filters) if relevance == "dense" else None,
+                limit=candidates,
                 with_payload=True,
-                with_vectors=True,  # Required for MMR similarity calculations
-            ).points
-
-            # Apply MMR re-ranking
-            if len(results) > 0:
-                selected = []
-                remaining = list(results)
-
-                # Select first result (most relevant)
-                selected.append(remaining.pop(0))
-
-                # Select remaining results using MMR formula
-                while remaining and len(selected) < filters.limit:
-                    best_score = -float('inf')
-                    best_idx = 0
-
-                    for idx, candidate in enumerate(remaining):
-                        # Relevance score
-                        relevance = candidate.score
-
-                        # Get candidate vector
-                        candidate_vec = np.array(candidate.vector['dense']) if hasattr(candidate, 'vector') and candidate.vector else None
-
-                        # Max similarity to selected documents
-                        if candidate_vec is not None and len(selected) > 0:
-                            max_sim = max([
-                                self._cosine_similarity(
-                                    candidate_vec,
-                                    np.array(selected[i].vector['dense']) if hasattr(selected[i], 'vector') and selected[i].vector else np.zeros_like(candidate_vec)
-                                )
-                                for i in range(len(selected))
-                            ])
-                        else:
-                            max_sim = 0
-
-                        # MMR score: λ * relevance - (1-λ) * max_similarity
-                        mmr_score = diversity_lambda * relevance - (1 - diversity_lambda) * max_sim
-
-                        if mmr_score > best_score:
-                            best_score = mmr_score
-                            best_idx = idx
-
-                    selected.append(remaining.pop(best_idx))
-
-                search_results = self._convert_to_search_results(selected)
-            else:
-                search_results = []
-
-            execution_time_ms = (time.time() - start_time) * 1000
-            return search_results, execution_time_ms
+                with_vectors=["dense"],
+            )
 
-        finally:
-            client.close()
+        # Cosine scores already share the similarity scale; sparse and RRF scores don't
+        selected = mmr_rerank(
+            response.points,
+            filters.limit,
+            diversity=diversity,
+            scale_relevance=relevance != "dense",
+        )
+        search_results = self._convert_to_search_results(selected)
 
-    def _cosine_similarity(self, vec1, vec2):
-        """Calculate cosine similarity between two vectors"""
-        if len(vec1) == 0 or len(vec2) == 0:
-            return 0
-        return np.dot(vec1, vec2) / (np.linalg.norm(vec1) * np.linalg.norm(vec2))
+        execution_time_ms = (time.time() - start_time) * 1000
+        return search_results, execution_time_ms
 
-    def _search_groups(
+    async def _search_groups(
         self,
         query: str,
         filters: SearchFilters,
@@ -438,46 +1031,38 @@ class SearchService:
 
         Groups results by specified field (e.g., platform, conversation_id).
         """
-        query_dense, query_sparse = self._encode_query(query)
+        query_dense, query_sparse = await self._encode_query(query)
         query_filter = self._build_filter(filters)
 
         if not filters.group_by:
             raise ValueError("Groups mode requires group_by field")
 
-        client = QdrantClient(
-            url=self.qdrant_url,
-            api_key=self.qdrant_api_key,
-            timeout=60,
-            prefer_grpc=False,
+        client = self._get_client()
+
+        # Use Qdrant's search groups API
+        from qdrant_client.models import NamedVector
+        results = await client.search_groups(
+            collection_name=self.collection_name,
+            query_vector=NamedVector(name="dense", vector=query_dense.tolist()),
+            group_by=filters.group_by,
+            limit=filters.limit,  # Number of groups
+            group_size=filters.group_size,  # Results per group
+            query_filter=query_filter,
+            search_params=self._search_params(filters),
+            with_payload=True,
         )
 
-        try:
-            # Use Qdrant's search groups API
-            from qdrant_client.models import NamedVector
-            results = client.search_groups(
-                collection_name=self.collection_name,
-                query_vector=NamedVector(name="dense", vector=query_dense.tolist()),
-                group_by=filters.group_by,
-                limit=filters.limit,  # Number of groups
-                group_size=filters.group_size,  # Results per group
-                query_filter=query_filter,
-                with_payload=True,
-            )
-
-            # Convert to GroupedResults
-            grouped_results = []
-            for group in results.groups:
-                group_hits = self._convert_to_search_results(group.hits)
-                grouped_results.append(GroupedResults(
-                    group_key=str(group.id),
-                    hits=group_hits
-                ))
-
-            execution_time_ms = (time.time() - start_time) * 1000
-            return grouped_results, execution_time_ms
+        # Convert to GroupedResults
+        grouped_results = []
+        for group in results.groups:
+            group_hits = self._convert_to_search_results(group.hits)
+            grouped_results.append(GroupedResults(
+                group_key=str(group.id),
+                hits=group_hits
+            ))
 
-        finally:
-            client.close()
+        execution_time_ms = (time.time() - start_time) * 1000
+        return grouped_results, execution_time_ms
 
     def _parse_date(self, date_str: str) -> float:
         """Parse date string to Unix timestamp"""
@@ -498,23 +1083,85 @@ class SearchService:
         except Exception as e:
             raise ValueError(f"Invalid date value: {date_str}") from e
 
-    def health_check(self) -> Dict[str, Any]:
+    async def _get_collection_version(self) -> Optional[tuple]:
+        """
+        Current collection version, re-read at most every version_poll_seconds
+
+        A change clears the response cache. Returns None (cache bypassed)
+        while the version cannot be determined.
+        """
+        if time.monotonic() - self._version_checked_at < self.version_poll_seconds:
+            return self._collection_version
+
+        async with self._version_lock:
+            # Another request may have refreshed it while we waited
+            if time.monotonic() - self._version_checked_at < self.version_poll_seconds:
+                return self._collection_version
+
+            try:
+                version = await self._fetch_collection_version()
+            except Exception:
+                version = None
+
+            if version != self._collection_version:
+                self.response_cache.clear()
+                self._collection_version = version
+            self._version_checked_at = time.monotonic()
+            return version
+
+    async def _fetch_collection_version(self) -> tuple:
+        """
+        Token that changes whenever search results can change
+
+        Returns:
+            (collection behind the alias, points count, newest ingested_at):
+            - alias target changes on a blue/green swap or rollback
+            - points count changes when points are added or deleted
+            - newest ingested_at changes when an upload or sync writes points
+        """
+        client = self._get_client()
+
+        target = self.collection_name
+        for description in (await client.get_aliases()).aliases:
+            if description.alias_name == self.collection_name:
+                target = description.collection_name
+                break
+
+        info = await client.get_collection(target)
+
+        latest_ingest = None
+        try:
+            points, _ = await client.scroll(
+                collection_name=target,
+                limit=1,
+                order_by=OrderBy(key=INGESTED_AT_FIELD, direction=Direction.DESC),
+                with_payload=[INGESTED_AT_FIELD],
+                with_vectors=False,
+            )
+            if points:
+                latest_ingest = points[0].payload.get(INGESTED_AT_FIELD)
+        except UnexpectedResponse:
+            pass  # Collections uploaded before ingested_at was indexed
+
+        return (target, info.points_count, latest_ingest)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters of the in-memory caches"""
+        return {
+            "query_embedding_cache": self.query_embedding_cache.stats(),
+            "response_cache": self.response_cache.stats(),
+            "query_batcher": self.query_batcher.stats(),
+            "colbert_batcher": self.colbert_batcher.stats()
+        }
+
+    async def health_check(self) -> Dict[str, Any]:
         """Check service health"""
         model_loaded = self.model is not None
         qdrant_connected = False
 
         try:
-            client = QdrantClient(
-                url=self.qdrant_url,
-                api_key=self.qdrant_api_key,
-                timeout=5,
-                prefer_grpc=False,
-            )
-            try:
-                client.get_collections()
-                qdrant_connected = True
-            finally:
-                client.close()
+            await self._get_client().get_collections()
+            qdrant_connected = True
         except Exception:
             pass
 
@@ -5,9 +5,10 @@ Upload WillGPT conversations to Qdrant with BGE-M3 hybrid embeddings
 
 import sys
 import os
+import time
 from pathlib import Path
 from tqdm import tqdm
-from typing import List, Dict, Any, Optional
+from typing import List, Optional
 import torch
 from dotenv import load_dotenv
 
@@ -30,6 +31,11 @@ from qdrant_client.models import (
 )
 from FlagEmbedding import BGEM3FlagModel
 
+# One payload builder for every uploader: epoch timestamps for range filters
+# and order_by, ISO copies for display
+from retrieval.upload_to_qdrant import chunk_to_payload, embedding_config, sample_payload
+from retrieval.payload_indexes import sync_payload_indexes
+
 QDRANT_API_KEY=os.getenv('QDRANT_API_KEY')
 QDRANT_URL=os.getenv('QDRANT_URL')
 COLLECTION_NAME=os.getenv('COLLECTION_NAME')
@@ -113,48 +119,6 @@ def generate_bge_m3_embeddings(model: BGEM3FlagModel, texts: List[str]) -> tuple
     return dense_vecs, lexical_weights
 
 
-def chunk_to_payload(chunk) -> Dict[str, Any]:
-    """
-    Convert UniversalChunk to Qdrant payload
-
-    Stores structured data separately from embeddings for filtering/display
-    """
-
-    payload = {
-        "conversation_id": chunk.conversation_id,
-        "platform": chunk.platform,
-        "timestamp": chunk.timestamp.isoformat() if chunk.timestamp else None,
-        "conversation_title": chunk.conversation_title,
-        "turn_number": chunk.turn_number,
-
-        # The actual content
-        "user_message": chunk.user_message,
-        "assistant_message": chunk.assistant_message,
-        "user_message_type": chunk.user_message_type,
-        "assistant_message_type": chunk.assistant_message_type,
-        "assistant_model": chunk.assistant_model,
-
-        # AI interpretations - THE GOLD
-        "has_interpretations": bool(chunk.ai_interpretations),
-    }
-
-    # Add ChatGPT-specific interpretations if present
-    if chunk.platform == "chatgpt" and chunk.ai_interpretations:
-        ucd = chunk.ai_interpretations.get('user_context_message_data', {})
-        payload["about_user"] = ucd.get('about_user_message', '')
-        payload["about_model"] = ucd.get('about_model_message', '')
-
-    # Add metadata
-    if chunk.system_context:
-        payload["system_context"] = chunk.system_context
-
-    if chunk.tool_usage:
-        payload["has_tool_usage"] = True
-        payload["tool_count"] = len(chunk.tool_usage)
-
-    return payload
-
-
 def upload_conversations_to_qdrant(
     collection_file: str,
     qdrant_url: str,
@@ -200,11 +164,13 @@ def upload_conversations_to_qdrant(
     try:
         # Setup collection
         setup_qdrant_collection(client, collection_name, vector_size, auto_confirm=auto_confirm)
+        sync_payload_indexes(client, collection_name, payload_sample=sample_payload())
 
         # Generate embeddings and upload in batches
         print(f"\n4. Generating embeddings and uploading (mode: {embedding_mode})...")
         print(f"   Batch size: {BATCH_SIZE}")
 
+        ingested_at = time.time()
         points = []
         batch_texts = []
         batch_chunks = []
@@ -222,7 +188,9 @@ def upload_conversations_to_qdrant(
 
                 # Create points
                 for i, (dense_emb, sparse_weights, ch) in enumerate(zip(dense_embeddings, sparse_embeddings, batch_chunks)):
-                    point_id = len(points) + i
+                    # Stable, content-addressed ID: re-uploading the same turn overwrites
+                    # its own point instead of colliding with another batch's
+                    point_id = ch.chunk_id
 
                     # Convert sparse weights to Qdrant SparseVector format
                     if sparse_weights:
@@ -239,7 +207,8 @@ def upload_conversations_to_qdrant(
                             "dense": dense_emb.tolist() if hasattr(dense_emb, 'tolist') else dense_emb,
                             "sparse": sparse_vector
                         },
-                        payload=chunk_to_payload(ch)
+                        payload=chunk_to_payload(ch, ingested_at=ingested_at,
+                                                 embedding_config=embedding_config(embedding_mode))
                     )
                     points.append(point)
 
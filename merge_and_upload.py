@@ -6,11 +6,12 @@ This script:
 1. Parses ChatGPT export
 2. Parses Claude export
 3. Merges both into a single collection
-4. Uploads to Qdrant (replacing the collection)
+4. Uploads to Qdrant (into a new collection version behind the alias)
 """
 
 import sys
 import argparse
+import itertools
 from pathlib import Path
 from dotenv import load_dotenv
 import os
@@ -33,11 +34,120 @@ BATCH_SIZE = int(os.getenv("BATCH_SIZE", 4))
 # Add parent to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from parsers import parse_export, ConversationCollection
+from parsers import parse_export, iter_export, ConversationCollection, ChatGPTParser
 from parsers.universal_format import UniversalChunk
 
 
-def merge_and_upload(auto_upload=False):
+def confirm_upload(auto_upload=False, sync=False, resume=False, saved_to=None):
+    """
+    Describe what the upload will do and ask for confirmation
+
+    Exits the script if the user declines.
+
+    Args:
+        auto_upload: Skip the prompt
+        sync: Incremental sync of the existing collection
+        resume: Continue an interrupted upload
+        saved_to: Merged collection file to point the user at on cancel
+    """
+    if sync:
+        print("   Sync mode: only new/changed chunks are embedded; removed chunks are deleted.")
+    elif resume:
+        print("   Resume mode: keeping the collection and skipping chunks already uploaded.")
+    else:
+        print("   This will rebuild the collection as a new version and switch the alias once it is complete.")
+
+    if not auto_upload:
+        response = input("   Continue? (yes/no): ")
+        if response.lower() != "yes":
+            if saved_to:
+                print("\n❌ Upload cancelled. Merged data saved to:", saved_to)
+            else:
+                print("\n❌ Upload cancelled.")
+            sys.exit(0)
+    else:
+        print("   Auto-upload enabled - proceeding...")
+
+
+def run_upload(auto_upload=False, sync=False, resume=False, collection_file=None, chunks=None):
+    """Upload a merged collection file or a chunk stream with the shared settings"""
+    from retrieval.upload_to_qdrant import UploadOptions, upload_conversations_to_qdrant
+
+    # Type assertions for Pylance (already validated above)
+    assert QDRANT_URL is not None
+    assert QDRANT_API_KEY is not None
+
+    upload_conversations_to_qdrant(
+        collection_file=collection_file,
+        qdrant_url=QDRANT_URL,
+        collection_name=COLLECTION_NAME,
+        embedding_mode="user_focused",  # Best for self-effacing pattern detection
+        api_key=QDRANT_API_KEY,
+        auto_confirm=auto_upload,
+        chunks=chunks,
+        options=UploadOptions(sync=sync, resume=resume),
+    )
+
+
+def print_summary(title, total_chunks=None, platforms=None):
+    """Print the completion banner (with totals when they are known)"""
+    print("\n" + "=" * 70)
+    print(f"✅ {title}")
+    print("=" * 70)
+    if total_chunks is not None:
+        print(f"Total chunks in Qdrant: {total_chunks}")
+    if platforms:
+        print(f"Platforms: {', '.join(platforms)}")
+        print("\n🔍 Ready for cross-platform search!")
+
+
+def stream_and_upload(auto_upload=False, workers=1, current_branch_only=False, sync=False, resume=False):
+    """
+    Stream all exports straight into Qdrant without materializing them
+
+    Chunks are parsed one conversation at a time and fed to the uploader as
+    a generator, so memory stays flat no matter how large the exports are.
+    No merged collection file is written in this mode.
+    """
+
+    print("=" * 70)
+    print("WILLGPT MULTI-PLATFORM STREAMING UPLOAD")
+    print("=" * 70)
+
+    chatgpt_file = Path("data/raw/chatgpt.json")
+    claude_file = Path("data/raw/claude.json")
+    for export_file in (chatgpt_file, claude_file):
+        if not export_file.exists():
+            print(f"❌ Export not found: {export_file}")
+            sys.exit(1)
+
+    projects_file = Path("data/raw/claude-projects.json")
+    chatgpt_parser = ChatGPTParser(current_branch_only=current_branch_only)
+    streams = [
+        chatgpt_parser.iter_chunks(str(chatgpt_file), workers=workers),
+        iter_export(str(claude_file), workers=workers),
+    ]
+    if projects_file.exists():
+        from parsers.claude_projects_parser import ClaudeProjectsParser
+        streams.append(ClaudeProjectsParser().iter_chunks(str(projects_file), workers=workers))
+    else:
+        print(f"⚠️  Claude Projects export not found: {projects_file}")
+        print("   Skipping projects...")
+
+    print("\nUploading to Qdrant...")
+    confirm_upload(auto_upload=auto_upload, sync=sync, resume=resume)
+
+    run_upload(
+        auto_upload=auto_upload,
+        sync=sync,
+        resume=resume,
+        chunks=itertools.chain.from_iterable(streams),
+    )
+
+    print_summary("STREAMING UPLOAD COMPLETE!")
+
+
+def merge_and_upload(auto_upload=False, workers=1, current_branch_only=False, sync=False, resume=False):
     """Parse both exports, merge, and upload"""
 
     print("=" * 70)
@@ -51,7 +161,8 @@ def merge_and_upload(auto_upload=False):
         print(f"❌ ChatGPT export not found: {chatgpt_file}")
         sys.exit(1)
 
-    chatgpt_collection = parse_export(str(chatgpt_file))
+    chatgpt_parser = ChatGPTParser(current_branch_only=current_branch_only)
+    chatgpt_collection = chatgpt_parser.parse_export_parallel(str(chatgpt_file), workers=workers)
     print(f"   ✅ Parsed {len(chatgpt_collection.chunks)} ChatGPT chunks")
 
     # Parse Claude conversations
@@ -61,7 +172,7 @@ def merge_and_upload(auto_upload=False):
         print(f"❌ Claude export not found: {claude_file}")
         sys.exit(1)
 
-    claude_collection = parse_export(str(claude_file))
+    claude_collection = parse_export(str(claude_file), workers=workers)
     print(f"   ✅ Parsed {len(claude_collection.chunks)} Claude chunks")
 
     # Parse Claude Projects
@@ -74,7 +185,7 @@ def merge_and_upload(auto_upload=False):
     else:
         from parsers.claude_projects_parser import ClaudeProjectsParser
         projects_parser = ClaudeProjectsParser()
-        projects_collection = projects_parser.parse_export(str(projects_file))
+        projects_collection = projects_parser.parse_export_parallel(str(projects_file), workers=workers)
         print(f"   ✅ Parsed {len(projects_collection.chunks)} Claude Projects chunks")
 
     # Merge collections
@@ -103,38 +214,16 @@ def merge_and_upload(auto_upload=False):
 
     # Upload to Qdrant
     print("\n6. Uploading to Qdrant...")
-    print("   This will DELETE the existing collection and recreate it with all data.")
-
-    if not auto_upload:
-        response = input("   Continue? (yes/no): ")
-        if response.lower() != "yes":
-            print("\n❌ Upload cancelled. Merged data saved to:", output_path)
-            sys.exit(0)
-    else:
-        print("   Auto-upload enabled - proceeding...")
-
-    # Import and run upload
-    from retrieval.upload_to_qdrant import upload_conversations_to_qdrant
-
-    # Type assertions for Pylance (already validated above)
-    assert QDRANT_URL is not None
-    assert QDRANT_API_KEY is not None
+    confirm_upload(auto_upload=auto_upload, sync=sync, resume=resume, saved_to=output_path)
 
-    upload_conversations_to_qdrant(
+    run_upload(
+        auto_upload=auto_upload,
+        sync=sync,
+        resume=resume,
         collection_file=str(output_path),
-        qdrant_url=QDRANT_URL,
-        collection_name=COLLECTION_NAME,
-        embedding_mode="user_focused",  # Best for self-effacing pattern detection
-        api_key=QDRANT_API_KEY,
-        auto_confirm=auto_upload,
     )
 
-    print("\n" + "=" * 70)
-    print("✅ MERGE AND UPLOAD COMPLETE!")
-    print("=" * 70)
-    print(f"Total chunks in Qdrant: {total_chunks}")
-    print(f"Platforms: {', '.join(platform_stats.keys())}")
-    print("\n🔍 Ready for cross-platform search!")
+    print_summary("MERGE AND UPLOAD COMPLETE!", total_chunks=total_chunks, platforms=platform_stats.keys())
 
 
 if __name__ == "__main__":
@@ -144,6 +233,55 @@ if __name__ == "__main__":
     parser.add_argument(
         "--yes", "-y", action="store_true", help="Auto-confirm upload without prompting"
     )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream exports directly into Qdrant without building a merged file (flat memory)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for parsing (default: 1 = serial, 0 = all CPU cores)",
+    )
+    parser.add_argument(
+        "--current-branch-only",
+        action="store_true",
+        help="Only keep each ChatGPT conversation's current branch (skip regenerated/abandoned replies)",
+    )
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        help="Incrementally sync the existing collection instead of recreating it",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted upload, skipping chunks that were already uploaded",
+    )
     args = parser.parse_args()
 
-    merge_and_upload(auto_upload=args.yes)
+    workers = args.workers or None  # 0 -> all cores
+
+    from retrieval.collection_versions import AliasSwapDeclined
+
+    try:
+        if args.stream:
+            stream_and_upload(
+                auto_upload=args.yes,
+                workers=workers,
+                current_branch_only=args.current_branch_only,
+                sync=args.sync,
+                resume=args.resume,
+            )
+        else:
+            merge_and_upload(
+                auto_upload=args.yes,
+                workers=workers,
+                current_branch_only=args.current_branch_only,
+                sync=args.sync,
+                resume=args.resume,
+            )
+    except AliasSwapDeclined as e:
+        print(f"\n❌ Aborting. {e}")
+        sys.exit(0)
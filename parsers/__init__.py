@@ -16,17 +16,31 @@ parser_registry.register_parser(ClaudeParser, ['.json'])
 parser_registry.register_parser(ClaudeProjectsParser, ['.json'])
 
 # Convenience functions
-def parse_export(file_path: str) -> ConversationCollection:
+def parse_export(file_path: str, workers: int = 1) -> ConversationCollection:
     """
     Parse any LLM export file automatically
     
     Args:
         file_path: Path to export file
+        workers: Worker processes for parsing (1 = serial, None = all cores)
         
     Returns:
         ConversationCollection with parsed chunks
     """
-    return parser_registry.parse_export(file_path)
+    return parser_registry.parse_export(file_path, workers=workers)
+
+def iter_export(file_path: str, workers: int = 1):
+    """
+    Stream chunks from any LLM export file without building a collection
+    
+    Args:
+        file_path: Path to export file
+        workers: Worker processes for parsing (1 = serial, None = all cores)
+        
+    Returns:
+        Generator of UniversalChunk objects
+    """
+    return parser_registry.iter_chunks(file_path, workers=workers)
 
 def get_export_metadata(file_path: str) -> dict:
     """
@@ -68,6 +82,7 @@ __all__ = [
     'ClaudeProjectsParser',
     'parser_registry',
     'parse_export',
+    'iter_export',
     'get_export_metadata',
     'compare_ai_interpretations'
 ]
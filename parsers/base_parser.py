@@ -5,15 +5,22 @@ All platform parsers inherit from this
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import List, Dict, Any, Iterator, Iterable, Optional
 from pathlib import Path
 import json
+import os
 
 from .universal_format import UniversalChunk, ConversationCollection
 
 # Maximum file size to load (500 MB default, adjustable)
 MAX_FILE_SIZE_MB = 500
 
+# Conversations/projects sent to a worker process per task
+PARALLEL_BATCH_SIZE = 16
+
 
 def safe_load_json(file_path: str, max_size_mb: int = MAX_FILE_SIZE_MB) -> Any:
     """
@@ -46,6 +53,164 @@ def safe_load_json(file_path: str, max_size_mb: int = MAX_FILE_SIZE_MB) -> Any:
     except Exception as e:
         raise ValueError(f"Error loading {file_path}: {e}")
 
+
+def iter_json_array(file_path: str, read_size: int = 1 << 16) -> Iterator[Any]:
+    """
+    Incrementally decode the elements of a top-level JSON array.
+
+    Only one element (plus a read buffer) is held in memory at a time, so
+    exports larger than MAX_FILE_SIZE_MB can be processed with flat memory.
+
+    Args:
+        file_path: Path to JSON file whose top-level value is an array
+        read_size: Number of characters to read from disk per refill
+
+    Yields:
+        Each decoded array element, in file order
+
+    Raises:
+        ValueError: If the file is not a JSON array or is malformed
+    """
+    decoder = json.JSONDecoder()
+
+    with open(file_path, 'r', encoding='utf-8') as f:
+        buf = ''
+        pos = 0
+        eof = False
+
+        def fill(min_chars: int) -> bool:
+            """Append at least min_chars (or the rest of the file) to buf"""
+            nonlocal buf, pos, eof
+            if eof:
+                return False
+            # Drop consumed prefix so the buffer only holds unparsed data
+            buf = buf[pos:]
+            pos = 0
+            data = f.read(max(read_size, min_chars))
+            if not data:
+                eof = True
+                return False
+            buf += data
+            return True
+
+        def skip_whitespace() -> bool:
+            """Advance pos to next non-whitespace char; False at end of file"""
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos] in ' \t\r\n':
+                    pos += 1
+                if pos < len(buf):
+                    return True
+                if not fill(read_size):
+                    return False
+
+        if not skip_whitespace() or buf[pos] != '[':
+            raise ValueError(f"Expected a JSON array at top level of {file_path}")
+        pos += 1
+
+        expect_value = True
+        seen_value = False
+        while True:
+            if not skip_whitespace():
+                raise ValueError(f"Unexpected end of file in {file_path}")
+
+            char = buf[pos]
+            if char == ']':
+                if expect_value and seen_value:
+                    raise ValueError(f"Invalid JSON in {file_path}: trailing ','")
+                pos += 1
+                if skip_whitespace():
+                    raise ValueError(f"Invalid JSON in {file_path}: extra data after the top-level array")
+                return
+            if char == ',':
+                if expect_value:
+                    raise ValueError(f"Invalid JSON in {file_path}: unexpected ','")
+                pos += 1
+                expect_value = True
+                continue
+            if not expect_value:
+                raise ValueError(f"Invalid JSON in {file_path}: expected ',' or ']'")
+
+            while True:
+                try:
+                    element, end = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError as e:
+                    # Element spans past the buffer; grow geometrically so a
+                    # huge element is not re-decoded once per read_size
+                    if not fill(len(buf) - pos):
+                        raise ValueError(f"Invalid JSON in {file_path}: {e}")
+                    continue
+
+                # A number at the buffer edge may continue in the next read
+                # ("1" of "1.5"); other values are self-delimiting
+                if (
+                    isinstance(element, (int, float)) and not isinstance(element, bool)
+                    and (end == len(buf) or buf[end] in '.eE+-')
+                    and fill(read_size)
+                ):
+                    continue
+                break
+
+            pos = end
+            expect_value = False
+            seen_value = True
+            yield element
+
+
+def is_json_array(file_path: str, peek_chars: int = 4096) -> bool:
+    """Check whether a JSON file's top-level value is an array"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        head = f.read(peek_chars).lstrip()
+    return head.startswith('[')
+
+
+def _parse_items_batch(parser: 'BaseLLMParser', items: List[Any]) -> List[UniversalChunk]:
+    """Worker-process entry point: parse a batch of export items in order"""
+    chunks = []
+    for item in items:
+        chunks.extend(parser._parse_item(item))
+    return chunks
+
+
+# Distinguishes an empty array from one whose first element is null
+_NO_ELEMENT = object()
+
+
+def read_export_sample(file_path: str, peek_chars: int = 4096) -> Any:
+    """
+    Read just enough of an export to identify its format.
+
+    For a top-level array (every supported export) only the first element
+    is decoded and returned as a one-item list, which is all the parsers'
+    _validate_data_structure checks look at. Other documents fall back to
+    a full safe_load_json.
+
+    Args:
+        file_path: Path to JSON file
+        peek_chars: Characters to read when checking the top-level type
+
+    Returns:
+        [first_element], [] for an empty array, or the full decoded document
+
+    Raises:
+        ValueError: If the first array element is null (a malformed export,
+            not an empty one)
+    """
+    if not is_json_array(file_path, peek_chars):
+        return safe_load_json(file_path)
+
+    elements = iter_json_array(file_path)
+    try:
+        first = next(elements, _NO_ELEMENT)
+    finally:
+        elements.close()
+
+    if first is _NO_ELEMENT:
+        return []
+    if first is None:
+        raise ValueError(f"{file_path} is malformed: its first element is null, not a conversation")
+    return [first]
+
 class BaseLLMParser(ABC):
     """
     Abstract base class for all LLM platform parsers
@@ -69,6 +234,96 @@ class BaseLLMParser(ABC):
             ConversationCollection with parsed chunks
         """
         pass
+
+    def iter_chunks(self, file_path: str, workers: Optional[int] = 1) -> Iterator[UniversalChunk]:
+        """
+        Yield UniversalChunk objects from an export one at a time
+
+        Export items are read incrementally and parsed by _parse_item,
+        optionally across a process pool.
+
+        Args:
+            file_path: Path to the export file
+            workers: Worker processes (1 = serial, None = all CPU cores)
+
+        Yields:
+            Parsed chunks in export order (identical for any worker count)
+        """
+        items = self._iter_export_items(file_path)
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        if workers > 1:
+            yield from self._iter_chunks_parallel(items, workers)
+        else:
+            for item in items:
+                yield from self._parse_item(item)
+
+    def parse_export_parallel(self, file_path: str, workers: Optional[int] = None) -> ConversationCollection:
+        """
+        Parse an export across a process pool
+
+        Args:
+            file_path: Path to the export file
+            workers: Worker processes (1 = serial, None = all CPU cores)
+
+        Returns:
+            ConversationCollection with chunks in export order
+        """
+        return ConversationCollection(self.iter_chunks(file_path, workers=workers))
+
+    def _iter_export_items(self, file_path: str) -> Iterator[Any]:
+        """Yield the independently parseable units of an export (conversations, projects)"""
+        return iter_json_array(file_path)
+
+    @abstractmethod
+    def _parse_item(self, item: Any) -> List[UniversalChunk]:
+        """
+        Parse one export item (conversation, project) into chunks
+
+        Must be self-contained: it runs in worker processes for parallel
+        parsing, and items are parsed independently of each other.
+
+        Args:
+            item: One element yielded by _iter_export_items
+
+        Returns:
+            Chunks for the item, in order
+        """
+        pass
+
+    def _iter_chunks_parallel(self, items: Iterable[Any], workers: int) -> Iterator[UniversalChunk]:
+        """
+        Shard items across a process pool and merge results in input order
+
+        At most 2 * workers batches are in flight, so memory stays bounded
+        while the pool is kept busy. Falls back to serial parsing if a
+        process pool cannot be started on this platform.
+        """
+        items = iter(items)
+
+        try:
+            executor = ProcessPoolExecutor(max_workers=workers)
+        except (OSError, NotImplementedError, ImportError) as e:
+            print(f"Process pool unavailable ({e}), parsing serially")
+            for item in items:
+                yield from self._parse_item(item)
+            return
+
+        with executor:
+            pending = deque()
+            while True:
+                batch = list(islice(items, PARALLEL_BATCH_SIZE))
+                if batch:
+                    pending.append(executor.submit(_parse_items_batch, self, batch))
+
+                # Drain the oldest batch once the window is full (or input is done)
+                if pending and (len(pending) >= workers * 2 or not batch):
+                    yield from pending.popleft().result()
+
+                if not batch and not pending:
+                    break
     
     @abstractmethod
     def extract_ai_interpretations(self, raw_data: Dict) -> Dict[str, Any]:
@@ -99,19 +354,22 @@ class BaseLLMParser(ABC):
         """
         pass
     
-    def validate_export_format(self, file_path: str) -> bool:
+    def validate_export_format(self, file_path: str, sample: Any = None) -> bool:
         """
         Validate that the file is in the expected format for this parser
 
         Args:
             file_path: Path to export file
+            sample: Already-decoded sample from read_export_sample (avoids
+                re-reading the file when several parsers are tried)
 
         Returns:
             True if format is valid, False otherwise
         """
         try:
-            data = safe_load_json(file_path)
-            return self._validate_data_structure(data)
+            if sample is None:
+                sample = read_export_sample(file_path)
+            return self._validate_data_structure(sample)
         except Exception:
             return False
     
@@ -195,37 +453,60 @@ class ParserRegistry:
             ValueError: If no suitable parser found
         """
         file_ext = Path(file_path).suffix.lower()
+
+        # Decode a bounded sample once and share it with every parser
+        try:
+            sample = read_export_sample(file_path)
+        except Exception as e:
+            raise ValueError(f"No suitable parser found for {file_path}: {e}")
         
         # Try each parser's validation method
         for platform_name, parser_info in self.parsers.items():
             parser = parser_info['parser']
             
             if file_ext in parser_info['extensions']:
-                if parser.validate_export_format(file_path):
+                if parser.validate_export_format(file_path, sample=sample):
                     print(f"Detected {platform_name} export format")
                     return parser
         
         # Fallback: try all parsers regardless of extension
         for platform_name, parser_info in self.parsers.items():
             parser = parser_info['parser']
-            if parser.validate_export_format(file_path):
+            if parser.validate_export_format(file_path, sample=sample):
                 print(f"Detected {platform_name} export format (by content)")
                 return parser
         
         raise ValueError(f"No suitable parser found for {file_path}")
     
-    def parse_export(self, file_path: str) -> ConversationCollection:
+    def parse_export(self, file_path: str, workers: Optional[int] = 1) -> ConversationCollection:
         """
         Parse any export file using automatic detection
         
         Args:
             file_path: Path to export file
+            workers: Worker processes (1 = serial, None = all CPU cores)
             
         Returns:
             ConversationCollection with parsed chunks
         """
         parser = self.detect_parser(file_path)
-        return parser.parse_export(file_path)
+        if workers == 1:
+            return parser.parse_export(file_path)
+        return parser.parse_export_parallel(file_path, workers=workers)
+
+    def iter_chunks(self, file_path: str, workers: Optional[int] = 1) -> Iterator[UniversalChunk]:
+        """
+        Stream chunks from any export file using automatic detection
+
+        Args:
+            file_path: Path to export file
+            workers: Worker processes (1 = serial, None = all CPU cores)
+
+        Yields:
+            Parsed chunks in export order
+        """
+        parser = self.detect_parser(file_path)
+        yield from parser.iter_chunks(file_path, workers=workers)
     
     def get_all_metadata(self, file_path: str) -> Dict[str, Any]:
         """Get metadata from all parsers (useful for comparison)"""
@@ -5,12 +5,11 @@ Converts ChatGPT export format to UniversalChunk objects
 """
 
 import json
-import uuid
 from datetime import datetime, timezone
 from typing import Dict, List, Any, Optional
 
 from .base_parser import BaseLLMParser, safe_load_json
-from .universal_format import UniversalChunk, ConversationCollection
+from .universal_format import UniversalChunk, ConversationCollection, make_chunk_id, make_fallback_id
 
 class ChatGPTParser(BaseLLMParser):
     """
@@ -20,11 +19,15 @@ class ChatGPTParser(BaseLLMParser):
     both conversation content and AI interpretations.
     """
 
-    # Maximum recursion depth for tree traversal (prevents stack overflow)
-    MAX_TREE_DEPTH = 10000
-
-    def __init__(self):
+    def __init__(self, current_branch_only: bool = False):
+        """
+        Args:
+            current_branch_only: Follow only the branch ending at each
+                conversation's current_node, skipping regenerated or
+                abandoned branches instead of interleaving them
+        """
         super().__init__("chatgpt")
+        self.current_branch_only = current_branch_only
     
     def parse_export(self, file_path: str) -> ConversationCollection:
         """Parse ChatGPT export into UniversalChunk objects"""
@@ -39,16 +42,32 @@ class ChatGPTParser(BaseLLMParser):
                 collection.add_chunk(chunk)
 
         return collection
+
+    def _parse_item(self, conversation: Dict) -> List[UniversalChunk]:
+        """
+        Parse one conversation from the top-level array
+
+        Used by iter_chunks, which decodes conversations.json incrementally
+        (one conversation in memory at a time) and can shard conversations
+        across worker processes.
+        """
+        return self._parse_conversation(conversation)
     
     def _parse_conversation(self, conversation: Dict) -> List[UniversalChunk]:
         """Parse a single ChatGPT conversation into chunks"""
         
-        conv_id = conversation.get('conversation_id', str(uuid.uuid4()))
         title = conversation.get('title', 'Untitled')
         mapping = conversation.get('mapping', {})
+        create_time = conversation.get('create_time')
+        conversation_start = datetime.fromtimestamp(create_time, tz=timezone.utc) if create_time else None
         
         # Extract messages in chronological order
-        messages = self._extract_messages_in_order(mapping)
+        current_node = conversation.get('current_node') if self.current_branch_only else None
+        messages = self._extract_messages_in_order(mapping, current_node=current_node)
+
+        conv_id = conversation.get('conversation_id') or conversation.get('id') or make_fallback_id(
+            "chatgpt", title, create_time, next((msg['content'] for msg in messages if msg['content']), None)
+        )
         
         # Group into conversation chunks (message pairs + context)
         chunks = []
@@ -112,10 +131,14 @@ class ChatGPTParser(BaseLLMParser):
                     tool_usage = current_context.get('tool_usage', [])
 
                     chunk = UniversalChunk(
-                        chunk_id=str(uuid.uuid4()),
+                        chunk_id=make_chunk_id(
+                            "chatgpt", conv_id, turn_number,
+                            current_user_msg['content'], content
+                        ),
                         conversation_id=conv_id,
                         platform="chatgpt",
                         timestamp=current_user_msg['timestamp'],
+                        conversation_start=conversation_start,
 
                         user_message=current_user_msg['content'],
                         user_message_type=current_user_msg['message_type'],
@@ -153,8 +176,21 @@ class ChatGPTParser(BaseLLMParser):
         
         return chunks
     
-    def _extract_messages_in_order(self, mapping: Dict) -> List[Dict]:
-        """Extract messages from ChatGPT's tree structure in chronological order"""
+    def _extract_messages_in_order(self, mapping: Dict, current_node: Optional[str] = None) -> List[Dict]:
+        """
+        Extract messages from ChatGPT's tree structure in chronological order
+
+        Args:
+            mapping: Node ID to node data mapping
+            current_node: If given, only the branch from the root to this
+                node is returned (the thread as last shown in the UI)
+
+        Returns:
+            List of extracted message dicts
+        """
+
+        if current_node and current_node in mapping:
+            return self._extract_current_branch(mapping, current_node)
 
         messages = []
 
@@ -168,49 +204,72 @@ class ChatGPTParser(BaseLLMParser):
         if not root_id:
             return messages
 
-        # Traverse the conversation tree with depth limit
+        self._traverse_conversation_tree(mapping, root_id, messages)
+
+        return messages
+
+    def _extract_current_branch(self, mapping: Dict, current_node: str) -> List[Dict]:
+        """Walk parent links from current_node back to the root, then reverse"""
+
+        path = []
         visited = set()
-        self._traverse_conversation_tree(mapping, root_id, messages, visited, depth=0)
+        node_id = current_node
+
+        while node_id is not None and node_id in mapping and node_id not in visited:
+            visited.add(node_id)
+            path.append(node_id)
+            node_id = mapping[node_id].get('parent')
+
+        messages = []
+        for node_id in reversed(path):
+            msg = self._extract_node_message(mapping[node_id])
+            if msg:
+                messages.append(msg)
 
         return messages
     
-    def _traverse_conversation_tree(self, mapping: Dict, node_id: str, messages: List, visited: set, depth: int = 0):
+    def _traverse_conversation_tree(self, mapping: Dict, root_id: str, messages: List):
         """
-        Recursively traverse ChatGPT's conversation tree with depth limit.
+        Depth-first pre-order traversal of ChatGPT's conversation tree.
+
+        Uses an explicit stack instead of recursion, so arbitrarily long
+        threads cannot hit Python's recursion limit. Visits nodes in the same
+        order as a recursive walk over children, and each node at most once.
 
         Args:
             mapping: Node ID to node data mapping
-            node_id: Current node ID to process
+            root_id: Node ID to start from
             messages: List to append messages to
-            visited: Set of visited node IDs
-            depth: Current recursion depth (prevents stack overflow)
-
-        Raises:
-            ValueError: If recursion depth exceeds MAX_TREE_DEPTH
         """
-        # Prevent stack overflow from malicious/malformed data
-        if depth > self.MAX_TREE_DEPTH:
-            raise ValueError(
-                f"Conversation tree exceeded maximum depth ({self.MAX_TREE_DEPTH}). "
-                f"This may indicate malformed or malicious data."
-            )
-
-        if node_id in visited or node_id not in mapping:
-            return
-
-        visited.add(node_id)
-        node = mapping[node_id]
-
-        # Extract message if present
-        if node.get('message'):
-            msg = self._extract_message_data(node['message'])
+        visited = set()
+        stack = [root_id]
+
+        while stack:
+            node_id = stack.pop()
+            if node_id in visited or node_id not in mapping:
+                continue
+
+            visited.add(node_id)
+            node = mapping[node_id]
+
+            # Extract message if present
+            msg = self._extract_node_message(node)
             if msg:
                 messages.append(msg)
 
-        # Follow children (main conversation path)
-        children = node.get('children', [])
-        for child_id in children:
-            self._traverse_conversation_tree(mapping, child_id, messages, visited, depth + 1)
+            # Push children reversed so the first child is processed first
+            children = node.get('children', [])
+            stack.extend(reversed(children))
+
+    def _extract_node_message(self, node: Dict) -> Optional[Dict]:
+        """Extract message data from a tree node, keeping the node's children for branch detection"""
+        if not node.get('message'):
+            return None
+
+        msg = self._extract_message_data(node['message'])
+        if msg:
+            msg['children'] = node.get('children', [])
+        return msg
     
     def _extract_message_data(self, message: Dict) -> Optional[Dict]:
         """Extract relevant data from a ChatGPT message"""
@@ -5,12 +5,11 @@ Converts Claude export format to UniversalChunk objects
 """
 
 import json
-import uuid
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterator
 
-from .base_parser import BaseLLMParser, safe_load_json
-from .universal_format import UniversalChunk, ConversationCollection
+from .base_parser import BaseLLMParser, safe_load_json, iter_json_array, is_json_array
+from .universal_format import UniversalChunk, ConversationCollection, make_chunk_id, make_fallback_id
 
 class ClaudeParser(BaseLLMParser):
     """
@@ -54,18 +53,37 @@ class ClaudeParser(BaseLLMParser):
                     collection.add_chunk(chunk)
         
         return collection
+
+    def _iter_export_items(self, file_path: str) -> Iterator[Dict]:
+        """Yield conversations, streaming when the export is a top-level array"""
+        if is_json_array(file_path):
+            yield from iter_json_array(file_path)
+            return
+
+        data = safe_load_json(file_path)
+        if isinstance(data, dict):
+            yield from data.get('conversations', [data])
+
+    def _parse_item(self, conversation: Dict) -> List[UniversalChunk]:
+        """Parse one conversation (used for streaming and parallel parsing)"""
+        return self._parse_conversation(conversation)
     
     def _parse_conversation(self, conversation: Dict) -> List[UniversalChunk]:
         """Parse a single Claude conversation into chunks"""
 
-        conv_id = conversation.get('uuid', str(uuid.uuid4()))
         title = conversation.get('name', 'Untitled')
+        conversation_start = self._extract_timestamp(conversation)
 
         chunks = []
 
         # Claude uses 'chat_messages' array with 'sender' field
         messages = conversation.get('chat_messages', [])
 
+        conv_id = conversation.get('uuid') or make_fallback_id(
+            "claude", title, conversation.get('created_at'),
+            self._extract_message_content(messages[0]) if messages else None,
+        )
+
         turn_number = 0
         i = 0
 
@@ -87,7 +105,7 @@ class ClaudeParser(BaseLLMParser):
             # Create chunk if we have both messages
             if user_msg and assistant_msg:
                 chunk = self._create_chunk_from_messages(
-                    user_msg, assistant_msg, conv_id, title, turn_number
+                    user_msg, assistant_msg, conv_id, title, turn_number, conversation_start
                 )
                 if chunk:
                     chunks.append(chunk)
@@ -95,8 +113,9 @@ class ClaudeParser(BaseLLMParser):
 
         return chunks
     
-    def _create_chunk_from_messages(self, user_msg: Dict, assistant_msg: Dict, 
-                                   conv_id: str, title: str, turn_number: int) -> Optional[UniversalChunk]:
+    def _create_chunk_from_messages(self, user_msg: Dict, assistant_msg: Dict,
+                                   conv_id: str, title: str, turn_number: int,
+                                   conversation_start: Optional[datetime] = None) -> Optional[UniversalChunk]:
         """Create a UniversalChunk from user and assistant messages"""
         
         # Extract user message
@@ -114,10 +133,11 @@ class ClaudeParser(BaseLLMParser):
         system_context = self.extract_system_context(user_msg)
         
         return UniversalChunk(
-            chunk_id=str(uuid.uuid4()),
+            chunk_id=make_chunk_id("claude", conv_id, turn_number, user_content, assistant_content),
             conversation_id=conv_id,
             platform="claude",
             timestamp=user_timestamp or datetime.now(),
+            conversation_start=conversation_start,
             
             user_message=user_content,
             user_message_type=user_msg.get('type', 'text'),
@@ -5,12 +5,11 @@ Converts Claude Projects export format to UniversalChunk objects
 """
 
 import json
-import uuid
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
 from .base_parser import BaseLLMParser, safe_load_json
-from .universal_format import UniversalChunk, ConversationCollection
+from .universal_format import UniversalChunk, ConversationCollection, make_chunk_id, make_fallback_id
 
 
 class ClaudeProjectsParser(BaseLLMParser):
@@ -55,6 +54,13 @@ class ClaudeProjectsParser(BaseLLMParser):
                     collection.add_chunk(chunk)
         
         return collection
+
+    def _parse_item(self, item: Dict) -> List[UniversalChunk]:
+        """Parse one export item, either the user memory or a project"""
+        if 'conversations_memory' in item:
+            chunk = self._create_memory_chunk(item)
+            return [chunk] if chunk else []
+        return self._parse_project(item)
     
     def _create_memory_chunk(self, memory_item: Dict) -> Optional[UniversalChunk]:
         """Create a chunk from the user memory/context"""
@@ -64,15 +70,18 @@ class ClaudeProjectsParser(BaseLLMParser):
         
         if not memory_content:
             return None
+
+        conversation_id = f"memory_{account_uuid}"
+        user_message = "User Context and Memory across all Claude conversations"
         
         return UniversalChunk(
-            chunk_id=str(uuid.uuid4()),
-            conversation_id=f"memory_{account_uuid}",
+            chunk_id=make_chunk_id("claude-projects", conversation_id, 0, user_message, memory_content),
+            conversation_id=conversation_id,
             platform="claude-projects",
             timestamp=datetime.now(),
             
             # Use user_message for the semantic label, assistant_message for content
-            user_message="User Context and Memory across all Claude conversations",
+            user_message=user_message,
             assistant_message=memory_content,
             user_message_type="memory_context",
             assistant_message_type="memory_content",
@@ -97,10 +106,12 @@ class ClaudeProjectsParser(BaseLLMParser):
         chunks = []
         
         # Extract project metadata
-        project_uuid = project.get('uuid', str(uuid.uuid4()))
         name = project.get('name', 'Untitled Project')
         description = project.get('description', '')
         prompt_template = project.get('prompt_template', '')
+        project_uuid = project.get('uuid') or make_fallback_id(
+            "claude-projects", name, project.get('created_at'), description, prompt_template
+        )
         is_private = project.get('is_private', False)
         is_starter = project.get('is_starter_project', False)
         created_at = self._parse_timestamp(project.get('created_at'))
@@ -141,10 +152,11 @@ class ClaudeProjectsParser(BaseLLMParser):
         project_content = prompt_template if prompt_template else "No custom instructions"
         
         return UniversalChunk(
-            chunk_id=str(uuid.uuid4()),
+            chunk_id=make_chunk_id("claude-projects", project_uuid, 0, project_description, project_content),
             conversation_id=project_uuid,
             platform="claude-projects",
             timestamp=created_at or datetime.now(),
+            conversation_start=created_at,
             
             user_message=project_description,
             assistant_message=project_content,
@@ -174,9 +186,11 @@ class ClaudeProjectsParser(BaseLLMParser):
                               project_name: str, project_created_at: Optional[datetime]) -> Optional[UniversalChunk]:
         """Create a chunk for a project document"""
         
-        doc_uuid = doc.get('uuid', str(uuid.uuid4()))
         filename = doc.get('filename', 'Untitled Document')
         content = doc.get('content', '')
+        doc_uuid = doc.get('uuid') or make_fallback_id(
+            "claude-projects-doc", filename, doc.get('created_at'), content
+        )
         doc_created_at = self._parse_timestamp(doc.get('created_at'))
         
         if not content or not content.strip():
@@ -184,12 +198,14 @@ class ClaudeProjectsParser(BaseLLMParser):
         
         # Build document label
         doc_label = f"[PROJECT: {project_name}] [DOC: {filename}]"
+        conversation_id = f"{project_uuid}_doc_{doc_uuid}"
         
         return UniversalChunk(
-            chunk_id=str(uuid.uuid4()),
-            conversation_id=f"{project_uuid}_doc_{doc_uuid}",
+            chunk_id=make_chunk_id("claude-projects", conversation_id, 0, doc_label, content),
+            conversation_id=conversation_id,
             platform="claude-projects",
             timestamp=doc_created_at or project_created_at or datetime.now(),
+            conversation_start=project_created_at,
             
             user_message=doc_label,
             assistant_message=content,
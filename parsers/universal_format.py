@@ -35,15 +35,70 @@ BGE-M3 produces three embedding types from one forward pass:
 """
 
 from dataclasses import dataclass, asdict
-from datetime import datetime
-from typing import Dict, List, Any, Optional
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Optional, Iterable
 from pathlib import Path
+import hashlib
 import uuid
 import json
 
 # Maximum file size to load (500 MB default)
 MAX_FILE_SIZE_MB = 500
 
+# Namespace for deterministic chunk IDs. Changing it re-keys every indexed point.
+CHUNK_ID_NAMESPACE = uuid.UUID('8d3c4f0e-6b1a-5e2f-9a47-2c1d0b7e5f93')
+
+
+def compute_content_hash(user_message: Optional[str], assistant_message: Optional[str]) -> str:
+    """SHA-256 hex digest of a turn's user and assistant text"""
+    content = f"{user_message or ''}\x1f{assistant_message or ''}"
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def make_chunk_id(platform: str, conversation_id: str, turn_number: int,
+                  user_message: Optional[str], assistant_message: Optional[str]) -> str:
+    """
+    Deterministic, content-addressed chunk ID
+
+    Derived from (platform, conversation_id, turn_number, content hash), so
+    re-parsing an export maps the same turn to the same ID. The result is a
+    UUID string, which Qdrant accepts directly as a point ID.
+    """
+    content_hash = compute_content_hash(user_message, assistant_message)
+    name = f"{platform}\x1f{conversation_id}\x1f{turn_number}\x1f{content_hash}"
+    return str(uuid.uuid5(CHUNK_ID_NAMESPACE, name))
+
+
+def make_fallback_id(platform: str, *parts: Any) -> str:
+    """
+    Deterministic ID for an export record that carries none
+
+    Derived from the record's own fields (e.g. title, creation time, first
+    message), so parsing the same export twice yields the same conversation
+    ID, and therefore the same chunk IDs, instead of a random UUID per run.
+    """
+    name = "\x1f".join(["fallback", platform] + ["" if part is None else str(part) for part in parts])
+    return str(uuid.uuid5(CHUNK_ID_NAMESPACE, name))
+
+
+def to_epoch(dt: Optional[datetime]) -> Optional[float]:
+    """
+    Unix seconds for a datetime, for numeric payload fields
+
+    Naive datetimes are treated as UTC, matching how the search API parses
+    date filters.
+    """
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def to_iso(dt: Optional[datetime]) -> Optional[str]:
+    """ISO 8601 string for display, or None"""
+    return dt.isoformat() if dt else None
+
 
 def _safe_load_json(file_path: str, max_size_mb: int = MAX_FILE_SIZE_MB) -> Any:
     """
@@ -210,6 +265,10 @@ class UniversalChunk:
 
         return '\n\n'.join(parts)
     
+    def content_hash(self) -> str:
+        """Hash of this turn's user and assistant text (detects edited content)"""
+        return compute_content_hash(self.user_message, self.assistant_message)
+
     def to_dict(self) -> Dict:
         """Convert to dictionary with datetime serialization"""
         return asdict(self)
@@ -234,12 +293,16 @@ class ConversationCollection:
     Collection of conversation chunks with cross-platform analysis capabilities
     """
     
-    def __init__(self, chunks: List[UniversalChunk] = None):
-        self.chunks = chunks or []
+    def __init__(self, chunks: Iterable[UniversalChunk] = None):
+        # Accepts a list or any iterable (e.g. a parser's iter_chunks generator)
+        if chunks is None:
+            chunks = []
+        self.chunks = chunks if isinstance(chunks, list) else list(chunks)
     
     def add_chunk(self, chunk: UniversalChunk):
         """Add a chunk to the collection"""
         self.chunks.append(chunk)
+
     
     def get_platforms(self) -> List[str]:
         """Get unique platforms in the collection"""
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Storage and index profiles for the dense vector
+
+A float32 1024-d BGE-M3 vector takes ~4 KB per point. Profiles trade RAM
+against latency by quantizing the dense vector (the sparse vector is left
+alone) and tuning its HNSW graph:
+
+- standard:    full-precision vectors in RAM with Qdrant's default HNSW
+  settings, no quantization (the default; how collections were always built)
+- low-latency: int8 scalar quantization, originals kept in RAM for fast
+  rescoring, denser HNSW graph
+- balanced:    int8 scalar quantization in RAM, originals on disk
+  (~4x less RAM per vector)
+- low-memory:  binary quantization in RAM, originals on disk (~32x less
+  RAM per vector); relies on oversampling + rescoring to keep recall
+
+Each profile also carries matching search-time defaults (hnsw_ef and
+quantization oversampling), which the search API uses unless a request
+overrides them.
+
+Usage:
+    python retrieval/collection_profiles.py show
+    python retrieval/collection_profiles.py apply low-memory [--collection-name will-gpt]
+"""
+
+import sys
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+from dotenv import load_dotenv
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+project_root = Path(__file__).parent.parent
+load_dotenv(project_root / ".env")
+
+from qdrant_client import QdrantClient
+from qdrant_client.models import (
+    BinaryQuantization,
+    BinaryQuantizationConfig,
+    Disabled,
+    Distance,
+    HnswConfigDiff,
+    QuantizationSearchParams,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    VectorParams,
+    VectorParamsDiff,
+)
+
+QDRANT_API_KEY = os.getenv('QDRANT_API_KEY')
+QDRANT_URL = os.getenv('QDRANT_URL')
+COLLECTION_NAME = os.getenv('COLLECTION_NAME')
+COLLECTION_PROFILE = os.getenv('COLLECTION_PROFILE', 'standard')  # Quantized profiles are opt-in
+
+
+@dataclass(frozen=True)
+class CollectionProfile:
+    """Dense vector storage, HNSW and search settings"""
+    name: str
+    quantization: Optional[str]  # "scalar" (int8), "binary" or None
+    originals_on_disk: bool  # Full-precision vectors on disk, quantized copy in RAM
+    hnsw_m: int
+    hnsw_ef_construct: int
+    search_hnsw_ef: int
+    oversampling: float
+
+    def quantization_config(self):
+        """Quantization settings for the dense vector, or None"""
+        if self.quantization == "scalar":
+            return ScalarQuantization(
+                scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True)
+            )
+        if self.quantization == "binary":
+            return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=True))
+        return None
+
+    def hnsw_config(self) -> HnswConfigDiff:
+        """HNSW graph settings for the dense vector"""
+        return HnswConfigDiff(m=self.hnsw_m, ef_construct=self.hnsw_ef_construct)
+
+    def vector_params(self, size: int) -> VectorParams:
+        """VectorParams for creating the dense vector"""
+        return VectorParams(
+            size=size,
+            distance=Distance.COSINE,
+            on_disk=self.originals_on_disk,
+            hnsw_config=self.hnsw_config(),
+            quantization_config=self.quantization_config(),
+        )
+
+    def vector_params_diff(self) -> VectorParamsDiff:
+        """VectorParamsDiff for applying the profile to an existing collection"""
+        return VectorParamsDiff(
+            on_disk=self.originals_on_disk,
+            hnsw_config=self.hnsw_config(),
+            # None would leave existing quantization in place
+            quantization_config=self.quantization_config() or Disabled.DISABLED,
+        )
+
+    def search_params(self, hnsw_ef: Optional[int] = None,
+                      oversampling: Optional[float] = None) -> SearchParams:
+        """
+        Search-time params for dense queries
+
+        Quantized candidates are oversampled, then rescored with the
+        original vectors. Unquantized profiles send no quantization params
+        unless oversampling is requested explicitly.
+        """
+        quantization = None
+        if self.quantization or oversampling:
+            quantization = QuantizationSearchParams(
+                rescore=True,
+                oversampling=oversampling or self.oversampling,
+            )
+        return SearchParams(hnsw_ef=hnsw_ef or self.search_hnsw_ef, quantization=quantization)
+
+    def bytes_per_vector(self, size: int) -> Dict[str, float]:
+        """Approximate RAM and disk bytes per dense vector (excluding the HNSW graph)"""
+        full = size * 4
+        quantized = {"scalar": size, "binary": size / 8}.get(self.quantization, 0)
+        return {
+            "ram": quantized + (0 if self.originals_on_disk else full),
+            "disk": full if self.originals_on_disk else 0,
+        }
+
+
+COLLECTION_PROFILES: Dict[str, CollectionProfile] = {
+    profile.name: profile for profile in (
+        CollectionProfile(
+            name="standard",
+            quantization=None,
+            originals_on_disk=False,
+            hnsw_m=16,              # Qdrant defaults
+            hnsw_ef_construct=100,
+            search_hnsw_ef=100,     # Qdrant searches with ef_construct when unset
+            oversampling=1.0,
+        ),
+        CollectionProfile(
+            name="low-latency",
+            quantization="scalar",
+            originals_on_disk=False,
+            hnsw_m=32,
+            hnsw_ef_construct=256,
+            search_hnsw_ef=128,
+            oversampling=1.5,
+        ),
+        CollectionProfile(
+            name="balanced",
+            quantization="scalar",
+            originals_on_disk=True,
+            hnsw_m=16,
+            hnsw_ef_construct=128,
+            search_hnsw_ef=128,
+            oversampling=2.0,
+        ),
+        CollectionProfile(
+            name="low-memory",
+            quantization="binary",
+            originals_on_disk=True,
+            hnsw_m=16,
+            hnsw_ef_construct=100,
+            search_hnsw_ef=128,
+            oversampling=3.0,
+        ),
+    )
+}
+
+
+def get_profile(name: str) -> CollectionProfile:
+    """
+    Look up a profile by name
+
+    Raises:
+        ValueError: If the profile is unknown
+    """
+    if name not in COLLECTION_PROFILES:
+        raise ValueError(f"Unknown collection profile '{name}' (choose from {', '.join(COLLECTION_PROFILES)})")
+    return COLLECTION_PROFILES[name]
+
+
+def apply_profile(client: QdrantClient, collection_name: str, profile: CollectionProfile):
+    """
+    Reconfigure an existing collection's dense vector to a profile
+
+    Qdrant rebuilds the quantized vectors and HNSW graph in the background;
+    the collection keeps serving search meanwhile.
+    """
+    client.update_collection(
+        collection_name=collection_name,
+        vectors_config={"dense": profile.vector_params_diff()},
+    )
+    print(f"   ✅ Applied profile '{profile.name}' to '{collection_name}' (optimizing in the background)")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Show or apply dense vector profiles")
+    parser.add_argument("command", choices=["show", "apply"])
+    parser.add_argument("profile", nargs="?", default=COLLECTION_PROFILE, choices=list(COLLECTION_PROFILES))
+    parser.add_argument("--collection-name", default=COLLECTION_NAME, help="Collection or alias to reconfigure")
+    parser.add_argument("--vector-size", type=int, default=1024, help="Dense vector dimension (for show)")
+    parser.add_argument("--qdrant-url", default=QDRANT_URL, help="Qdrant server URL")
+    parser.add_argument("--api-key", default=QDRANT_API_KEY, help="Qdrant API key")
+    args = parser.parse_args()
+
+    if args.command == "show":
+        for profile in COLLECTION_PROFILES.values():
+            size = profile.bytes_per_vector(args.vector_size)
+            marker = "* " if profile.name == COLLECTION_PROFILE else "  "
+            print(f"{marker}{profile.name}: {profile.quantization or 'no'} quantization, "
+                  f"originals {'on disk' if profile.originals_on_disk else 'in RAM'}, "
+                  f"m={profile.hnsw_m}, ef_construct={profile.hnsw_ef_construct}, "
+                  f"search ef={profile.search_hnsw_ef}, oversampling={profile.oversampling}")
+            print(f"    ~{size['ram'] / 1024:.2f} KB RAM + {size['disk'] / 1024:.2f} KB disk per vector")
+    else:
+        client = QdrantClient(url=args.qdrant_url, api_key=args.api_key, timeout=60, prefer_grpc=False)
+        try:
+            apply_profile(client, args.collection_name, get_profile(args.profile))
+        finally:
+            client.close()
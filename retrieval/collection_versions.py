@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Blue/green collection versions behind a Qdrant alias
+
+Rebuilds upload into a fresh versioned collection (e.g. will-gpt_v20251027120628)
+while search keeps reading the alias (COLLECTION_NAME). Once the new version
+is complete and validated, the alias is switched in a single atomic
+update_collection_aliases call, so search never sees an empty or partial
+collection. Older versions are kept for instant rollback and pruned by a
+retention policy.
+
+Usage:
+    python retrieval/collection_versions.py list
+    python retrieval/collection_versions.py rollback [--to will-gpt_v20251027120628]
+    python retrieval/collection_versions.py prune --keep 2
+"""
+
+import sys
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional
+
+from dotenv import load_dotenv
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+project_root = Path(__file__).parent.parent
+load_dotenv(project_root / ".env")
+
+from qdrant_client import QdrantClient
+from qdrant_client.models import (
+    CreateAlias,
+    CreateAliasOperation,
+    DeleteAlias,
+    DeleteAliasOperation,
+)
+
+QDRANT_API_KEY = os.getenv('QDRANT_API_KEY')
+QDRANT_URL = os.getenv('QDRANT_URL')
+COLLECTION_NAME = os.getenv('COLLECTION_NAME')
+KEEP_COLLECTION_VERSIONS = int(os.getenv('KEEP_COLLECTION_VERSIONS', 2))  # Live + one rollback target
+
+VERSION_SEPARATOR = "_v"
+
+# Upload-run epoch stamped on every point; its max changes whenever an
+# upload or sync adds points, which the search API uses to drop stale caches
+INGESTED_AT_FIELD = "ingested_at"
+
+
+class AliasSwapDeclined(Exception):
+    """The user declined deleting the legacy collection, so the alias was not switched"""
+
+
+def versioned_collection_name(alias: str, now: Optional[datetime] = None) -> str:
+    """Name for a new collection version, sortable by creation time"""
+    now = now or datetime.now(timezone.utc)
+    return f"{alias}{VERSION_SEPARATOR}{now.strftime('%Y%m%d%H%M%S')}"
+
+
+def list_versions(client: QdrantClient, alias: str) -> List[str]:
+    """All versioned collections behind an alias, oldest first"""
+    prefix = f"{alias}{VERSION_SEPARATOR}"
+    names = [c.name for c in client.get_collections().collections]
+    return sorted(
+        name for name in names
+        if name.startswith(prefix) and name[len(prefix):].isdigit()
+    )
+
+
+def resolve_alias(client: QdrantClient, alias: str) -> Optional[str]:
+    """Collection the alias currently points to, or None"""
+    for description in client.get_aliases().aliases:
+        if description.alias_name == alias:
+            return description.collection_name
+    return None
+
+
+def is_legacy_collection(client: QdrantClient, alias: str) -> bool:
+    """True if a real (non-alias) collection occupies the alias name"""
+    return any(c.name == alias for c in client.get_collections().collections)
+
+
+def is_resumable_version(client: QdrantClient, alias: str, collection_name: str) -> bool:
+    """
+    True if collection_name is an existing version of alias that is not live
+
+    Position alone cannot tell an interrupted rebuild from a version that
+    was live and rolled back, so callers name the version (the upload
+    checkpoint records it) rather than picking the newest one.
+    """
+    return (
+        collection_name in list_versions(client, alias)
+        and collection_name != resolve_alias(client, alias)
+    )
+
+
+def copy_payload_indexes(client: QdrantClient, source: str, target: str):
+    """
+    Recreate the source collection's payload indexes on the target
+
+    Fields the target already indexes (the declared indexes created with
+    the collection) keep their definition.
+    """
+    schema = client.get_collection(source).payload_schema or {}
+    existing = client.get_collection(target).payload_schema or {}
+    copied = [field_name for field_name in schema if field_name not in existing]
+    for field_name in copied:
+        info = schema[field_name]
+        client.create_payload_index(
+            collection_name=target,
+            field_name=field_name,
+            field_schema=info.params or info.data_type,
+        )
+    if copied:
+        print(f"   ✅ Copied {len(copied)} payload indexes from '{source}'")
+
+
+def validate_version(client: QdrantClient, collection_name: str, expected_points: int):
+    """
+    Check a rebuilt version before it goes live
+
+    Raises:
+        RuntimeError: If the point count does not match the number of chunks
+            uploaded
+    """
+    count = client.count(collection_name=collection_name, exact=True).count
+    if count != expected_points:
+        raise RuntimeError(
+            f"Validation failed for '{collection_name}': {count} points, "
+            f"expected {expected_points}. The alias was not switched."
+        )
+    print(f"   ✅ Validated '{collection_name}': {count} points")
+
+
+def swap_alias(client: QdrantClient, alias: str, collection_name: str, auto_confirm: bool = False):
+    """
+    Atomically point the alias at collection_name
+
+    A pre-alias deployment has a real collection named like the alias; it
+    has to be deleted before the alias can take its name, which is the only
+    moment search is briefly unavailable.
+
+    Raises:
+        AliasSwapDeclined: If the user declines deleting the legacy collection
+    """
+    if is_legacy_collection(client, alias):
+        print(f"\n⚠️  '{alias}' is a regular collection, not an alias.")
+        print(f"   It must be deleted once so the alias can take its name.")
+        if not auto_confirm:
+            response = input(f"Delete collection '{alias}' and switch to the alias? (yes/no): ")
+            if response.lower() != 'yes':
+                raise AliasSwapDeclined(
+                    f"New version '{collection_name}' is kept but not live; activate it later with "
+                    f"'python retrieval/collection_versions.py rollback --to {collection_name}'"
+                )
+        client.delete_collection(alias)
+
+    operations = []
+    previous = resolve_alias(client, alias)
+    if previous:
+        operations.append(DeleteAliasOperation(delete_alias=DeleteAlias(alias_name=alias)))
+    operations.append(CreateAliasOperation(
+        create_alias=CreateAlias(collection_name=collection_name, alias_name=alias)
+    ))
+
+    # Both operations are applied in one request, so readers never see a gap
+    client.update_collection_aliases(change_aliases_operations=operations)
+    print(f"   ✅ Alias '{alias}' → '{collection_name}'" + (f" (was '{previous}')" if previous else ""))
+
+
+def prune_versions(client: QdrantClient, alias: str, keep: int = KEEP_COLLECTION_VERSIONS) -> List[str]:
+    """
+    Delete all but the newest `keep` versions up to and including the live one
+
+    Versions newer than the live one (in-progress or unreleased rebuilds)
+    and the live version itself are never deleted.
+
+    Returns:
+        Names of deleted collections
+    """
+    live = resolve_alias(client, alias)
+    versions = list_versions(client, alias)
+    if live not in versions:
+        return []
+
+    released = versions[:versions.index(live) + 1]
+    stale = released[:-max(keep, 1)]
+    for name in stale:
+        client.delete_collection(name)
+        print(f"   🗑️  Deleted old version '{name}'")
+    return stale
+
+
+def rollback(client: QdrantClient, alias: str, to: Optional[str] = None) -> str:
+    """
+    Point the alias back at an earlier version
+
+    Args:
+        to: Version to activate; defaults to the one before the live version
+
+    Returns:
+        Name of the now-live collection
+    """
+    live = resolve_alias(client, alias)
+    versions = list_versions(client, alias)
+
+    if to is None:
+        if live not in versions or versions.index(live) == 0:
+            raise ValueError(f"No earlier version of '{alias}' to roll back to")
+        to = versions[versions.index(live) - 1]
+    elif to not in versions:
+        raise ValueError(f"Unknown version '{to}' (available: {', '.join(versions) or 'none'})")
+
+    swap_alias(client, alias, to)
+    return to
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Manage blue/green versions of the WillGPT collection")
+    parser.add_argument("command", choices=["list", "rollback", "prune"])
+    parser.add_argument("--collection-name", default=COLLECTION_NAME, help="Alias searched by the API")
+    parser.add_argument("--to", help="Version to roll back to (default: previous)")
+    parser.add_argument("--keep", type=int, default=KEEP_COLLECTION_VERSIONS, help="Versions to keep when pruning")
+    parser.add_argument("--qdrant-url", default=QDRANT_URL, help="Qdrant server URL")
+    parser.add_argument("--api-key", default=QDRANT_API_KEY, help="Qdrant API key")
+    args = parser.parse_args()
+
+    client = QdrantClient(url=args.qdrant_url, api_key=args.api_key, timeout=60, prefer_grpc=False)
+    try:
+        if args.command == "list":
+            live = resolve_alias(client, args.collection_name)
+            for name in list_versions(client, args.collection_name):
+                print(f"{'* ' if name == live else '  '}{name}")
+            if is_legacy_collection(client, args.collection_name):
+                print(f"  {args.collection_name} (legacy collection, not an alias)")
+        elif args.command == "rollback":
+            try:
+                print(f"✅ Rolled back to '{rollback(client, args.collection_name, args.to)}'")
+            except AliasSwapDeclined as e:
+                print(f"Aborting. {e}")
+                sys.exit(0)
+        else:
+            deleted = prune_versions(client, args.collection_name, args.keep)
+            print(f"✅ Pruned {len(deleted)} old versions")
+    finally:
+        client.close()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Persistent on-disk cache for BGE-M3 embeddings
+
+Vectors are keyed by (model name, embedding mode, SHA-256 of the text), so
+rebuilding a collection or switching Qdrant clusters reuses every embedding
+whose text has not changed. Backed by a single SQLite file:
+- Dense vectors: raw float32 bytes
+- Sparse vectors: uint32 token ids + float32 weights
+
+Only depends on sqlite3 and numpy, so the file can be dropped next to the
+Colab notebook as-is.
+"""
+
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# SQLite caps the number of bound parameters per statement
+_LOOKUP_BATCH_SIZE = 500
+
+SparseWeights = Dict[int, float]
+CachedEmbedding = Tuple[np.ndarray, SparseWeights]
+
+
+class EmbeddingCache:
+    """
+    SQLite-backed cache of dense + sparse BGE-M3 embeddings
+
+    Safe to share between threads; all access goes through one connection
+    guarded by a lock.
+    """
+
+    def __init__(self, path: str, model_name: str):
+        self.path = path
+        self.model_name = model_name
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                dense BLOB NOT NULL,
+                sparse_indices BLOB NOT NULL,
+                sparse_values BLOB NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def make_key(self, text: str, mode: str) -> str:
+        """Cache key for a text embedded under a given mode"""
+        digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        return f"{self.model_name}|{mode}|{digest}"
+
+    def get_many(self, texts: Sequence[str], mode: str) -> List[Optional[CachedEmbedding]]:
+        """
+        Look up embeddings for several texts
+
+        Returns:
+            List aligned with texts; each item is (dense, sparse_weights) or
+            None on a cache miss
+        """
+        keys = [self.make_key(text, mode) for text in texts]
+        found = {}
+
+        with self._lock:
+            for start in range(0, len(keys), _LOOKUP_BATCH_SIZE):
+                batch = keys[start:start + _LOOKUP_BATCH_SIZE]
+                placeholders = ','.join('?' * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, dense, sparse_indices, sparse_values "
+                    f"FROM embeddings WHERE key IN ({placeholders})",
+                    batch,
+                ).fetchall()
+                for key, dense, sparse_indices, sparse_values in rows:
+                    found[key] = (dense, sparse_indices, sparse_values)
+
+        results = []
+        for key in keys:
+            row = found.get(key)
+            if row is None:
+                results.append(None)
+                continue
+            dense, sparse_indices, sparse_values = row
+            indices = np.frombuffer(sparse_indices, dtype=np.uint32).tolist()
+            values = np.frombuffer(sparse_values, dtype=np.float32).tolist()
+            results.append((np.frombuffer(dense, dtype=np.float32), dict(zip(indices, values))))
+
+        return results
+
+    def put_many(self, texts: Sequence[str], mode: str, dense_vecs, sparse_weights: Sequence[Dict]):
+        """Store embeddings for several texts (overwrites existing entries)"""
+        rows = []
+        for text, dense, weights in zip(texts, dense_vecs, sparse_weights):
+            weights = weights or {}
+            rows.append((
+                self.make_key(text, mode),
+                np.asarray(dense, dtype=np.float32).tobytes(),
+                np.asarray([int(idx) for idx in weights.keys()], dtype=np.uint32).tobytes(),
+                np.asarray([float(w) for w in weights.values()], dtype=np.float32).tobytes(),
+            ))
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?)", rows
+            )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def close(self):
+        """Close the underlying SQLite connection"""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def cached_encode(
+    texts: Sequence[str],
+    mode: str,
+    encode_fn: Callable[[List[str]], Tuple[Sequence, Sequence[Dict]]],
+    cache: Optional[EmbeddingCache] = None,
+) -> Tuple[np.ndarray, List[SparseWeights]]:
+    """
+    Encode texts, serving hits from the cache and embedding only misses
+
+    Args:
+        texts: Texts to embed
+        mode: Embedding mode the texts were generated with (part of the key)
+        encode_fn: Callable mapping a list of texts to (dense_vecs, lexical_weights)
+        cache: Optional EmbeddingCache; without one every text is encoded
+
+    Returns:
+        tuple: (dense_embeddings [n, dim] float32, list of {token_id: weight})
+    """
+    if cache is None:
+        dense_vecs, lexical_weights = encode_fn(list(texts))
+        sparse = [{int(k): float(v) for k, v in (w or {}).items()} for w in lexical_weights]
+        return np.asarray(dense_vecs, dtype=np.float32), sparse
+
+    cached = cache.get_many(texts, mode)
+    missing = [i for i, hit in enumerate(cached) if hit is None]
+
+    if missing:
+        # Encode each distinct missing text once
+        missing_texts = list(dict.fromkeys(texts[i] for i in missing))
+        dense_vecs, lexical_weights = encode_fn(missing_texts)
+        cache.put_many(missing_texts, mode, dense_vecs, lexical_weights)
+
+        encoded = {
+            text: (
+                np.asarray(dense, dtype=np.float32),
+                {int(k): float(v) for k, v in (weights or {}).items()},
+            )
+            for text, dense, weights in zip(missing_texts, dense_vecs, lexical_weights)
+        }
+        for i in missing:
+            cached[i] = encoded[texts[i]]
+
+    dense = np.vstack([hit[0] for hit in cached]) if cached else np.zeros((0, 0), dtype=np.float32)
+    return dense, [hit[1] for hit in cached]
+
+
+def cached_encode_colbert(
+    texts: Sequence[str],
+    mode: str,
+    encode_fn: Callable[[List[str]], Tuple[Sequence, Sequence[Dict], Sequence]],
+    cache: Optional[EmbeddingCache] = None,
+) -> Tuple[np.ndarray, List[SparseWeights], List[np.ndarray]]:
+    """
+    Encode texts into dense, sparse and ColBERT vectors, keeping the cache in step
+
+    The cache is not read: ColBERT vectors (one per token) are too large to
+    store, and BGE-M3 computes all three outputs in the same forward pass,
+    so a dense/sparse hit would not save any encoding. Each distinct text
+    is encoded once, and the dense + sparse outputs of texts missing from
+    the cache are written back for later uploads without ColBERT.
+
+    Args:
+        texts: Texts to embed
+        mode: Embedding mode the texts were generated with (part of the key)
+        encode_fn: Callable mapping a list of texts to (dense_vecs, lexical_weights, colbert_vecs)
+        cache: Optional EmbeddingCache to write dense + sparse vectors to
+
+    Returns:
+        tuple: (dense_embeddings [n, dim] float32, list of {token_id: weight},
+            list of [num_tokens, dim] float16 ColBERT arrays)
+    """
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32), [], []
+
+    distinct = list(dict.fromkeys(texts))
+    dense_vecs, lexical_weights, colbert_vecs = encode_fn(distinct)
+    dense_vecs = np.asarray(dense_vecs, dtype=np.float32)
+    sparse = [{int(k): float(v) for k, v in (w or {}).items()} for w in lexical_weights]
+
+    if cache is not None:
+        missing = [i for i, hit in enumerate(cache.get_many(distinct, mode)) if hit is None]
+        if missing:
+            cache.put_many(
+                [distinct[i] for i in missing], mode, dense_vecs[missing], [sparse[i] for i in missing]
+            )
+
+    row = {text: i for i, text in enumerate(distinct)}
+    rows = [row[text] for text in texts]
+    return (
+        dense_vecs[rows],
+        [sparse[i] for i in rows],
+        [np.asarray(colbert_vecs[i], dtype=np.float16) for i in rows],
+    )
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Client-side fusion of dense and sparse result lists
+
+Used when hybrid search cannot be fused server-side (older Qdrant servers,
+or client-side fusion configured explicitly). Strategies:
+- rrf: reciprocal rank fusion, ignores raw scores entirely
+- weighted: min-max normalize each branch's scores, then weighted sum
+- max: highest raw score per point (the original merge behavior)
+"""
+
+from typing import Dict, List, Sequence
+
+FUSION_METHODS = ("rrf", "weighted", "max")
+
+# Standard RRF damping constant
+RRF_K = 60
+
+
+def _with_score(point, score: float):
+    """Copy of a scored point carrying the fused score"""
+    return point.model_copy(update={"score": score})
+
+
+def rrf_fuse(result_lists: Sequence[Sequence], limit: int, k: int = RRF_K) -> List:
+    """Fuse ranked lists by summing 1 / (k + rank) per point"""
+    scores: Dict = {}
+    points: Dict = {}
+
+    for results in result_lists:
+        for rank, point in enumerate(results, start=1):
+            scores[point.id] = scores.get(point.id, 0.0) + 1.0 / (k + rank)
+            points.setdefault(point.id, point)
+
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+    return [_with_score(points[point_id], score) for point_id, score in ranked]
+
+
+def weighted_fuse(result_lists: Sequence[Sequence], weights: Sequence[float], limit: int) -> List:
+    """Fuse lists by a weighted sum of per-list min-max normalized scores"""
+    scores: Dict = {}
+    points: Dict = {}
+
+    for results, weight in zip(result_lists, weights):
+        if not results:
+            continue
+        raw = [point.score for point in results]
+        low, high = min(raw), max(raw)
+        spread = high - low
+
+        for point in results:
+            normalized = (point.score - low) / spread if spread > 0 else 1.0
+            scores[point.id] = scores.get(point.id, 0.0) + weight * normalized
+            points.setdefault(point.id, point)
+
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+    return [_with_score(points[point_id], score) for point_id, score in ranked]
+
+
+def max_fuse(result_lists: Sequence[Sequence], limit: int) -> List:
+    """Keep each point's highest raw score across lists"""
+    best: Dict = {}
+    for results in result_lists:
+        for point in results:
+            if point.id not in best or point.score > best[point.id].score:
+                best[point.id] = point
+
+    return sorted(best.values(), key=lambda point: point.score, reverse=True)[:limit]
+
+
+def fuse(method: str, dense_results: Sequence, sparse_results: Sequence,
+         limit: int, dense_weight: float = 0.5) -> List:
+    """
+    Fuse dense and sparse results with the chosen strategy
+
+    Args:
+        method: One of FUSION_METHODS
+        dense_results: Dense branch results, best first
+        sparse_results: Sparse branch results, best first
+        limit: Number of fused results to return
+        dense_weight: Dense share of the score for "weighted" (sparse gets the rest)
+
+    Returns:
+        Fused points, best first, with score set to the fused score
+    """
+    if method == "rrf":
+        return rrf_fuse([dense_results, sparse_results], limit)
+    if method == "weighted":
+        return weighted_fuse([dense_results, sparse_results], [dense_weight, 1.0 - dense_weight], limit)
+    if method == "max":
+        return max_fuse([dense_results, sparse_results], limit)
+    raise ValueError(f"Unknown fusion method '{method}' (choose from {', '.join(FUSION_METHODS)})")
@@ -172,8 +172,9 @@ def get_all_metadata_fields(sample_size=100):
     
     print(f"\n💡 To filter by these fields in search_qdrant.py:")
     print(f"   --metadata-filter \"field_name:value\"")
-    print(f"\n💡 To create indexes for better performance:")
-    print(f"   Edit retrieval/create_indexes.py to add more fields")
+    print(f"\n💡 To index a field for better performance:")
+    print(f"   Declare it with payload_indexes(...) on its SearchFilters field (api/models.py);")
+    print(f"   the next upload, or python retrieval/payload_indexes.py, creates it")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Length-bucketed dynamic batching for BGE-M3 encoding
+
+A forward pass pads every text to the longest one in its batch, so mixing a
+10-token user message with an 8k-token project document wastes almost all
+of the compute on padding. Texts are instead sorted by token length and
+packed into batches under a padded-token budget:
+- Short texts travel in large batches
+- Long texts travel alone or in small batches
+Outputs are scattered back into the caller's original order.
+
+Lengths are estimated from UTF-8 byte counts rather than by running the
+tokenizer: BGEM3FlagModel.encode tokenizes every batch itself, so exact
+counts would mean a second full tokenization pass just to plan batches.
+Bytes track tokens across scripts far better than characters (a CJK
+character is 3 bytes and roughly one token), and the estimate errs
+towards more tokens, so batches stay within the budget.
+"""
+
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# BGE-M3 maximum sequence length
+MAX_SEQUENCE_LENGTH = 8192
+
+# Conservative UTF-8 bytes-per-token ratio for XLM-R (BGE-M3's tokenizer),
+# which averages ~4 bytes per token on English and CJK text
+BYTES_PER_TOKEN = 3
+
+
+def estimate_tokens(text: str, max_length: int = MAX_SEQUENCE_LENGTH) -> int:
+    """Token count estimate from UTF-8 length, capped at the model's truncation length"""
+    return min(len(text.encode('utf-8')) // BYTES_PER_TOKEN + 2, max_length)  # + [CLS]/[SEP]
+
+
+def estimate_token_counts(texts: Sequence[str]) -> List[int]:
+    """estimate_tokens() for each text"""
+    return [estimate_tokens(text) for text in texts]
+
+
+def plan_batches(lengths: Sequence[int], token_budget: int, max_batch_size: int) -> List[List[int]]:
+    """
+    Group text indices into batches whose padded size fits a token budget
+
+    Indices are visited longest first, so the first text of each batch sets
+    its padded length; a batch is closed when adding another text would push
+    (batch size × padded length) over the budget. A text longer than the
+    budget on its own still gets a batch of one.
+
+    Args:
+        lengths: Token length of each text
+        token_budget: Max padded tokens per batch
+        max_batch_size: Max texts per batch regardless of length
+
+    Returns:
+        List of batches, each a list of indices into lengths
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i], reverse=True)
+
+    batches = []
+    batch: List[int] = []
+    padded_length = 0
+
+    for idx in order:
+        if batch and (
+            len(batch) >= max_batch_size
+            or (len(batch) + 1) * padded_length > token_budget
+        ):
+            batches.append(batch)
+            batch = []
+
+        if not batch:
+            padded_length = max(lengths[idx], 1)
+        batch.append(idx)
+
+    if batch:
+        batches.append(batch)
+
+    return batches
+
+
+def encode_length_bucketed(
+    texts: Sequence[str],
+    encode_fn: Callable[[List[str]], Tuple[Sequence, ...]],
+    count_tokens: Callable[[Sequence[str]], List[int]],
+    token_budget: int,
+    max_batch_size: int,
+    lengths: Optional[Sequence[int]] = None,
+) -> Tuple:
+    """
+    Encode texts in length-bucketed batches, preserving input order
+
+    Args:
+        texts: Texts to embed
+        encode_fn: Callable mapping a list of texts to (dense_vecs, lexical_weights),
+            optionally followed by further per-text outputs (e.g. colbert_vecs)
+        count_tokens: Callable returning token lengths for a list of texts
+            (e.g. estimate_token_counts)
+        token_budget: Max padded tokens per forward pass
+        max_batch_size: Max texts per forward pass
+        lengths: Precomputed token lengths (skips count_tokens)
+
+    Returns:
+        tuple: (dense_embeddings [n, dim] float32, lexical_weights list, *further outputs as lists)
+    """
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32), []
+
+    if lengths is None:
+        lengths = count_tokens(texts)
+
+    dense_out: List[Optional[np.ndarray]] = [None] * len(texts)
+    other_out: List[List] = []
+
+    for batch in plan_batches(lengths, token_budget, max_batch_size):
+        dense_vecs, *others = encode_fn([texts[i] for i in batch])
+        if not other_out:
+            other_out = [[None] * len(texts) for _ in others]
+        for i, dense in zip(batch, dense_vecs):
+            dense_out[i] = np.asarray(dense, dtype=np.float32)
+        for out, values in zip(other_out, others):
+            for i, value in zip(batch, values):
+                out[i] = value
+
+    return (np.vstack(dense_out), *other_out)
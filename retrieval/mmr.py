@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Vectorized Maximal Marginal Relevance re-ranking
+
+MMR picks results one at a time, trading relevance against similarity to
+what has already been picked:
+
+    score(c) = (1 - diversity) * relevance(c) - diversity * max_sim(c, selected)
+
+Candidate vectors are L2-normalized once into a matrix, and each
+candidate's max similarity to the selection is kept as a running vector,
+so every selection step is one matrix-vector product instead of a Python
+loop over candidate/selected pairs.
+"""
+
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize each row; all-zero rows (missing vectors) stay zero"""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+def min_max_scale(scores: np.ndarray) -> np.ndarray:
+    """Rescale scores to [0, 1]; constant scores become 1"""
+    low, high = scores.min(), scores.max()
+    if high - low <= 0:
+        return np.ones_like(scores)
+    return (scores - low) / (high - low)
+
+
+def mmr_select(
+    embeddings: np.ndarray,
+    relevance: np.ndarray,
+    k: int,
+    diversity: float = 0.5,
+) -> List[int]:
+    """
+    Select k candidate indices by MMR
+
+    Args:
+        embeddings: (n, d) candidate vectors, L2-normalized
+        relevance: (n,) relevance scores on a scale comparable to cosine
+        k: Number of candidates to select
+        diversity: 0 = pure relevance order, 1 = maximally diverse
+
+    Returns:
+        Selected indices in selection order (the most relevant comes first)
+    """
+    n = len(relevance)
+    k = min(k, n)
+    if k <= 0:
+        return []
+
+    relevance_term = (1.0 - diversity) * relevance.astype(np.float32)
+    max_sim = np.full(n, -np.inf, dtype=np.float32)
+    available = np.ones(n, dtype=bool)
+
+    selected = [int(np.argmax(relevance))]
+    available[selected[0]] = False
+
+    while len(selected) < k:
+        # Only the newest pick can raise a candidate's max similarity
+        np.maximum(max_sim, embeddings @ embeddings[selected[-1]], out=max_sim)
+        scores = relevance_term - diversity * max_sim
+        scores[~available] = -np.inf
+
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+
+    return selected
+
+
+def mmr_rerank(
+    points: Sequence,
+    k: int,
+    diversity: float = 0.5,
+    vector_name: str = "dense",
+    scale_relevance: bool = False,
+) -> List:
+    """
+    Re-rank scored points by MMR over their stored vectors
+
+    Args:
+        points: Scored points fetched with their vector_name vectors, best first
+        k: Number of points to return
+        diversity: 0 = pure relevance order, 1 = maximally diverse
+        vector_name: Named vector used for similarity
+        scale_relevance: Min-max scale scores to [0, 1] first (needed for
+            sparse dot products and RRF scores, which are not on the cosine scale)
+
+    Returns:
+        Selected points in MMR order, keeping their original scores
+    """
+    if not points:
+        return []
+
+    vectors: List[Optional[Sequence[float]]] = [
+        point.vector.get(vector_name) if isinstance(point.vector, dict) else point.vector
+        for point in points
+    ]
+    dim = next((len(vector) for vector in vectors if vector is not None), 0)
+
+    embeddings = np.zeros((len(points), dim), dtype=np.float32)
+    for row, vector in enumerate(vectors):
+        if vector is not None:
+            embeddings[row] = vector
+    embeddings = normalize_rows(embeddings)
+
+    relevance = np.array([point.score for point in points], dtype=np.float32)
+    if scale_relevance:
+        relevance = min_max_scale(relevance)
+
+    return [points[i] for i in mmr_select(embeddings, relevance, k, diversity)]
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Declarative payload indexes for the WillGPT collection
+
+The indexes a collection needs are derived from the API's SearchFilters
+model: every filter, order_by or group_by option declares the payload
+field(s) it reads and their index type (json_schema_extra
+"payload_indexes"). The manager checks those declarations against the
+payload written by chunk_to_payload, diffs them with the collection's
+payload_schema and creates whatever is missing or built with the wrong
+type, so no filter path falls back to a full payload scan.
+
+`platform` is indexed as a tenant field (is_tenant): nearly every filtered
+query is scoped to one platform, and Qdrant co-locates each platform's
+points on disk. `timestamp` is the principal field, the range most
+searches are bounded by.
+
+Usage:
+    python retrieval/payload_indexes.py            # Create missing indexes
+    python retrieval/payload_indexes.py --dry-run  # Show the plan only
+"""
+
+import sys
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+project_root = Path(__file__).parent.parent
+load_dotenv(project_root / ".env")
+
+from qdrant_client import QdrantClient
+from qdrant_client.models import (
+    PayloadSchemaType,
+    KeywordIndexParams,
+    KeywordIndexType,
+    FloatIndexParams,
+    FloatIndexType,
+    IntegerIndexParams,
+    IntegerIndexType,
+)
+
+from api.models import SearchFilters
+from retrieval.collection_versions import INGESTED_AT_FIELD
+
+QDRANT_API_KEY = os.getenv('QDRANT_API_KEY')
+QDRANT_URL = os.getenv('QDRANT_URL')
+COLLECTION_NAME = os.getenv('COLLECTION_NAME')
+
+SCHEMA_TYPES = {
+    "keyword": PayloadSchemaType.KEYWORD,
+    "bool": PayloadSchemaType.BOOL,
+    "integer": PayloadSchemaType.INTEGER,
+    "float": PayloadSchemaType.FLOAT,
+    "datetime": PayloadSchemaType.DATETIME,
+}
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    """One payload index the collection should have"""
+    field_name: str
+    schema_type: PayloadSchemaType
+    is_tenant: bool = False
+    is_principal: bool = False
+
+    def field_schema(self):
+        """Argument for create_payload_index"""
+        if self.schema_type == PayloadSchemaType.KEYWORD and self.is_tenant:
+            return KeywordIndexParams(type=KeywordIndexType.KEYWORD, is_tenant=True)
+        if self.schema_type == PayloadSchemaType.FLOAT and self.is_principal:
+            return FloatIndexParams(type=FloatIndexType.FLOAT, is_principal=True)
+        if self.schema_type == PayloadSchemaType.INTEGER and self.is_principal:
+            return IntegerIndexParams(type=IntegerIndexType.INTEGER, lookup=True, range=True, is_principal=True)
+        return self.schema_type
+
+    def matches(self, info) -> bool:
+        """True if an existing PayloadIndexInfo already provides this index"""
+        if info.data_type != self.schema_type:
+            return False
+        params = info.params
+        return (
+            bool(getattr(params, "is_tenant", False)) == self.is_tenant
+            and bool(getattr(params, "is_principal", False)) == self.is_principal
+        )
+
+
+# Read by the search API itself rather than by a filter
+SERVICE_INDEXES = [
+    IndexSpec(INGESTED_AT_FIELD, PayloadSchemaType.FLOAT),  # Collection-version polling
+]
+
+
+def declared_indexes() -> List[IndexSpec]:
+    """
+    Indexes declared on SearchFilters fields, plus SERVICE_INDEXES
+
+    A field may be declared by several filters (e.g. platform is filtered
+    and grouped on); declarations must agree on the type, and tenant or
+    principal flags from any of them apply.
+
+    Raises:
+        ValueError: On an unknown type or conflicting declarations
+    """
+    specs: Dict[str, IndexSpec] = {spec.field_name: spec for spec in SERVICE_INDEXES}
+
+    for filter_name, field in SearchFilters.model_fields.items():
+        extra = field.json_schema_extra if isinstance(field.json_schema_extra, dict) else {}
+        for declaration in extra.get("payload_indexes", []):
+            type_name = declaration["type"]
+            if type_name not in SCHEMA_TYPES:
+                raise ValueError(f"SearchFilters.{filter_name}: unknown index type '{type_name}'")
+
+            spec = IndexSpec(
+                field_name=declaration["field"],
+                schema_type=SCHEMA_TYPES[type_name],
+                is_tenant=declaration.get("is_tenant", False),
+                is_principal=declaration.get("is_principal", False),
+            )
+            existing = specs.get(spec.field_name)
+            if existing is not None:
+                if existing.schema_type != spec.schema_type:
+                    raise ValueError(
+                        f"SearchFilters.{filter_name}: '{spec.field_name}' declared as both "
+                        f"{existing.schema_type.value} and {spec.schema_type.value}"
+                    )
+                spec = IndexSpec(
+                    spec.field_name,
+                    spec.schema_type,
+                    is_tenant=existing.is_tenant or spec.is_tenant,
+                    is_principal=existing.is_principal or spec.is_principal,
+                )
+            specs[spec.field_name] = spec
+
+    return list(specs.values())
+
+
+def payload_value_type(value: Any) -> Optional[PayloadSchemaType]:
+    """Index type that fits a payload value, or None if it cannot be indexed"""
+    if isinstance(value, bool):
+        return PayloadSchemaType.BOOL
+    if isinstance(value, int):
+        return PayloadSchemaType.INTEGER
+    if isinstance(value, float):
+        return PayloadSchemaType.FLOAT
+    if isinstance(value, str):
+        return PayloadSchemaType.KEYWORD
+    return None
+
+
+def check_against_payload(specs: List[IndexSpec], payload: Dict[str, Any]):
+    """
+    Verify declared indexes against a payload from chunk_to_payload
+
+    Integer values also fit a FLOAT index, and ISO strings a DATETIME index.
+
+    Raises:
+        ValueError: If a declared field is never written, or written with a
+            type its index cannot hold
+    """
+    compatible = {
+        PayloadSchemaType.FLOAT: {PayloadSchemaType.FLOAT, PayloadSchemaType.INTEGER},
+        PayloadSchemaType.DATETIME: {PayloadSchemaType.KEYWORD},
+    }
+    for spec in specs:
+        if spec.field_name not in payload:
+            raise ValueError(f"Indexed field '{spec.field_name}' is not written by chunk_to_payload")
+        value_type = payload_value_type(payload[spec.field_name])
+        if value_type not in compatible.get(spec.schema_type, {spec.schema_type}):
+            raise ValueError(
+                f"Field '{spec.field_name}' holds {value_type.value if value_type else 'unindexable'} "
+                f"values but is declared as a {spec.schema_type.value} index"
+            )
+
+
+def plan_indexes(client: QdrantClient, collection_name: str,
+                 specs: Optional[List[IndexSpec]] = None) -> tuple:
+    """
+    Diff declared indexes against the collection's payload_schema
+
+    Returns:
+        Tuple of (missing specs, specs whose existing index has the wrong type or flags)
+    """
+    specs = declared_indexes() if specs is None else specs
+    schema = client.get_collection(collection_name).payload_schema or {}
+
+    missing = [spec for spec in specs if spec.field_name not in schema]
+    mismatched = [
+        spec for spec in specs
+        if spec.field_name in schema and not spec.matches(schema[spec.field_name])
+    ]
+    return missing, mismatched
+
+
+def sync_payload_indexes(client: QdrantClient, collection_name: str,
+                         payload_sample: Optional[Dict[str, Any]] = None,
+                         dry_run: bool = False) -> List[IndexSpec]:
+    """
+    Create missing payload indexes and rebuild mismatched ones
+
+    Indexes that exist but are not declared are left alone.
+
+    Args:
+        client: Qdrant client
+        collection_name: Collection (or alias) to index
+        payload_sample: A chunk_to_payload result to validate declarations against
+        dry_run: Only print the plan
+
+    Returns:
+        Specs that were (or, in a dry run, would be) created
+    """
+    specs = declared_indexes()
+    if payload_sample is not None:
+        check_against_payload(specs, payload_sample)
+
+    missing, mismatched = plan_indexes(client, collection_name, specs)
+    if not missing and not mismatched:
+        print(f"   ✅ All {len(specs)} payload indexes present on '{collection_name}'")
+        return []
+
+    for spec in mismatched:
+        print(f"   🔁 Rebuilding '{spec.field_name}' index as {describe(spec)}")
+        if not dry_run:
+            client.delete_payload_index(collection_name=collection_name, field_name=spec.field_name)
+
+    for spec in missing + mismatched:
+        if spec in missing:
+            print(f"   ➕ Creating '{spec.field_name}' index ({describe(spec)})")
+        if not dry_run:
+            client.create_payload_index(
+                collection_name=collection_name,
+                field_name=spec.field_name,
+                field_schema=spec.field_schema(),
+            )
+
+    return missing + mismatched
+
+
+def describe(spec: IndexSpec) -> str:
+    """Human-readable index type, e.g. 'keyword, tenant'"""
+    flags = [name for name, on in (("tenant", spec.is_tenant), ("principal", spec.is_principal)) if on]
+    return ", ".join([spec.schema_type.value] + flags)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Create the payload indexes the search API filters on")
+    parser.add_argument("--collection-name", default=COLLECTION_NAME, help="Collection or alias to index")
+    parser.add_argument("--dry-run", action="store_true", help="Show missing indexes without creating them")
+    parser.add_argument("--qdrant-url", default=QDRANT_URL, help="Qdrant server URL")
+    parser.add_argument("--api-key", default=QDRANT_API_KEY, help="Qdrant API key")
+    args = parser.parse_args()
+
+    client = QdrantClient(url=args.qdrant_url, api_key=args.api_key, timeout=60, prefer_grpc=False)
+    try:
+        print(f"Payload indexes for '{args.collection_name}':")
+        for spec in declared_indexes():
+            print(f"   - {spec.field_name}: {describe(spec)}")
+        print()
+        changed = sync_payload_indexes(client, args.collection_name, dry_run=args.dry_run)
+        verb = "Would create" if args.dry_run else "Created"
+        print(f"\n✅ {verb} {len(changed)} indexes")
+    finally:
+        client.close()
@@ -10,7 +10,17 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime, timezone
 
 from qdrant_client import QdrantClient
-from qdrant_client.models import Filter, FieldCondition, MatchValue, SparseVector, Range
+from qdrant_client.models import (
+    Filter,
+    FieldCondition,
+    MatchValue,
+    SparseVector,
+    Range,
+    Prefetch,
+    FusionQuery,
+    Fusion,
+    SearchParams,
+)
 from FlagEmbedding import BGEM3FlagModel
 
 
@@ -20,10 +30,158 @@ QDRANT_URL = os.getenv('QDRANT_URL')
 COLLECTION_NAME = os.getenv('COLLECTION_NAME')
 MODEL_NAME = os.getenv('MODEL_NAME')
 
+# Candidates fetched per branch (dense / sparse) before server-side fusion
+HYBRID_PREFETCH_LIMIT = int(os.getenv('HYBRID_PREFETCH_LIMIT', 50))
+
 # Device detection
 DEVICE = "mps" if torch.backends.mps.is_available() else "cuda" if torch.cuda.is_available() else "cpu"
 
 
+def hybrid_prefetch(
+    query_dense,
+    query_sparse: SparseVector,
+    query_filter: Optional[Filter],
+    limit: int,
+    dense_prefetch_limit: Optional[int] = None,
+    sparse_prefetch_limit: Optional[int] = None,
+    search_params: Optional[SearchParams] = None,
+) -> List[Prefetch]:
+    """
+    Dense and sparse candidate prefetches for a server-side hybrid query
+
+    Each branch fetches at least limit candidates.
+    """
+    dense_limit = max(dense_prefetch_limit or HYBRID_PREFETCH_LIMIT, limit)
+    sparse_limit = max(sparse_prefetch_limit or HYBRID_PREFETCH_LIMIT, limit)
+
+    return [
+        Prefetch(
+            query=query_dense.tolist() if hasattr(query_dense, 'tolist') else query_dense,
+            using="dense",
+            filter=query_filter,
+            params=search_params,
+            limit=dense_limit,
+        ),
+        Prefetch(
+            query=query_sparse,
+            using="sparse",
+            filter=query_filter,
+            limit=sparse_limit,
+        ),
+    ]
+
+
+def hybrid_query_request(
+    collection_name: str,
+    query_dense,
+    query_sparse: SparseVector,
+    query_filter: Optional[Filter],
+    limit: int,
+    dense_prefetch_limit: Optional[int] = None,
+    sparse_prefetch_limit: Optional[int] = None,
+    search_params: Optional[SearchParams] = None,
+) -> Dict[str, Any]:
+    """
+    Build query_points arguments for a single-request hybrid search.
+
+    Dense and sparse candidates are prefetched server-side and fused with
+    reciprocal rank fusion, which ranks by position in each branch instead
+    of comparing cosine and sparse dot-product scores directly. The same
+    arguments work with QdrantClient and AsyncQdrantClient.
+
+    Args:
+        collection_name: Collection (or alias) to search
+        query_dense: Dense query vector
+        query_sparse: Sparse query vector
+        query_filter: Filter applied to both branches
+        limit: Number of fused results to return
+        dense_prefetch_limit: Dense candidates to fuse (default HYBRID_PREFETCH_LIMIT)
+        sparse_prefetch_limit: Sparse candidates to fuse (default HYBRID_PREFETCH_LIMIT)
+        search_params: HNSW / quantization params for the dense branch
+
+    Returns:
+        Keyword arguments for client.query_points()
+    """
+    return dict(
+        collection_name=collection_name,
+        prefetch=hybrid_prefetch(
+            query_dense,
+            query_sparse,
+            query_filter,
+            limit,
+            dense_prefetch_limit=dense_prefetch_limit,
+            sparse_prefetch_limit=sparse_prefetch_limit,
+            search_params=search_params,
+        ),
+        query=FusionQuery(fusion=Fusion.RRF),
+        limit=limit,
+        with_payload=True,
+    )
+
+
+def rerank_query_request(
+    collection_name: str,
+    query_dense,
+    query_sparse: SparseVector,
+    query_colbert,
+    query_filter: Optional[Filter],
+    limit: int,
+    dense_prefetch_limit: Optional[int] = None,
+    sparse_prefetch_limit: Optional[int] = None,
+    search_params: Optional[SearchParams] = None,
+) -> Dict[str, Any]:
+    """
+    Build query_points arguments for hybrid retrieval with ColBERT reranking.
+
+    Dense and sparse candidates are prefetched as in hybrid_query_request,
+    then the union is rescored server-side by MaxSim between the query's
+    and each candidate's ColBERT token vectors, all in one request. Needs a
+    collection uploaded with ColBERT multi-vectors (--colbert).
+
+    Args:
+        collection_name: Collection (or alias) to search
+        query_dense: Dense query vector
+        query_sparse: Sparse query vector
+        query_colbert: ColBERT query token vectors, shape [num_tokens, dim]
+        query_filter: Filter applied to both branches
+        limit: Number of reranked results to return
+        dense_prefetch_limit: Dense candidates to rerank (default HYBRID_PREFETCH_LIMIT)
+        sparse_prefetch_limit: Sparse candidates to rerank (default HYBRID_PREFETCH_LIMIT)
+        search_params: HNSW / quantization params for the dense branch
+
+    Returns:
+        Keyword arguments for client.query_points()
+    """
+    return dict(
+        collection_name=collection_name,
+        prefetch=hybrid_prefetch(
+            query_dense,
+            query_sparse,
+            query_filter,
+            limit,
+            dense_prefetch_limit=dense_prefetch_limit,
+            sparse_prefetch_limit=sparse_prefetch_limit,
+            search_params=search_params,
+        ),
+        query=query_colbert.tolist() if hasattr(query_colbert, 'tolist') else query_colbert,
+        using="colbert",
+        limit=limit,
+        with_payload=True,
+    )
+
+
+def hybrid_query(client: QdrantClient, *args, **kwargs):
+    """
+    Hybrid search in a single Query API request (dense + sparse, RRF fusion).
+
+    Takes the same arguments as hybrid_query_request() after the client.
+
+    Returns:
+        List of scored points, best first
+    """
+    return client.query_points(**hybrid_query_request(*args, **kwargs)).points
+
+
 def search_conversations(
     query: str,
     limit: int = 10,
@@ -33,6 +191,9 @@ def search_conversations(
     date_to: Optional[str] = None,
     metadata_filter: Optional[str] = None,
     api_key: Optional[str] = QDRANT_API_KEY,
+    dense_prefetch_limit: Optional[int] = None,
+    sparse_prefetch_limit: Optional[int] = None,
+    search_params: Optional[SearchParams] = None,
 ):
     """
     Search conversations using BGE-M3 embeddings with hybrid retrieval.
@@ -46,6 +207,9 @@ def search_conversations(
         date_to: Filter by date (ISO format)
         metadata_filter: Filter by metadata in format "key:value"
         api_key: Qdrant API key
+        dense_prefetch_limit: Dense candidates fused per query (default HYBRID_PREFETCH_LIMIT)
+        sparse_prefetch_limit: Sparse candidates fused per query (default HYBRID_PREFETCH_LIMIT)
+        search_params: HNSW / quantization params for the dense branch
 
     Returns:
         List of search results with scores and payloads
@@ -186,40 +350,23 @@ def search_conversations(
 
         query_filter = Filter(must=filters) if filters else None
 
-        # Hybrid Search using two separate search calls
-        print(f"Searching with hybrid (dense + sparse)...")
+        # Hybrid search: dense + sparse prefetch fused server-side (RRF)
+        print(f"Searching with hybrid (dense + sparse, RRF fusion)...")
 
         if not COLLECTION_NAME:
             raise ValueError("COLLECTION_NAME environment variable is not set. Please set it in your .env file.")
 
-        # Dense search
-        dense_results = client.query_points(
-            collection_name=COLLECTION_NAME,
-            query=query_dense.tolist(),
-            using="dense",
-            query_filter=query_filter,
-            limit=limit,
-            with_payload=True,
-        ).points
-
-        # Sparse search
-        sparse_results = client.query_points(
-            collection_name=COLLECTION_NAME,
-            query=query_sparse,
-            using="sparse",
-            query_filter=query_filter,
-            limit=limit,
-            with_payload=True,
-        ).points
-
-        # Combine and re-rank results (simple approach: combine and remove duplicates)
-        combined_results = {result.id: result for result in dense_results}
-        for result in sparse_results:
-            if result.id not in combined_results:
-                combined_results[result.id] = result
-
-        # Sort by score (descending)
-        results = sorted(combined_results.values(), key=lambda r: r.score, reverse=True)[:limit]
+        results = hybrid_query(
+            client,
+            COLLECTION_NAME,
+            query_dense,
+            query_sparse,
+            query_filter,
+            limit,
+            dense_prefetch_limit=dense_prefetch_limit,
+            sparse_prefetch_limit=sparse_prefetch_limit,
+            search_params=search_params,
+        )
 
         # Display results
         print(f"\n{'='*70}")
@@ -24,6 +24,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 # Import search functions
 from retrieval.search_engine import search_conversations
+from retrieval.collection_profiles import COLLECTION_PROFILE, COLLECTION_PROFILES, get_profile
 from retrieval.interactive_search import interactive_search
 
 # Environment variables
@@ -59,6 +60,32 @@ if __name__ == "__main__":
         "--metadata-filter",
         help="Filter by metadata in the format key:value"
     )
+    parser.add_argument(
+        "--dense-prefetch",
+        type=int,
+        help="Dense candidates fused per query (default: HYBRID_PREFETCH_LIMIT or 50)"
+    )
+    parser.add_argument(
+        "--sparse-prefetch",
+        type=int,
+        help="Sparse candidates fused per query (default: HYBRID_PREFETCH_LIMIT or 50)"
+    )
+    parser.add_argument(
+        "--profile",
+        default=COLLECTION_PROFILE,
+        choices=list(COLLECTION_PROFILES),
+        help="Collection profile whose search defaults to use (default: COLLECTION_PROFILE or standard)"
+    )
+    parser.add_argument(
+        "--hnsw-ef",
+        type=int,
+        help="HNSW search breadth for the dense branch (default: from the profile)"
+    )
+    parser.add_argument(
+        "--oversampling",
+        type=float,
+        help="Quantized candidates fetched per result before rescoring (default: from the profile)"
+    )
     parser.add_argument(
         "--api-key",
         default=QDRANT_API_KEY,
@@ -81,7 +108,10 @@ if __name__ == "__main__":
             platform_filter=args.platform,
             with_interpretations_only=args.interpretations,
             metadata_filter=args.metadata_filter,
-            api_key=args.api_key
+            api_key=args.api_key,
+            dense_prefetch_limit=args.dense_prefetch,
+            sparse_prefetch_limit=args.sparse_prefetch,
+            search_params=get_profile(args.profile).search_params(args.hnsw_ef, args.oversampling)
         )
     else:
         # Interactive mode
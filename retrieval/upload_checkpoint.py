@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Durable progress file for resumable Qdrant uploads
+
+Records the chunk ID of every point Qdrant has acknowledged, one per line,
+appended and fsync'd after each upserted batch. Because chunk IDs are
+content-addressed, a rerun with --resume can skip exactly the chunks that
+are already embedded and uploaded.
+
+The first line is a JSON header naming the collection and embedding mode;
+resuming against a checkpoint written for different settings is refused.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+
+class UploadCheckpoint:
+    """Append-only, thread-safe set of uploaded chunk IDs backed by a file"""
+
+    def __init__(self, path: str, collection_name: str, embedding_mode: str):
+        self.path = path
+        self.header = {"collection": collection_name, "embedding_mode": embedding_mode}
+        self.completed = set()
+        self._lock = threading.Lock()
+        self._file = None
+
+    def start(self, resume: bool = False):
+        """
+        Open the progress file
+
+        Args:
+            resume: Load and keep existing progress; otherwise start empty
+
+        Raises:
+            ValueError: If the existing checkpoint was written for another
+                collection or embedding mode
+        """
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+        if resume and os.path.exists(self.path):
+            if self._load():
+                self._drop_partial_line()
+            self._file = open(self.path, 'a', encoding='utf-8')
+        else:
+            self.completed = set()
+            self._file = open(self.path, 'w', encoding='utf-8')
+            self._file.write(json.dumps(self.header) + "\n")
+            self._sync()
+
+    def _load(self) -> bool:
+        """
+        Read the header and completed IDs from an existing progress file
+
+        Returns:
+            True if the file ends in a truncated (unterminated) line
+        """
+        with open(self.path, 'r', encoding='utf-8') as f:
+            header_line = f.readline()
+            try:
+                header = json.loads(header_line) if header_line.strip() else None
+            except json.JSONDecodeError:
+                header = None
+
+            if header != self.header:
+                raise ValueError(
+                    f"Checkpoint {self.path} was written for {header}, not {self.header}; "
+                    f"delete it or upload without --resume"
+                )
+
+            # A crash mid-write can leave a truncated last line; ignore it
+            lines = f.read().split("\n")
+            truncated = bool(lines[-1])
+            if truncated:
+                lines.pop()
+            self.completed = {line for line in lines if line}
+
+        return truncated
+
+    def _drop_partial_line(self):
+        """Truncate the file after its last newline so the next ID starts cleanly"""
+        with open(self.path, 'r+b') as f:
+            data = f.read()
+            f.truncate(data.rfind(b"\n") + 1)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def __contains__(self, chunk_id: str) -> bool:
+        return chunk_id in self.completed
+
+    def __len__(self) -> int:
+        return len(self.completed)
+
+    def mark_done(self, chunk_ids: Iterable[str]):
+        """Durably record chunk IDs whose points Qdrant has acknowledged"""
+        chunk_ids = [str(chunk_id) for chunk_id in chunk_ids]
+        with self._lock:
+            self._file.write("".join(f"{chunk_id}\n" for chunk_id in chunk_ids))
+            self._sync()
+            self.completed.update(chunk_ids)
+
+    def close(self):
+        """Close the progress file, keeping it for a later --resume"""
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    def finish(self):
+        """Close and delete the progress file after a complete upload"""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def read_checkpoint_header(path: str) -> Optional[Dict[str, str]]:
+    """Header of an existing progress file, or None if it is missing or unreadable"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            header = json.loads(f.readline())
+    except (OSError, ValueError):
+        return None
+    return header if isinstance(header, dict) else None
+
+
+def default_checkpoint_path(base_dir: Path, collection_name: str) -> str:
+    """Progress file location for a collection"""
+    return str(base_dir / f"{collection_name}.progress")
+
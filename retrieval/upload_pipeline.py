@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Overlapped embed/upload pipeline for Qdrant ingestion
+
+Three stages connected by bounded queues so CPU inference and network
+round-trips overlap instead of alternating:
+
+1. Text stage (background thread): turns chunks into embedding texts and
+   groups them into batches
+2. Encode stage (calling thread): embeds each text batch and builds points
+3. Upsert stage (thread pool): sends point batches to Qdrant, with several
+   requests in flight
+
+Backpressure: the text queue and the number of in-flight upserts are both
+bounded, so a slow stage stalls the stages feeding it rather than letting
+work pile up in memory. Total wall time is bounded by the slowest stage.
+"""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple
+
+# Marks the end of the text stage's output
+_DONE = object()
+
+# Seconds between stop-flag checks while blocked on a full queue
+_POLL_INTERVAL = 0.1
+
+
+@dataclass
+class PipelineConfig:
+    """Batch sizes and concurrency limits for each pipeline stage"""
+
+    text_batch_size: int = 32     # Chunks per batch handed to the encoder
+    encode_batch_size: int = 4    # Max texts per model forward pass
+    encode_token_budget: Optional[int] = None  # Padded tokens per forward pass (None = fixed-size)
+    upsert_batch_size: Optional[int] = 64  # Points per Qdrant upsert request (None: the uploader picks it)
+    queue_size: int = 4           # Text batches buffered ahead of the encoder
+    upsert_workers: int = 2       # Concurrent upsert requests
+
+
+class UploadPipeline:
+    """
+    Run chunks through text generation, encoding and upserts concurrently
+
+    The pipeline is agnostic of models and clients; each stage is a callable:
+        make_text(chunk) -> str
+        embed(texts) -> (dense_vecs, sparse_weights[, colbert_vecs])
+        make_point(chunk, dense, sparse[, colbert]) -> point
+        upsert(points) -> None
+    on_batch_uploaded(points) is called from the upsert worker after each
+    successful upsert (e.g. for checkpointing); progress(n) reports chunks
+    completed.
+    """
+
+    def __init__(
+        self,
+        make_text: Callable[[Any], str],
+        embed: Callable[[List[str]], Tuple[Sequence, ...]],
+        make_point: Callable[..., Any],
+        upsert: Callable[[List[Any]], None],
+        config: Optional[PipelineConfig] = None,
+        on_batch_uploaded: Optional[Callable[[List[Any]], None]] = None,
+        progress: Optional[Callable[[int], None]] = None,
+    ):
+        self.make_text = make_text
+        self.embed = embed
+        self.make_point = make_point
+        self.upsert = upsert
+        self.config = config or PipelineConfig()
+        self.on_batch_uploaded = on_batch_uploaded
+        self.progress = progress
+
+    def run(self, chunks: Iterable[Any]) -> int:
+        """
+        Push all chunks through the pipeline
+
+        Returns:
+            Number of points upserted
+
+        Raises:
+            Whatever any stage raised; the remaining stages are stopped
+        """
+        config = self.config
+        text_queue: queue.Queue = queue.Queue(maxsize=config.queue_size)
+        stop = threading.Event()
+        producer_errors: List[BaseException] = []
+
+        producer = threading.Thread(
+            target=self._produce_texts,
+            args=(chunks, text_queue, stop, producer_errors),
+            name="upload-text-stage",
+            daemon=True,
+        )
+        producer.start()
+
+        # Caps in-flight upserts; acquiring blocks the encoder when Qdrant lags
+        inflight = threading.Semaphore(config.upsert_workers * 2)
+        futures: List[Future] = []
+        pending_points: List[Any] = []
+        uploaded = 0
+
+        try:
+            with ThreadPoolExecutor(
+                max_workers=config.upsert_workers, thread_name_prefix="upload-upsert"
+            ) as executor:
+                while True:
+                    item = text_queue.get()
+                    if item is _DONE:
+                        break
+
+                    batch_chunks, batch_texts = item
+                    embeddings = self.embed(batch_texts)
+                    for chunk, *vectors in zip(batch_chunks, *embeddings):
+                        pending_points.append(self.make_point(chunk, *vectors))
+
+                    while len(pending_points) >= config.upsert_batch_size:
+                        batch = pending_points[:config.upsert_batch_size]
+                        pending_points = pending_points[config.upsert_batch_size:]
+                        futures.append(self._submit_upsert(executor, inflight, batch, futures))
+                        uploaded += len(batch)
+
+                if producer_errors:
+                    raise producer_errors[0]
+
+                if pending_points:
+                    futures.append(self._submit_upsert(executor, inflight, pending_points, futures))
+                    uploaded += len(pending_points)
+
+                for future in futures:
+                    future.result()
+
+        except BaseException:
+            stop.set()
+            raise
+        finally:
+            producer.join(timeout=5)
+
+        return uploaded
+
+    def _produce_texts(self, chunks: Iterable[Any], text_queue: queue.Queue,
+                       stop: threading.Event, errors: List[BaseException]):
+        """Text stage: build embedding texts and enqueue them in batches"""
+        try:
+            batch_chunks, batch_texts = [], []
+            for chunk in chunks:
+                if stop.is_set():
+                    return
+                batch_chunks.append(chunk)
+                batch_texts.append(self.make_text(chunk))
+
+                if len(batch_chunks) >= self.config.text_batch_size:
+                    self._put(text_queue, (batch_chunks, batch_texts), stop)
+                    batch_chunks, batch_texts = [], []
+
+            if batch_chunks:
+                self._put(text_queue, (batch_chunks, batch_texts), stop)
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            self._put(text_queue, _DONE, stop)
+
+    @staticmethod
+    def _put(text_queue: queue.Queue, item: Any, stop: threading.Event):
+        """Blocking put that gives up once the pipeline is stopping"""
+        while not stop.is_set():
+            try:
+                text_queue.put(item, timeout=_POLL_INTERVAL)
+                return
+            except queue.Full:
+                continue
+
+    def _submit_upsert(self, executor: ThreadPoolExecutor, inflight: threading.Semaphore,
+                       points: List[Any], futures: List[Future]) -> Future:
+        """Upsert stage: schedule one batch, failing fast on earlier errors"""
+        for future in futures:
+            if future.done() and future.exception() is not None:
+                raise future.exception()
+
+        inflight.acquire()
+
+        def job():
+            self.upsert(points)
+            if self.on_batch_uploaded:
+                self.on_batch_uploaded(points)
+            if self.progress:
+                self.progress(len(points))
+
+        future = executor.submit(job)
+        future.add_done_callback(lambda _: inflight.release())
+        return future
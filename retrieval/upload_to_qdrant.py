@@ -5,9 +5,12 @@ Upload WillGPT conversations to Qdrant with BGE-M3 hybrid embeddings
 
 import sys
 import os
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
 from pathlib import Path
 from tqdm import tqdm
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Iterator
 import torch
 from dotenv import load_dotenv
 
@@ -18,15 +21,40 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 project_root = Path(__file__).parent.parent
 load_dotenv(project_root / ".env")
 
-from parsers import ConversationCollection
+from parsers import ConversationCollection, UniversalChunk
+from parsers.universal_format import to_epoch, to_iso
+from retrieval.embedding_cache import EmbeddingCache, cached_encode, cached_encode_colbert
+from retrieval.length_batching import encode_length_bucketed, estimate_token_counts
+from retrieval.collection_versions import (
+    INGESTED_AT_FIELD,
+    KEEP_COLLECTION_VERSIONS,
+    AliasSwapDeclined,
+    copy_payload_indexes,
+    is_legacy_collection,
+    is_resumable_version,
+    prune_versions,
+    resolve_alias,
+    swap_alias,
+    validate_version,
+    versioned_collection_name,
+)
+from retrieval.upload_checkpoint import UploadCheckpoint, default_checkpoint_path, read_checkpoint_header
+from retrieval.upload_pipeline import PipelineConfig, UploadPipeline
+from retrieval.payload_indexes import sync_payload_indexes
+from retrieval.collection_profiles import COLLECTION_PROFILE, COLLECTION_PROFILES, CollectionProfile, get_profile
 from qdrant_client import QdrantClient
 from qdrant_client.models import (
-    Distance,
-    VectorParams,
     PointStruct,
+    VectorParams,
+    Distance,
+    Datatype,
+    HnswConfigDiff,
+    MultiVectorConfig,
+    MultiVectorComparator,
     SparseVectorParams,
     SparseIndexParams,
     SparseVector,
+    PointIdsList,
 )
 from FlagEmbedding import BGEM3FlagModel
 
@@ -37,15 +65,28 @@ MODEL_NAME=os.getenv('MODEL_NAME')
 EMBEDDING_MODE = "balanced"
 DEVICE = "cpu"
 BATCH_SIZE= 4
-
-
-def setup_qdrant_collection(client: QdrantClient, collection_name: str, vector_size: int, auto_confirm: bool = False):
+ENCODE_MAX_BATCH_SIZE = 64  # Upper bound on texts per forward pass when batching by tokens
+ENCODE_TOKEN_BUDGET = 8192  # Padded tokens per forward pass (batch size × longest text)
+TEXT_BATCH_SIZE = 128  # Chunks handed to the encoder at once (the length-sorting window)
+UPSERT_BATCH_SIZE = 64  # Points per Qdrant upsert request
+COLBERT_UPSERT_BATCH_SIZE = 8  # Points per upsert with ColBERT vectors (one 1024-d vector per token)
+UPSERT_WORKERS = 2  # Concurrent upsert requests
+PIPELINE_QUEUE_SIZE = 4  # Text batches buffered ahead of the encoder
+SCROLL_BATCH_SIZE = 1000  # Points per scroll/delete request during sync
+EMBEDDING_CONFIG_FIELD = "embedding_config"  # Model + mode a point was embedded with (sync re-embeds on change)
+CHECKPOINT_DIR = Path(os.getenv('UPLOAD_CHECKPOINT_DIR', str(project_root / "data" / "cache" / "upload_checkpoints")))
+EMBEDDING_CACHE_PATH = os.getenv('EMBEDDING_CACHE_PATH', str(project_root / "data" / "cache" / "embeddings.sqlite"))
+
+
+def setup_qdrant_collection(client: QdrantClient, collection_name: str, vector_size: int, auto_confirm: bool = False,
+                            profile: Optional[CollectionProfile] = None, colbert: bool = False):
     """
     Create or recreate Qdrant collection with hybrid search support
 
     BGE-M3 produces:
     - Dense vectors (1024 dims for bge-m3)
     - Sparse vectors (lexical/keyword matching)
+    - ColBERT multi-vectors (one 1024-d vector per token), stored only with colbert=True
     """
 
     # Check if collection exists
@@ -66,16 +107,79 @@ def setup_qdrant_collection(client: QdrantClient, collection_name: str, vector_s
         print(f"Deleting existing collection '{collection_name}'...")
         client.delete_collection(collection_name)
 
-    print(f"\nCreating collection '{collection_name}' with hybrid search...")
+    create_qdrant_collection(client, collection_name, vector_size, profile=profile, colbert=colbert)
+
+
+def colbert_vector_params(size: int) -> VectorParams:
+    """
+    Multi-vector params for BGE-M3 ColBERT token vectors
+
+    The vectors only rerank prefetched candidates by MaxSim and are never
+    searched directly, so no HNSW graph is built (m=0). A chunk stores one
+    vector per token, which makes this by far the largest part of a point:
+    vectors are kept as float16 on disk.
+    """
+    return VectorParams(
+        size=size,
+        distance=Distance.COSINE,
+        multivector_config=MultiVectorConfig(comparator=MultiVectorComparator.MAX_SIM),
+        hnsw_config=HnswConfigDiff(m=0),
+        datatype=Datatype.FLOAT16,
+        on_disk=True,
+    )
+
+
+def has_colbert_vector(client: QdrantClient, collection_name: str) -> bool:
+    """True if the collection (or alias target) stores ColBERT multi-vectors"""
+    vectors = client.get_collection(collection_name).config.params.vectors
+    return isinstance(vectors, dict) and "colbert" in vectors
+
+
+def match_colbert_setting(client: QdrantClient, collection_name: str, colbert: bool) -> bool:
+    """
+    ColBERT setting to use when writing into an existing collection
+
+    Points written without ColBERT vectors would drop out of rerank
+    searches, so the collection's own layout wins if it has them.
+
+    Raises:
+        ValueError: If ColBERT was requested but the collection has no colbert vector
+    """
+    stored = has_colbert_vector(client, collection_name)
+    if colbert and not stored:
+        raise ValueError(
+            f"❌ Error: '{collection_name}' has no colbert vector; "
+            f"run a full upload with --colbert to add one"
+        )
+    if stored and not colbert:
+        print(f"   '{collection_name}' stores ColBERT multi-vectors; encoding them too")
+    return stored
+
+
+def create_qdrant_collection(client: QdrantClient, collection_name: str, vector_size: int,
+                             profile: Optional[CollectionProfile] = None, colbert: bool = False):
+    """
+    Create an empty collection with dense + sparse named vectors
+
+    The dense vector's quantization, on-disk storage and HNSW settings come
+    from profile (default: the COLLECTION_PROFILE environment setting).
+    With colbert=True a "colbert" multi-vector is added for late-interaction
+    reranking (see colbert_vector_params).
+    """
+    profile = profile or get_profile(COLLECTION_PROFILE)
+
+    print(f"\nCreating collection '{collection_name}' with hybrid search (profile: {profile.name}"
+          f"{', ColBERT multi-vectors' if colbert else ''})...")
+
+    vectors_config = {
+        "dense": profile.vector_params(vector_size)
+    }
+    if colbert:
+        vectors_config["colbert"] = colbert_vector_params(vector_size)
 
     client.create_collection(
         collection_name=collection_name,
-        vectors_config={
-            "dense": VectorParams(
-                size=vector_size,
-                distance=Distance.COSINE,
-            )
-        },
+        vectors_config=vectors_config,
         sparse_vectors_config={
             "sparse": SparseVectorParams(
                 index=SparseIndexParams(
@@ -85,45 +189,147 @@ def setup_qdrant_collection(client: QdrantClient, collection_name: str, vector_s
         },
     )
 
+    # Index before inserting so the tenant (platform) layout applies from the start
+    sync_payload_indexes(client, collection_name, payload_sample=sample_payload())
+
     print(f"✅ Collection created successfully!")
 
 
-def generate_bge_m3_embeddings(model: BGEM3FlagModel, texts: List[str]) -> tuple:
+def embedding_config(embedding_mode: str) -> str:
+    """Identifier of the model + embedding mode stored on every point"""
+    return f"{MODEL_NAME}|{embedding_mode}"
+
+
+def fetch_indexed_points(client: QdrantClient, collection_name: str) -> Dict[str, Any]:
     """
-    Generate BGE-M3 hybrid embeddings (dense + sparse)
+    List every point currently in a collection with the payload sync needs
 
     Returns:
-        tuple: (dense_embeddings, sparse_embeddings_list)
+        Mapping of str(point_id) -> Record carrying its original ID (UUID
+        string or legacy int) and its platform / embedding config payload
+    """
+    indexed = {}
+    offset = None
+
+    while True:
+        points, offset = client.scroll(
+            collection_name=collection_name,
+            limit=SCROLL_BATCH_SIZE,
+            offset=offset,
+            with_payload=["platform", EMBEDDING_CONFIG_FIELD],
+            with_vectors=False,
+        )
+        for point in points:
+            indexed[str(point.id)] = point
+
+        if offset is None:
+            break
+
+    return indexed
+
+
+def delete_points(client: QdrantClient, collection_name: str, point_ids: List[Any]):
+    """Delete points by ID in batches"""
+    for start in range(0, len(point_ids), SCROLL_BATCH_SIZE):
+        client.delete(
+            collection_name=collection_name,
+            points_selector=PointIdsList(points=point_ids[start:start + SCROLL_BATCH_SIZE]),
+        )
+
+
+def generate_bge_m3_embeddings(
+    model: BGEM3FlagModel,
+    texts: List[str],
+    cache: Optional[EmbeddingCache] = None,
+    mode: str = EMBEDDING_MODE,
+    batch_size: int = BATCH_SIZE,
+    token_budget: Optional[int] = ENCODE_TOKEN_BUDGET,
+    colbert: bool = False,
+) -> tuple:
+    """
+    Generate BGE-M3 hybrid embeddings (dense + sparse, optionally ColBERT)
+
+    Texts found in the embedding cache are not re-encoded; newly encoded
+    texts are written back to it.
+
+    With a token_budget, texts still to be encoded are sorted by token
+    length and packed into batches of at most token_budget padded tokens
+    (and at most batch_size texts), so short texts are not padded to the
+    length of long ones. Output order always matches the input order.
+
+    With colbert=True the cache is not read: ColBERT vectors are too large
+    to cache and come out of the same forward pass as dense + sparse, so
+    every distinct text is encoded (see cached_encode_colbert). New dense +
+    sparse vectors are still written to the cache.
+
+    Args:
+        model: Loaded BGE-M3 model
+        texts: Embedding texts
+        cache: Optional persistent embedding cache
+        mode: Embedding mode the texts were generated with (cache key part)
+        batch_size: Texts per model forward pass (upper bound with a token budget)
+        token_budget: Max padded tokens per forward pass; None for fixed-size batches
+        colbert: Also return ColBERT multi-vectors
+
+    Returns:
+        tuple: (dense_embeddings, sparse_embeddings_list[, colbert_vecs])
             - dense_embeddings: numpy array of shape [batch_size, 1024]
             - sparse_embeddings_list: list of dicts with token_id: weight mappings
+            - colbert_vecs: list of float16 arrays of shape [num_tokens, 1024]
     """
 
-    # BGE-M3 encode method returns dict with 'dense_vecs' and 'lexical_weights'
-    output = model.encode(
-        texts,
-        return_dense=True,
-        return_sparse=True,  # Enable sparse (lexical) vectors
-        return_colbert_vecs=False,
-        batch_size=BATCH_SIZE,
-    )
-
-    dense_vecs = output['dense_vecs']  # Shape: [batch_size, 1024]
-    lexical_weights = output['lexical_weights']  # List of dicts: [{'token_id': weight, ...}]
+    def encode(batch: List[str]) -> tuple:
+        # BGE-M3 encode method returns dict with 'dense_vecs' and 'lexical_weights'
+        output = model.encode(
+            batch,
+            return_dense=True,
+            return_sparse=True,  # Enable sparse (lexical) vectors
+            return_colbert_vecs=colbert,
+            batch_size=len(batch) if token_budget else batch_size,
+        )
+        if colbert:
+            return output['dense_vecs'], output['lexical_weights'], output['colbert_vecs']
+        return output['dense_vecs'], output['lexical_weights']
+
+    def encode_bucketed(batch: List[str]) -> tuple:
+        return encode_length_bucketed(
+            batch,
+            encode,
+            estimate_token_counts,
+            token_budget=token_budget,
+            max_batch_size=batch_size,
+        )
 
-    return dense_vecs, lexical_weights
+    encode_fn = encode_bucketed if token_budget else encode
+    if colbert:
+        return cached_encode_colbert(texts, mode, encode_fn, cache=cache)
+    return cached_encode(texts, mode, encode_fn, cache=cache)
 
 
-def chunk_to_payload(chunk) -> Dict[str, Any]:
+def chunk_to_payload(chunk, ingested_at: Optional[float] = None,
+                     embedding_config: Optional[str] = None) -> Dict[str, Any]:
     """
     Convert UniversalChunk to Qdrant payload
 
     Stores structured data separately from embeddings for filtering/display
+
+    Args:
+        chunk: Conversation chunk
+        ingested_at: Epoch seconds of the upload run (stored as ingested_at)
+        embedding_config: embedding_config() of the run (lets sync detect a
+            changed model or embedding mode)
     """
 
     payload = {
+        "chunk_id": chunk.chunk_id,
+        "content_hash": chunk.content_hash(),
         "conversation_id": chunk.conversation_id,
         "platform": chunk.platform,
-        "timestamp": chunk.timestamp.isoformat() if chunk.timestamp else None,
+        # Epoch seconds for range filters / order_by, ISO strings for display
+        "timestamp": to_epoch(chunk.timestamp),
+        "timestamp_iso": to_iso(chunk.timestamp),
+        "conversation_start": to_epoch(chunk.conversation_start),
+        "conversation_start_iso": to_iso(chunk.conversation_start),
         "conversation_title": chunk.conversation_title,
         "turn_number": chunk.turn_number,
 
@@ -152,29 +358,151 @@ def chunk_to_payload(chunk) -> Dict[str, Any]:
         payload["has_tool_usage"] = True
         payload["tool_count"] = len(chunk.tool_usage)
 
+    if ingested_at is not None:
+        payload[INGESTED_AT_FIELD] = ingested_at
+
+    if embedding_config is not None:
+        payload[EMBEDDING_CONFIG_FIELD] = embedding_config
+
     return payload
 
 
+def sample_payload() -> Dict[str, Any]:
+    """Payload of a fully populated chunk, used to check declared payload indexes"""
+    now = datetime.now(timezone.utc)
+    chunk = UniversalChunk(
+        chunk_id="sample",
+        conversation_id="sample",
+        platform="chatgpt",
+        timestamp=now,
+        conversation_start=now,
+        assistant_model="sample",
+    )
+    return chunk_to_payload(chunk, ingested_at=time.time())
+
+
+def chunk_to_point(chunk, dense_emb, sparse_weights, colbert_vecs=None,
+                   ingested_at: Optional[float] = None,
+                   embedding_config: Optional[str] = None) -> PointStruct:
+    """Build the Qdrant point for a chunk from its dense + sparse (and optional ColBERT) embeddings"""
+
+    # Stable, content-addressed ID: re-uploading the same turn overwrites
+    # its own point instead of colliding with another batch's
+    point_id = chunk.chunk_id
+
+    # Convert sparse weights to Qdrant SparseVector format
+    if sparse_weights:
+        # sparse_weights is a dict like {token_id: weight, ...}
+        indices = list(sparse_weights.keys())
+        values = list(sparse_weights.values())
+        sparse_vector = SparseVector(indices=indices, values=values)
+    else:
+        sparse_vector = SparseVector(indices=[], values=[])
+
+    vector = {
+        "dense": dense_emb.tolist() if hasattr(dense_emb, 'tolist') else dense_emb,
+        "sparse": sparse_vector
+    }
+    if colbert_vecs is not None:
+        vector["colbert"] = colbert_vecs.tolist() if hasattr(colbert_vecs, 'tolist') else colbert_vecs
+
+    return PointStruct(
+        id=point_id,
+        vector=vector,
+        payload=chunk_to_payload(chunk, ingested_at=ingested_at, embedding_config=embedding_config)
+    )
+
+
+@dataclass
+class UploadOptions:
+    """
+    How upload_conversations_to_qdrant writes to the collection
+
+    sync: Keep the live collection and diff against it instead of
+        rebuilding. Chunk IDs are content-addressed, so indexed chunks are
+        skipped, only new or edited chunks (or chunks embedded with another
+        model or embedding mode) are embedded, and indexed points of the
+        export's platforms that are missing from it are deleted.
+    resume: Continue an interrupted rebuild. Full uploads record every
+        acknowledged batch in a progress file (checkpoint_path, by default
+        one per collection under CHECKPOINT_DIR); the unfinished collection
+        is kept and chunks already listed are skipped. Sync mode diffs
+        against the collection itself and needs no checkpoint.
+    in_place: Delete and recreate collection_name instead of building a
+        new version behind the alias.
+    keep_versions: Collection versions kept after the alias switch.
+    profile: Dense vector profile for new collections (see
+        retrieval/collection_profiles.py); collections kept by sync or
+        resume are not reconfigured.
+    colbert: Also store BGE-M3 ColBERT multi-vectors for the "rerank"
+        search mode. Qdrant cannot add a named vector to an existing
+        collection, so sync and resume follow whatever the collection was
+        created with; enabling ColBERT needs a full rebuild.
+    embedding_cache_path: On-disk embedding cache, so a rebuild only
+        encodes texts never embedded before (None disables it).
+    checkpoint_path: Progress file for resumable uploads.
+    pipeline: Per-stage batch sizes, queue depth and concurrent upserts.
+        An upsert_batch_size of None is resolved once the ColBERT setting
+        is known (COLBERT_UPSERT_BATCH_SIZE or UPSERT_BATCH_SIZE).
+    """
+    sync: bool = False
+    resume: bool = False
+    in_place: bool = False
+    keep_versions: int = KEEP_COLLECTION_VERSIONS
+    profile: str = COLLECTION_PROFILE
+    colbert: bool = False
+    embedding_cache_path: Optional[str] = EMBEDDING_CACHE_PATH
+    checkpoint_path: Optional[str] = None
+    pipeline: Optional[PipelineConfig] = None
+
+
 def upload_conversations_to_qdrant(
-    collection_file: str,
+    collection_file: Optional[str],
     qdrant_url: str,
     collection_name: str,
     embedding_mode: str = "balanced",
     api_key: Optional[str] = None,
     auto_confirm: bool = False,
+    chunks: Optional[Iterable[UniversalChunk]] = None,
+    options: Optional[UploadOptions] = None,
 ):
     """
     Main upload function: Load conversations, generate embeddings, upload to Qdrant
+
+    Chunks come either from a saved collection file or, when `chunks` is
+    given, straight from an iterable such as a parser's iter_chunks()
+    generator. Generators are consumed batch by batch, so memory stays flat
+    regardless of export size.
+
+    By default the upload is a blue/green rebuild: collection_name is
+    treated as an alias, the rebuild goes into a fresh versioned collection,
+    and once validated the alias is switched atomically and old versions are
+    pruned, so search keeps serving the previous version throughout. Text
+    generation, encoding and upserts run as overlapped stages (see
+    retrieval/upload_pipeline.py). Sync, resume, in-place rebuilds, the
+    embedding cache, collection profile and ColBERT vectors are set through
+    options (see UploadOptions).
     """
+    options = options or UploadOptions()
+    colbert = options.colbert
+    pipeline_config = options.pipeline
+    collection_profile = get_profile(options.profile)
 
     print("="*70)
     print("WILLGPT → QDRANT HYBRID SEARCH UPLOAD")
     print("="*70)
 
     # Load conversations
-    print(f"\n1. Loading conversations from {collection_file}...")
-    collection = ConversationCollection.load_from_json(collection_file)
-    print(f"   ✅ Loaded {len(collection.chunks)} conversation chunks")
+    total_chunks = None
+    if chunks is None:
+        print(f"\n1. Loading conversations from {collection_file}...")
+        collection = ConversationCollection.load_from_json(collection_file)
+        chunks = collection.chunks
+        print(f"   ✅ Loaded {len(chunks)} conversation chunks")
+    else:
+        print(f"\n1. Streaming conversation chunks...")
+    if hasattr(chunks, '__len__'):
+        total_chunks = len(chunks)
 
     # Initialize BGE-M3 model
     if not MODEL_NAME:
@@ -186,92 +514,232 @@ def upload_conversations_to_qdrant(
     vector_size = 1024  # BGE-M3 dense vector dimension
     print(f"   ✅ Model loaded (vector size: {vector_size}, FP16: {use_fp16})")
 
-    # Connect to Qdrant
-    print(f"\n3. Connecting to Qdrant...")
-    print(f"   URL: {qdrant_url}")
-    client = QdrantClient(
-        url=qdrant_url,
-        api_key=api_key,
-        timeout=60,
-        prefer_grpc=False,  # Use HTTP REST API
-    )
-    print(f"   ✅ Connected")
-
-    # Setup collection
-    setup_qdrant_collection(client, collection_name, vector_size, auto_confirm=auto_confirm)
-
-    # Generate embeddings and upload in batches
-    print(f"\n4. Generating embeddings and uploading (mode: {embedding_mode})...")
-    print(f"   Batch size: {BATCH_SIZE}")
-
-    points = []
-    batch_texts = []
-    batch_chunks = []
-
-    for idx, chunk in enumerate(tqdm(collection.chunks, desc="Processing")):
-        # Generate embedding text
-        embedding_text = chunk.to_embedding_text(mode=embedding_mode)
-        batch_texts.append(embedding_text)
-        batch_chunks.append(chunk)
-
-        # Process batch when full
-        if len(batch_texts) >= BATCH_SIZE or idx == len(collection.chunks) - 1:
-            # Generate embeddings (dense + sparse)
-            dense_embeddings, sparse_embeddings = generate_bge_m3_embeddings(model, batch_texts)
-
-            # Create points
-            for i, (dense_emb, sparse_weights, ch) in enumerate(zip(dense_embeddings, sparse_embeddings, batch_chunks)):
-                point_id = len(points) + i
-
-                # Convert sparse weights to Qdrant SparseVector format
-                if sparse_weights:
-                    # sparse_weights is a dict like {token_id: weight, ...}
-                    indices = list(sparse_weights.keys())
-                    values = list(sparse_weights.values())
-                    sparse_vector = SparseVector(indices=indices, values=values)
-                else:
-                    sparse_vector = SparseVector(indices=[], values=[])
-
-                point = PointStruct(
-                    id=point_id,
-                    vector={
-                        "dense": dense_emb.tolist() if hasattr(dense_emb, 'tolist') else dense_emb,
-                        "sparse": sparse_vector
-                    },
-                    payload=chunk_to_payload(ch)
-                )
-                points.append(point)
-
-            # Upload batch to Qdrant
-            if len(points) >= BATCH_SIZE:
-                client.upsert(
-                    collection_name=collection_name,
-                    points=points
-                )
-                points = []
-
-            # Reset batch
-            batch_texts = []
-            batch_chunks = []
-
-    # Upload remaining points
-    if points:
-        client.upsert(
-            collection_name=collection_name,
-            points=points
+    embedding_cache = None
+    if options.embedding_cache_path:
+        embedding_cache = EmbeddingCache(options.embedding_cache_path, MODEL_NAME)
+        print(f"   Embedding cache: {options.embedding_cache_path} ({len(embedding_cache)} entries)")
+
+    # Everything opened from here on is closed on any exit: errors, Ctrl-C,
+    # a declined alias switch. An unfinished checkpoint is kept for --resume.
+    checkpoint = None
+    client = None
+    try:
+        # Connect to Qdrant
+        print(f"\n3. Connecting to Qdrant...")
+        print(f"   URL: {qdrant_url}")
+        client = QdrantClient(
+            url=qdrant_url,
+            api_key=api_key,
+            timeout=60,
+            prefer_grpc=False,  # Use HTTP REST API
         )
+        print(f"   ✅ Connected")
+
+        # Setup collection
+        target_collection = collection_name
+        checkpoint_path = options.checkpoint_path or default_checkpoint_path(CHECKPOINT_DIR, collection_name)
+        blue_green = not (options.sync or options.in_place)
+
+        if options.sync:
+            target_collection = resolve_alias(client, collection_name) or collection_name
+            if not client.collection_exists(target_collection):
+                create_qdrant_collection(client, target_collection, vector_size, profile=collection_profile,
+                                         colbert=colbert)
+            else:
+                sync_payload_indexes(client, target_collection, payload_sample=sample_payload())
+                colbert = match_colbert_setting(client, target_collection, colbert)
+
+            print(f"\n   Fetching indexed point IDs from '{target_collection}'...")
+            indexed_points = fetch_indexed_points(client, target_collection)
+            print(f"   ✅ {len(indexed_points)} points already indexed")
+
+            current_config = embedding_config(embedding_mode)
+            seen_ids = set()
+            seen_platforms = set()
+            sync_stats = {'unchanged': 0, 'new': 0, 'reembedded': 0}
+
+            def changed_chunks(source: Iterable[UniversalChunk]) -> Iterator[UniversalChunk]:
+                """Yield only chunks not indexed with the current embedding config"""
+                for chunk in source:
+                    if chunk.chunk_id in seen_ids:
+                        continue
+                    seen_ids.add(chunk.chunk_id)
+                    seen_platforms.add(chunk.platform)
+                    indexed = indexed_points.get(chunk.chunk_id)
+                    if indexed is None:
+                        sync_stats['new'] += 1
+                    elif (indexed.payload or {}).get(EMBEDDING_CONFIG_FIELD) != current_config:
+                        # Embedded with another model or mode (or before the config was recorded)
+                        sync_stats['reembedded'] += 1
+                    else:
+                        sync_stats['unchanged'] += 1
+                        continue
+                    yield chunk
+
+            chunks = changed_chunks(chunks)
+            total_chunks = None
+        elif blue_green:
+            if options.resume:
+                # The checkpoint names the version the interrupted rebuild was writing
+                header = read_checkpoint_header(checkpoint_path)
+                target_collection = header.get("collection") if header else None
+                if target_collection is None:
+                    raise ValueError(f"❌ Error: no checkpoint at {checkpoint_path} to resume '{collection_name}' from")
+                if not is_resumable_version(client, collection_name, target_collection):
+                    raise ValueError(
+                        f"❌ Error: checkpoint {checkpoint_path} names '{target_collection}', which is live or "
+                        f"no longer exists; upload without --resume"
+                    )
+                colbert = match_colbert_setting(client, target_collection, colbert)
+            else:
+                target_collection = versioned_collection_name(collection_name)
+                create_qdrant_collection(client, target_collection, vector_size, profile=collection_profile,
+                                         colbert=colbert)
+
+                live_collection = resolve_alias(client, collection_name)
+                if live_collection is None and is_legacy_collection(client, collection_name):
+                    live_collection = collection_name
+                if live_collection:
+                    copy_payload_indexes(client, live_collection, target_collection)
+
+            print(f"   Building version '{target_collection}' (alias '{collection_name}' keeps serving search)")
+        elif options.resume:
+            if not client.collection_exists(collection_name):
+                create_qdrant_collection(client, collection_name, vector_size, profile=collection_profile,
+                                         colbert=colbert)
+            else:
+                colbert = match_colbert_setting(client, collection_name, colbert)
+        else:
+            setup_qdrant_collection(client, collection_name, vector_size, auto_confirm=auto_confirm,
+                                    profile=collection_profile, colbert=colbert)
+
+        # Durable record of acknowledged batches for --resume
+        if not options.sync:
+            checkpoint = UploadCheckpoint(
+                checkpoint_path,
+                target_collection,
+                embedding_mode,
+            )
+            checkpoint.start(resume=options.resume)
+
+            if options.resume:
+                print(f"\n   Resuming: {len(checkpoint)} chunks already uploaded ({checkpoint.path})")
+
+                def pending_chunks(source: Iterable[UniversalChunk]) -> Iterator[UniversalChunk]:
+                    """Yield only chunks not recorded in the checkpoint"""
+                    for chunk in source:
+                        if chunk.chunk_id not in checkpoint:
+                            yield chunk
+
+                chunks = pending_chunks(chunks)
+                total_chunks = None
+
+        # Generate embeddings and upload through the overlapped pipeline
+        if pipeline_config is None:
+            pipeline_config = PipelineConfig(
+                text_batch_size=TEXT_BATCH_SIZE,
+                encode_batch_size=ENCODE_MAX_BATCH_SIZE,
+                encode_token_budget=ENCODE_TOKEN_BUDGET,
+                upsert_batch_size=None,
+                queue_size=PIPELINE_QUEUE_SIZE,
+                upsert_workers=UPSERT_WORKERS,
+            )
+        if pipeline_config.upsert_batch_size is None:
+            # Only known now: sync/resume turn ColBERT on for multi-vector collections
+            pipeline_config = replace(
+                pipeline_config,
+                upsert_batch_size=COLBERT_UPSERT_BATCH_SIZE if colbert else UPSERT_BATCH_SIZE,
+            )
 
-    # Get collection info
-    collection_info = client.get_collection(collection_name)
+        print(f"\n4. Generating embeddings and uploading (mode: {embedding_mode})...")
+        print(f"   Batch sizes: text {pipeline_config.text_batch_size}, "
+              f"encode {pipeline_config.encode_batch_size}, upsert {pipeline_config.upsert_batch_size}")
+        if pipeline_config.encode_token_budget:
+            print(f"   Length-bucketed encoding: {pipeline_config.encode_token_budget} padded tokens per forward pass")
+        print(f"   Concurrent upserts: {pipeline_config.upsert_workers}")
+        if colbert:
+            print(f"   ColBERT multi-vectors: on (not cached, every chunk is encoded)")
+
+        progress_bar = tqdm(desc="Processing", total=total_chunks)
+        ingested_at = time.time()
+
+        pipeline = UploadPipeline(
+            make_text=lambda chunk: chunk.to_embedding_text(mode=embedding_mode),
+            embed=lambda texts: generate_bge_m3_embeddings(
+                model, texts, cache=embedding_cache, mode=embedding_mode,
+                batch_size=pipeline_config.encode_batch_size,
+                token_budget=pipeline_config.encode_token_budget,
+                colbert=colbert,
+            ),
+            make_point=lambda chunk, dense, sparse, colbert_vecs=None: chunk_to_point(
+                chunk, dense, sparse, colbert_vecs, ingested_at=ingested_at,
+                embedding_config=embedding_config(embedding_mode),
+            ),
+            upsert=lambda points: client.upsert(collection_name=target_collection, points=points),
+            config=pipeline_config,
+            on_batch_uploaded=(lambda points: checkpoint.mark_done(p.id for p in points)) if checkpoint is not None else None,
+            progress=progress_bar.update,
+        )
 
-    print(f"\n{'='*70}")
-    print("✅ UPLOAD COMPLETE!")
-    print(f"{'='*70}")
-    print(f"Collection: {collection_name}")
-    print(f"Total points: {collection_info.points_count}")
-    print(f"Vector size: {vector_size}")
-    print(f"Embedding mode: {embedding_mode}")
-    print(f"\n🔍 Ready for hybrid search!")
+        try:
+            pipeline.run(chunks)
+        except BaseException:
+            if checkpoint is not None:
+                print(f"\n❌ Upload interrupted after {len(checkpoint)} chunks.")
+                print(f"   Progress saved to {checkpoint.path}; rerun with --resume to continue.")
+            raise
+        finally:
+            progress_bar.close()
+
+        # Every filter the API offers must hit an index, including on older collections
+        print(f"\n   Checking payload indexes...")
+        sync_payload_indexes(client, target_collection, payload_sample=sample_payload())
+
+        # Go live: validate the new version, switch the alias, prune old versions
+        if blue_green:
+            print(f"\n   Switching alias '{collection_name}' to the new version...")
+            validate_version(client, target_collection, expected_points=len(checkpoint))
+            swap_alias(client, collection_name, target_collection, auto_confirm=auto_confirm)
+            prune_versions(client, collection_name, keep=options.keep_versions)
+
+        if checkpoint is not None:
+            checkpoint.finish()
+
+        # Remove points whose chunks disappeared from (or changed in) the export.
+        # Only the export's platforms are diffed: syncing a ChatGPT-only export
+        # into the shared collection must not delete the Claude points.
+        if options.sync:
+            stale_ids = [
+                point.id for key, point in indexed_points.items()
+                if key not in seen_ids and (point.payload or {}).get("platform") in seen_platforms
+            ]
+            if stale_ids:
+                print(f"\n   Deleting {len(stale_ids)} stale points ({', '.join(sorted(seen_platforms))})...")
+                delete_points(client, target_collection, stale_ids)
+
+            print(f"\n   Sync summary: {sync_stats['new']} embedded, {sync_stats['reembedded']} re-embedded, "
+                  f"{sync_stats['unchanged']} unchanged, {len(stale_ids)} deleted")
+
+        # Get collection info
+        collection_info = client.get_collection(target_collection)
+
+        print(f"\n{'='*70}")
+        print("✅ UPLOAD COMPLETE!")
+        print(f"{'='*70}")
+        print(f"Collection: {collection_name}" + (f" → {target_collection}" if target_collection != collection_name else ""))
+        print(f"Total points: {collection_info.points_count}")
+        print(f"Vector size: {vector_size}")
+        print(f"Embedding mode: {embedding_mode}")
+        print(f"ColBERT multi-vectors: {'yes' if colbert else 'no'}")
+        print(f"\n🔍 Ready for hybrid search!")
+
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+        if embedding_cache is not None:
+            embedding_cache.close()
+        if client is not None:
+            client.close()
 
 
 if __name__ == "__main__":
@@ -305,6 +773,89 @@ if __name__ == "__main__":
         help="Qdrant API key (or set QDRANT_API_KEY in .env)"
     )
 
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        help="Incrementally sync: embed only new/changed chunks and delete removed ones"
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted upload: keep the collection and skip chunks already uploaded"
+    )
+
+    parser.add_argument(
+        "--in-place",
+        action="store_true",
+        help="Delete and recreate the collection instead of building a new version behind the alias"
+    )
+
+    parser.add_argument(
+        "--keep-versions",
+        type=int,
+        default=KEEP_COLLECTION_VERSIONS,
+        help="Collection versions to keep after switching the alias (live + rollback targets)"
+    )
+
+    parser.add_argument(
+        "--profile",
+        default=COLLECTION_PROFILE,
+        choices=list(COLLECTION_PROFILES),
+        help=f"Dense vector quantization/HNSW profile for new collections (default: {COLLECTION_PROFILE}, "
+             f"unquantized unless COLLECTION_PROFILE says otherwise)"
+    )
+
+    parser.add_argument(
+        "--colbert",
+        action="store_true",
+        help="Also store BGE-M3 ColBERT multi-vectors (float16) for the rerank search mode; "
+             "every chunk is re-encoded, as ColBERT vectors are not served from the embedding cache"
+    )
+
+    parser.add_argument(
+        "--no-embedding-cache",
+        action="store_true",
+        help="Re-encode every chunk instead of using the on-disk embedding cache"
+    )
+
+    parser.add_argument(
+        "--text-batch-size",
+        type=int,
+        default=TEXT_BATCH_SIZE,
+        help="Chunks handed to the encoder at once"
+    )
+    parser.add_argument(
+        "--encode-batch-size",
+        type=int,
+        default=ENCODE_MAX_BATCH_SIZE,
+        help="Max texts per model forward pass"
+    )
+    parser.add_argument(
+        "--encode-token-budget",
+        type=int,
+        default=ENCODE_TOKEN_BUDGET,
+        help="Padded tokens per forward pass (0 = fixed-size batches in file order)"
+    )
+    parser.add_argument(
+        "--upsert-batch-size",
+        type=int,
+        default=None,
+        help=f"Points per Qdrant upsert request (default {UPSERT_BATCH_SIZE}, {COLBERT_UPSERT_BATCH_SIZE} with --colbert)"
+    )
+    parser.add_argument(
+        "--upsert-workers",
+        type=int,
+        default=UPSERT_WORKERS,
+        help="Number of concurrent upsert requests"
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=PIPELINE_QUEUE_SIZE,
+        help="Text batches buffered ahead of the encoder"
+    )
+
     args = parser.parse_args()
 
     if not args.api_key:
@@ -312,10 +863,31 @@ if __name__ == "__main__":
         print("   Add QDRANT_API_KEY to your .env file or pass --api-key")
         sys.exit(1)
 
-    upload_conversations_to_qdrant(
-        collection_file=args.collection_file,
-        qdrant_url=args.qdrant_url,
-        collection_name=args.collection_name,
-        embedding_mode=args.embedding_mode,
-        api_key=args.api_key,
-    )
+    try:
+        upload_conversations_to_qdrant(
+            collection_file=args.collection_file,
+            qdrant_url=args.qdrant_url,
+            collection_name=args.collection_name,
+            embedding_mode=args.embedding_mode,
+            api_key=args.api_key,
+            options=UploadOptions(
+                sync=args.sync,
+                resume=args.resume,
+                in_place=args.in_place,
+                keep_versions=args.keep_versions,
+                profile=args.profile,
+                colbert=args.colbert,
+                embedding_cache_path=None if args.no_embedding_cache else EMBEDDING_CACHE_PATH,
+                pipeline=PipelineConfig(
+                    text_batch_size=args.text_batch_size,
+                    encode_batch_size=args.encode_batch_size,
+                    encode_token_budget=args.encode_token_budget or None,
+                    upsert_batch_size=args.upsert_batch_size,
+                    queue_size=args.queue_size,
+                    upsert_workers=args.upsert_workers,
+                ),
+            ),
+        )
+    except AliasSwapDeclined as e:
+        print(f"Aborting. {e}")
+        sys.exit(0)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Tests for walking ChatGPT's conversation tree (mapping of nodes with parent/children links)
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add the project root to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from parsers import ChatGPTParser
+
+
+def node(node_id, parent, children, role="user", text=None):
+    return {
+        "id": node_id,
+        "parent": parent,
+        "children": children,
+        "message": None if role is None else {
+            "author": {"role": role},
+            "content": {"content_type": "text", "parts": [text or node_id]},
+            "create_time": 1700000000.0,
+            "metadata": {},
+        },
+    }
+
+
+def linear_mapping(length):
+    """root -> n0 -> n1 -> ... alternating user/assistant"""
+    mapping = {"root": node("root", None, ["n0"], role=None)}
+    for i in range(length):
+        parent = "root" if i == 0 else f"n{i - 1}"
+        children = [f"n{i + 1}"] if i + 1 < length else []
+        mapping[f"n{i}"] = node(f"n{i}", parent, children, role="user" if i % 2 == 0 else "assistant")
+    return mapping
+
+
+# root
+# └─ u1
+#    ├─ a1 ── u2 ── a2          (original reply, continued)
+#    └─ a1b ─ u2b ┬ a2b         (regenerated reply)
+#                 └ a2c         (current_node)
+BRANCHED = {
+    "root": node("root", None, ["u1"], role=None),
+    "u1": node("u1", "root", ["a1", "a1b"]),
+    "a1": node("a1", "u1", ["u2"], role="assistant"),
+    "u2": node("u2", "a1", ["a2"]),
+    "a2": node("a2", "u2", [], role="assistant"),
+    "a1b": node("a1b", "u1", ["u2b"], role="assistant"),
+    "u2b": node("u2b", "a1b", ["a2b", "a2c"]),
+    "a2b": node("a2b", "u2b", [], role="assistant"),
+    "a2c": node("a2c", "u2b", [], role="assistant"),
+}
+
+
+def recursive_order(mapping, node_id, visited=None):
+    """The recursive pre-order walk the explicit stack replaced"""
+    visited = set() if visited is None else visited
+    if node_id in visited or node_id not in mapping:
+        return []
+    visited.add(node_id)
+    order = [node_id] if mapping[node_id].get("message") else []
+    for child_id in mapping[node_id].get("children", []):
+        order.extend(recursive_order(mapping, child_id, visited))
+    return order
+
+
+def contents(messages):
+    return [message["content"] for message in messages]
+
+
+def test_deep_linear_tree_has_no_recursion_limit():
+    length = 5000
+    assert length > sys.getrecursionlimit()
+
+    messages = ChatGPTParser()._extract_messages_in_order(linear_mapping(length))
+
+    assert contents(messages) == [f"n{i}" for i in range(length)]
+
+
+def test_deep_conversation_parses_end_to_end(tmp_path):
+    path = tmp_path / "chatgpt.json"
+    path.write_text(json.dumps([{
+        "id": "deep", "title": "Deep", "create_time": 1700000000.0, "mapping": linear_mapping(3000),
+    }]), encoding="utf-8")
+
+    chunks = ChatGPTParser().parse_export(str(path)).chunks
+
+    assert len(chunks) == 1500
+    assert (chunks[0].user_message, chunks[-1].assistant_message) == ("n0", "n2999")
+
+
+def test_stack_walk_matches_recursive_order():
+    messages = ChatGPTParser()._extract_messages_in_order(BRANCHED)
+
+    assert contents(messages) == recursive_order(BRANCHED, "root")
+    assert contents(messages) == ["u1", "a1", "u2", "a2", "a1b", "u2b", "a2b", "a2c"]
+
+
+def test_current_branch_follows_current_node_to_root():
+    messages = ChatGPTParser(current_branch_only=True)._extract_messages_in_order(BRANCHED, current_node="a2c")
+
+    assert contents(messages) == ["u1", "a1b", "u2b", "a2c"]
+
+
+def test_unknown_current_node_falls_back_to_full_tree():
+    messages = ChatGPTParser(current_branch_only=True)._extract_messages_in_order(BRANCHED, current_node="missing")
+
+    assert contents(messages) == recursive_order(BRANCHED, "root")
+
+
+def test_current_branch_only_parse(tmp_path):
+    path = tmp_path / "chatgpt.json"
+    path.write_text(json.dumps([{
+        "id": "branched", "title": "Branched", "create_time": 1700000000.0,
+        "mapping": BRANCHED, "current_node": "a2c",
+    }]), encoding="utf-8")
+
+    every_branch = ChatGPTParser().parse_export(str(path)).chunks
+    current = ChatGPTParser(current_branch_only=True).parse_export(str(path)).chunks
+
+    assert [(c.user_message, c.assistant_message) for c in current] == [("u1", "a1b"), ("u2b", "a2c")]
+    assert len(every_branch) > len(current)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Chunk IDs must be stable across parses, including for records without IDs
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the project root to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from parsers import ChatGPTParser, ClaudeParser, ClaudeProjectsParser
+
+
+def chatgpt_conversation(title, create_time, question, answer):
+    """A minimal ChatGPT conversation without conversation_id / id"""
+    def node(node_id, parent, children, role, text, offset):
+        return {
+            "id": node_id,
+            "parent": parent,
+            "children": children,
+            "message": None if role is None else {
+                "author": {"role": role},
+                "content": {"content_type": "text", "parts": [text]},
+                "create_time": create_time + offset,
+                "metadata": {},
+            },
+        }
+
+    return {
+        "title": title,
+        "create_time": create_time,
+        "mapping": {
+            "root": node("root", None, ["u"], None, None, 0),
+            "u": node("u", "root", ["a"], "user", question, 1),
+            "a": node("a", "u", [], "assistant", answer, 2),
+        },
+    }
+
+
+def claude_conversation(name, created_at, question, answer):
+    """A minimal Claude conversation without uuid"""
+    return {
+        "name": name,
+        "created_at": created_at,
+        "chat_messages": [
+            {"sender": "human", "text": question, "created_at": created_at},
+            {"sender": "assistant", "text": answer, "created_at": created_at},
+        ],
+    }
+
+
+EXPORTS = {
+    "chatgpt": (ChatGPTParser, [
+        chatgpt_conversation("Tea", 1700000000.0, "How do I brew green tea?", "Use water around 80C."),
+        chatgpt_conversation("Coffee", 1700000100.0, "Espresso ratio?", "About 1:2."),
+    ]),
+    "claude": (ClaudeParser, [
+        claude_conversation("Tea", "2024-06-20T23:33:34Z", "How do I brew green tea?", "Use water around 80C."),
+        claude_conversation("Coffee", "2024-06-21T08:00:00Z", "Espresso ratio?", "About 1:2."),
+    ]),
+    "claude-projects": (ClaudeProjectsParser, [
+        {
+            "name": "Kitchen",
+            "description": "Recipes and notes",
+            "prompt_template": "Be concise",
+            "created_at": "2024-06-20T23:33:34Z",
+            "docs": [
+                {"filename": "tea.md", "content": "Green tea at 80C", "created_at": "2024-06-20T23:40:00Z"},
+                {"filename": "coffee.md", "content": "Espresso 1:2", "created_at": "2024-06-20T23:41:00Z"},
+            ],
+        },
+    ]),
+}
+
+
+@pytest.fixture(params=list(EXPORTS))
+def export(request, tmp_path):
+    parser_class, records = EXPORTS[request.param]
+    path = tmp_path / f"{request.param}.json"
+    path.write_text(json.dumps(records), encoding="utf-8")
+    return parser_class, str(path)
+
+
+def chunk_ids(chunks):
+    return [(chunk.conversation_id, chunk.chunk_id) for chunk in chunks]
+
+
+def test_same_export_parses_to_same_ids(export):
+    parser_class, path = export
+
+    first = chunk_ids(parser_class().parse_export(path).chunks)
+    second = chunk_ids(parser_class().parse_export(path).chunks)
+
+    assert first
+    assert first == second
+
+
+def test_streaming_and_full_parse_agree(export):
+    parser_class, path = export
+
+    assert chunk_ids(parser_class().iter_chunks(path)) == chunk_ids(parser_class().parse_export(path).chunks)
+
+
+def test_records_without_ids_stay_distinct(export):
+    parser_class, path = export
+    chunks = parser_class().parse_export(path).chunks
+
+    assert len({chunk.conversation_id for chunk in chunks}) == len(chunks)
+    assert len({chunk.chunk_id for chunk in chunks}) == len(chunks)
+
+
+def test_explicit_ids_are_kept(tmp_path):
+    conversation = claude_conversation("Tea", "2024-06-20T23:33:34Z", "Question?", "Answer.")
+    conversation["uuid"] = "c0ffee00-0000-0000-0000-000000000000"
+    path = tmp_path / "claude.json"
+    path.write_text(json.dumps([conversation]), encoding="utf-8")
+
+    (chunk,) = ClaudeParser().parse_export(str(path)).chunks
+    assert chunk.conversation_id == conversation["uuid"]
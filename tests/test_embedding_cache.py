@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent embedding cache and its encode wrappers
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add the project root to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from retrieval.embedding_cache import EmbeddingCache, cached_encode, cached_encode_colbert
+
+
+class FakeModel:
+    """Deterministic stand-in for BGE-M3 that records what it encodes"""
+
+    def __init__(self):
+        self.calls = []
+
+    def vectors(self, text):
+        dense = np.array([len(text), text.count("a"), 1.0], dtype=np.float32)
+        sparse = {str(ord(text[0])): 0.5, "7": float(len(text))}
+        colbert = np.full((len(text), 3), len(text), dtype=np.float32)
+        return dense, sparse, colbert
+
+    def encode(self, texts):
+        self.calls.append(list(texts))
+        dense, sparse, _ = zip(*(self.vectors(text) for text in texts))
+        return np.stack(dense), list(sparse)
+
+    def encode_colbert(self, texts):
+        self.calls.append(list(texts))
+        dense, sparse, colbert = zip(*(self.vectors(text) for text in texts))
+        return np.stack(dense), list(sparse), list(colbert)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    with EmbeddingCache(str(tmp_path / "embeddings.sqlite"), "fake-model") as cache:
+        yield cache
+
+
+def test_cached_encode_only_encodes_misses(cache):
+    model = FakeModel()
+    first = cached_encode(["apple", "banana", "apple"], "balanced", model.encode, cache=cache)
+    second = cached_encode(["banana", "cherry", "apple"], "balanced", model.encode, cache=cache)
+
+    assert model.calls == [["apple", "banana"], ["cherry"]]
+    np.testing.assert_array_equal(first[0][0], first[0][2])
+    np.testing.assert_array_equal(second[0][0], first[0][1])
+    assert second[1][2] == {ord("a"): 0.5, 7: 5.0}
+
+
+def test_cache_keys_include_mode(cache):
+    model = FakeModel()
+    cached_encode(["apple"], "balanced", model.encode, cache=cache)
+    cached_encode(["apple"], "minimal", model.encode, cache=cache)
+
+    assert model.calls == [["apple"], ["apple"]]
+
+
+def test_colbert_encodes_every_distinct_text(cache):
+    """The cache is not read with ColBERT: hits are encoded again, duplicates once"""
+    model = FakeModel()
+    cached_encode(["apple"], "balanced", model.encode, cache=cache)
+
+    dense, sparse, colbert = cached_encode_colbert(
+        ["apple", "kiwi", "apple"], "balanced", model.encode_colbert, cache=cache
+    )
+
+    assert model.calls[1] == ["apple", "kiwi"]
+    assert dense.shape == (3, 3)
+    assert sparse[1] == {ord("k"): 0.5, 7: 4.0}
+    assert [vecs.shape for vecs in colbert] == [(5, 3), (4, 3), (5, 3)]
+    assert all(vecs.dtype == np.float16 for vecs in colbert)
+
+
+def test_colbert_writes_dense_and_sparse_back(cache):
+    """A ColBERT upload warms the cache for later uploads without ColBERT"""
+    model = FakeModel()
+    cached_encode_colbert(["apple", "kiwi"], "balanced", model.encode_colbert, cache=cache)
+    dense, sparse = cached_encode(["kiwi", "apple"], "balanced", model.encode, cache=cache)
+
+    assert len(model.calls) == 1
+    np.testing.assert_array_equal(dense[0], model.vectors("kiwi")[0])
+    assert sparse[1] == {ord("a"): 0.5, 7: 5.0}
+
+
+def test_colbert_without_cache():
+    dense, sparse, colbert = cached_encode_colbert(["apple"], "balanced", FakeModel().encode_colbert)
+
+    assert dense.shape == (1, 3)
+    assert len(sparse) == len(colbert) == 1
+    assert cached_encode_colbert([], "balanced", FakeModel().encode_colbert)[1:] == ([], [])
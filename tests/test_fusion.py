@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for client-side fusion of dense and sparse result lists
+"""
+
+import sys
+from pathlib import Path
+from typing import Any, Optional
+
+import pytest
+from pydantic import BaseModel
+
+# Add the project root to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from retrieval.fusion import fuse, max_fuse, rrf_fuse, weighted_fuse
+
+
+class Point(BaseModel):
+    """Stand-in for qdrant_client's ScoredPoint"""
+    id: Any
+    score: float
+    vector: Optional[Any] = None
+
+
+def ranked(*ids, scores=None):
+    scores = scores or [1.0 - i / 10 for i in range(len(ids))]
+    return [Point(id=point_id, score=score) for point_id, score in zip(ids, scores)]
+
+
+def test_rrf_rank_math():
+    fused = rrf_fuse([ranked("a", "b", "c"), ranked("b", "d")], limit=10, k=10)
+
+    assert [p.id for p in fused] == ["b", "a", "d", "c"]
+    assert fused[0].score == pytest.approx(1 / 12 + 1 / 11)
+    assert fused[1].score == pytest.approx(1 / 11)
+    assert fused[2].score == pytest.approx(1 / 12)
+    assert fused[3].score == pytest.approx(1 / 13)
+
+
+def test_rrf_ignores_raw_scores():
+    """Only ranks matter: a huge raw score does not help"""
+    fused = rrf_fuse([ranked("a", "b", scores=[0.1, 0.05]), ranked("b", "a", scores=[900.0, 0.0])], limit=2)
+
+    assert fused[0].score == pytest.approx(fused[1].score)
+
+
+def test_rrf_ties_keep_first_seen_order():
+    fused = rrf_fuse([ranked("a", "b"), ranked("b", "a")], limit=2)
+
+    assert [p.id for p in fused] == ["a", "b"]
+
+
+def test_rrf_with_one_list_empty():
+    fused = rrf_fuse([ranked("a", "b", "c"), []], limit=2, k=60)
+
+    assert [p.id for p in fused] == ["a", "b"]
+    assert [p.score for p in fused] == pytest.approx([1 / 61, 1 / 62])
+
+
+def test_fused_points_are_copies():
+    dense = ranked("a")
+    fused = rrf_fuse([dense, []], limit=1)
+
+    assert fused[0] is not dense[0]
+    assert dense[0].score == 1.0
+
+
+def test_weighted_fuse_normalizes_each_list():
+    dense = ranked("a", "b", "c", scores=[0.9, 0.8, 0.7])
+    sparse = ranked("c", "a", scores=[30.0, 10.0])
+
+    fused = weighted_fuse([dense, sparse], [0.5, 0.5], limit=3)
+
+    assert [p.id for p in fused] == ["a", "c", "b"]
+    assert [p.score for p in fused] == pytest.approx([0.5, 0.5, 0.25])
+
+
+def test_weighted_fuse_constant_scores_and_empty_list():
+    fused = weighted_fuse([ranked("a", "b", scores=[0.3, 0.3]), []], [0.7, 0.3], limit=5)
+
+    assert [p.score for p in fused] == pytest.approx([0.7, 0.7])
+
+
+def test_max_fuse_keeps_best_raw_score():
+    fused = max_fuse([ranked("a", "b", scores=[0.5, 0.4]), ranked("b", scores=[0.9])], limit=5)
+
+    assert [(p.id, p.score) for p in fused] == [("b", 0.9), ("a", 0.5)]
+
+
+def test_fuse_dispatch():
+    dense, sparse = ranked("a", "b"), ranked("b")
+
+    assert [p.id for p in fuse("rrf", dense, sparse, limit=1)] == ["b"]
+    assert [p.id for p in fuse("weighted", dense, sparse, limit=2, dense_weight=1.0)] == ["a", "b"]
+    with pytest.raises(ValueError, match="rrf"):
+        fuse("borda", dense, sparse, limit=1)
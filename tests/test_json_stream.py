@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming JSON array reader used by the parsers
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the project root to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from parsers.base_parser import iter_json_array, is_json_array, read_export_sample
+
+CONVERSATIONS = [
+    {
+        "title": "Nested",
+        "mapping": {
+            "root": {"id": "root", "children": ["a"], "message": None},
+            "a": {"id": "a", "children": [], "message": {"content": {"parts": ["hi, \"there\" ]"]}}},
+        },
+        "create_time": 1700000000.25,
+    },
+    [1, [2, [3, [4]]], {"deep": [{"deeper": []}]}],
+    "a string with , and ] and [ inside",
+    12345678901234567890,
+    -0.5e-3,
+    True,
+    None,
+    {"unicode": "é 漢字 🚀", "empty": {}},
+]
+
+
+def write(tmp_path: Path, text: str) -> str:
+    path = tmp_path / "export.json"
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("read_size", [1, 2, 3, 7, 64, 1 << 16])
+def test_matches_json_load(tmp_path, read_size):
+    """Elements split across any buffer boundary decode like json.load"""
+    path = write(tmp_path, json.dumps(CONVERSATIONS, indent=2, ensure_ascii=False))
+
+    assert list(iter_json_array(path, read_size=read_size)) == json.load(open(path, encoding="utf-8"))
+
+
+@pytest.mark.parametrize("read_size", [1, 5, 1 << 16])
+def test_numbers_at_buffer_edge(tmp_path, read_size):
+    """A number ending exactly at the buffer edge is not truncated"""
+    values = [12345, 678, 9, 1000000, 3.14159]
+    path = write(tmp_path, json.dumps(values, separators=(",", ":")))
+
+    assert list(iter_json_array(path, read_size=read_size)) == values
+
+
+@pytest.mark.parametrize("text", ["[]", "  [ ]  ", "\n[\n]\n"])
+def test_empty_array(tmp_path, text):
+    assert list(iter_json_array(write(tmp_path, text), read_size=2)) == []
+
+
+def test_trailing_whitespace(tmp_path):
+    path = write(tmp_path, "\n\t [ {\"a\": 1} , {\"b\": 2} ] \n\n\t  \r\n")
+
+    assert list(iter_json_array(path, read_size=3)) == [{"a": 1}, {"b": 2}]
+
+
+@pytest.mark.parametrize("text", [
+    '[{"a": 1}, {"b": ',      # Truncated inside an element
+    '[{"a": 1}, ',            # Truncated after a comma
+    '[{"a": 1}',              # Missing closing bracket
+    '[',
+])
+def test_truncated_file(tmp_path, text):
+    with pytest.raises(ValueError):
+        list(iter_json_array(write(tmp_path, text), read_size=4))
+
+
+@pytest.mark.parametrize("text", [
+    '[{"a": }]',
+    '[1 2]',
+    '[,1]',
+    '[1,]',
+    '[1,,2]',
+    '[1]]',
+    '[1] trailing',
+    '{"a": [1]}',
+    '',
+])
+def test_malformed_file(tmp_path, text):
+    """Anything json.load rejects (or a non-array) raises ValueError"""
+    path = write(tmp_path, text)
+    if text.lstrip().startswith("["):
+        with pytest.raises(json.JSONDecodeError):
+            json.loads(text)
+
+    with pytest.raises(ValueError):
+        list(iter_json_array(path, read_size=4))
+
+
+def test_elements_before_error_are_yielded(tmp_path):
+    """Streaming consumers see every complete element before the error"""
+    elements = iter_json_array(write(tmp_path, '[1, 2, {"x": '), read_size=2)
+
+    assert next(elements) == 1
+    assert next(elements) == 2
+    with pytest.raises(ValueError):
+        next(elements)
+
+
+def test_is_json_array(tmp_path):
+    assert is_json_array(write(tmp_path, "  \n[1]"))
+    assert not is_json_array(write(tmp_path, '{"a": 1}'))
+
+
+def test_read_export_sample(tmp_path):
+    """Only the first element of an array is decoded"""
+    assert read_export_sample(write(tmp_path, json.dumps(CONVERSATIONS))) == [CONVERSATIONS[0]]
+    # A broken tail is never reached
+    assert read_export_sample(write(tmp_path, '[{"a": 1}, {"b": ')) == [{"a": 1}]
+    assert read_export_sample(write(tmp_path, "[]")) == []
+    assert read_export_sample(write(tmp_path, '{"a": 1}')) == {"a": 1}
+
+
+def test_read_export_sample_rejects_null_first_element(tmp_path):
+    """A null element means a malformed export, not an empty one"""
+    with pytest.raises(ValueError, match="null"):
+        read_export_sample(write(tmp_path, '[null, {"a": 1}]'))
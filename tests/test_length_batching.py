@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for length-bucketed BGE-M3 batching
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add the project root to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from retrieval.length_batching import (
+    MAX_SEQUENCE_LENGTH,
+    encode_length_bucketed,
+    estimate_token_counts,
+    estimate_tokens,
+    plan_batches,
+)
+
+
+def test_plan_batches_respects_budget():
+    lengths = [10, 400, 12, 8, 390, 11]
+    batches = plan_batches(lengths, token_budget=800, max_batch_size=8)
+
+    assert sorted(i for batch in batches for i in batch) == list(range(len(lengths)))
+    assert batches[0] == [1, 4]
+    assert all(len(batch) * max(lengths[i] for i in batch) <= 800 for batch in batches)
+
+
+def test_plan_batches_max_batch_size_and_oversized_text():
+    assert plan_batches([5000, 1, 1, 1], token_budget=100, max_batch_size=2) == [[0], [1, 2], [3]]
+
+
+def test_estimate_counts_bytes_not_characters():
+    """CJK text (3 bytes per character) is not underestimated"""
+    assert estimate_tokens("a" * 300) == estimate_tokens("漢" * 100)
+    assert estimate_tokens("") == 2
+    assert estimate_tokens("x" * 10 ** 6) == MAX_SEQUENCE_LENGTH
+
+
+def test_encode_preserves_input_order():
+    texts = ["short", "a much longer text " * 20, "mid length text", "x"]
+    seen = []
+
+    def encode(batch):
+        seen.append(batch)
+        return [np.array([len(text)], dtype=np.float32) for text in batch], [{len(text): 1.0} for text in batch]
+
+    dense, sparse = encode_length_bucketed(texts, encode, estimate_token_counts, token_budget=200, max_batch_size=2)
+
+    assert seen[0] == [texts[1]]
+    assert dense[:, 0].tolist() == [len(text) for text in texts]
+    assert sparse == [{len(text): 1.0} for text in texts]
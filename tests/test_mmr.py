@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tests for Maximal Marginal Relevance re-ranking
+"""
+
+import sys
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+from pydantic import BaseModel
+
+# Add the project root to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from retrieval.mmr import min_max_scale, mmr_rerank, mmr_select, normalize_rows
+
+
+class Point(BaseModel):
+    """Stand-in for qdrant_client's ScoredPoint"""
+    id: Any
+    score: float
+    vector: Optional[Any] = None
+
+
+# Two near-duplicates of the top result and one different direction
+EMBEDDINGS = normalize_rows(np.array([
+    [1.0, 0.0, 0.0],
+    [1.0, 0.0, 0.0],
+    [0.99, 0.01, 0.0],
+    [0.0, 1.0, 0.0],
+], dtype=np.float32))
+RELEVANCE = np.array([0.9, 0.85, 0.8, 0.6], dtype=np.float32)
+
+
+def test_zero_diversity_is_relevance_order():
+    relevance = np.array([0.2, 0.9, 0.5, 0.7], dtype=np.float32)
+
+    assert mmr_select(EMBEDDINGS, relevance, k=4, diversity=0.0) == [1, 3, 2, 0]
+
+
+def test_duplicates_are_pushed_down():
+    selected = mmr_select(EMBEDDINGS, RELEVANCE, k=4, diversity=0.5)
+
+    assert selected[:2] == [0, 3]
+    assert sorted(selected) == [0, 1, 2, 3]
+
+
+def test_k_larger_than_candidates_and_zero():
+    assert len(mmr_select(EMBEDDINGS, RELEVANCE, k=10)) == 4
+    assert mmr_select(EMBEDDINGS, RELEVANCE, k=0) == []
+
+
+def test_normalize_rows_keeps_zero_rows():
+    rows = normalize_rows(np.array([[3.0, 4.0], [0.0, 0.0]], dtype=np.float32))
+
+    np.testing.assert_allclose(rows, [[0.6, 0.8], [0.0, 0.0]])
+
+
+def test_min_max_scale():
+    np.testing.assert_allclose(min_max_scale(np.array([2.0, 4.0, 3.0])), [0.0, 1.0, 0.5])
+    np.testing.assert_array_equal(min_max_scale(np.array([5.0, 5.0])), [1.0, 1.0])
+
+
+def test_mmr_rerank_points():
+    points = [
+        Point(id=i, score=float(score), vector={"dense": vector.tolist()})
+        for i, (score, vector) in enumerate(zip(RELEVANCE, EMBEDDINGS))
+    ]
+
+    assert [p.id for p in mmr_rerank(points, k=2, diversity=0.5)] == [0, 3]
+    assert [p.id for p in mmr_rerank(points, k=4, diversity=0.0)] == [0, 1, 2, 3]
+    assert mmr_rerank([], k=3) == []
+
+
+def test_mmr_rerank_missing_vectors_and_scaled_scores():
+    """Points without the named vector are treated as dissimilar to everything"""
+    points = [
+        Point(id="a", score=30.0, vector={"dense": [1.0, 0.0]}),
+        Point(id="b", score=29.0, vector={"dense": [1.0, 0.0]}),
+        Point(id="c", score=10.0, vector={}),
+    ]
+
+    reranked = mmr_rerank(points, k=2, diversity=0.5, scale_relevance=True)
+
+    assert [p.id for p in reranked] == ["a", "c"]
+    assert reranked[0].score == 30.0
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for order_by pagination cursors
+
+The API maps the ValueError raised for a bad cursor to a 400 response.
+"""
+
+import base64
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the project root to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api.order_cursor import decode_cursor, encode_cursor
+
+
+@pytest.mark.parametrize("value, ids", [
+    (1718926414.25, ["0b4cfa36-5a0e-5ef4-9c43-6a1e7a3c5e11", 42]),
+    (0, []),
+    (-3, [7]),
+    (None, []),
+])
+def test_round_trip(value, ids):
+    cursor = encode_cursor(value, ids)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (value, ids)
+
+
+def forge(data) -> str:
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("cursor", [
+    "",
+    "not a cursor!",
+    "%%%%",
+    encode_cursor(1.5, ["a"])[:-3],                 # Truncated
+    encode_cursor(1.5, ["a"]) + "AAAA",             # Trailing garbage
+    forge([1.5, ["a"]]),
+    forge({"value": 1.5}),
+    forge({"value": "2024-06-20", "ids": []}),
+    forge({"value": True, "ids": []}),
+    forge({"value": {"gt": 1}, "ids": []}),
+    forge({"value": 1.5, "ids": "abc"}),
+    forge({"value": 1.5, "ids": [{"id": 1}]}),
+    forge({"value": 1.5, "ids": [None]}),
+])
+def test_tampered_or_garbage_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for the payload indexes declared on SearchFilters
+
+Needs qdrant-client; skipped when it is not installed.
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("qdrant_client")
+
+from qdrant_client.models import FloatIndexParams, FloatIndexType, PayloadIndexInfo, PayloadSchemaType
+
+# Add the project root to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api.models import SearchFilters
+from retrieval.collection_versions import INGESTED_AT_FIELD
+from retrieval.payload_indexes import (
+    SCHEMA_TYPES,
+    IndexSpec,
+    check_against_payload,
+    declared_indexes,
+    plan_indexes,
+)
+
+
+class FakeClient:
+    """get_collection() returning a fixed payload_schema"""
+
+    def __init__(self, schema):
+        self.schema = schema
+
+    def get_collection(self, collection_name):
+        return SimpleNamespace(payload_schema=self.schema)
+
+
+def index_info(schema_type, params=None):
+    return PayloadIndexInfo(data_type=schema_type, params=params, points=0)
+
+
+def test_declared_indexes_match_search_filters():
+    """Every json_schema_extra declaration becomes exactly one spec of its type"""
+    declared = {}
+    for field in SearchFilters.model_fields.values():
+        extra = field.json_schema_extra if isinstance(field.json_schema_extra, dict) else {}
+        for declaration in extra.get("payload_indexes", []):
+            declared.setdefault(declaration["field"], set()).add(SCHEMA_TYPES[declaration["type"]])
+
+    specs = {spec.field_name: spec for spec in declared_indexes()}
+
+    assert declared
+    assert set(specs) == set(declared) | {INGESTED_AT_FIELD}
+    for field_name, schema_types in declared.items():
+        assert schema_types == {specs[field_name].schema_type}
+
+
+def test_tenant_and_principal_flags():
+    specs = {spec.field_name: spec for spec in declared_indexes()}
+
+    assert specs["platform"] == IndexSpec("platform", PayloadSchemaType.KEYWORD, is_tenant=True)
+    assert specs["timestamp"].schema_type == PayloadSchemaType.FLOAT
+    assert specs["timestamp"].is_principal
+
+
+def test_plan_finds_missing_and_mismatched_indexes():
+    specs = [
+        IndexSpec("timestamp", PayloadSchemaType.FLOAT, is_principal=True),
+        IndexSpec("platform", PayloadSchemaType.KEYWORD, is_tenant=True),
+        IndexSpec("turn_number", PayloadSchemaType.INTEGER),
+        IndexSpec("conversation_start", PayloadSchemaType.FLOAT),
+    ]
+    client = FakeClient({
+        # Old collections: ISO-string timestamps under a keyword index -> rebuild
+        "timestamp": index_info(PayloadSchemaType.KEYWORD),
+        # Right type, missing tenant flag -> rebuild
+        "platform": index_info(PayloadSchemaType.KEYWORD),
+        # Matches
+        "conversation_start": index_info(PayloadSchemaType.FLOAT),
+    })
+
+    missing, mismatched = plan_indexes(client, "will-gpt", specs)
+
+    assert [spec.field_name for spec in missing] == ["turn_number"]
+    assert [spec.field_name for spec in mismatched] == ["timestamp", "platform"]
+
+
+def test_plan_accepts_matching_flags():
+    spec = IndexSpec("timestamp", PayloadSchemaType.FLOAT, is_principal=True)
+    params = FloatIndexParams(type=FloatIndexType.FLOAT, is_principal=True)
+    client = FakeClient({"timestamp": index_info(PayloadSchemaType.FLOAT, params)})
+
+    assert plan_indexes(client, "will-gpt", [spec]) == ([], [])
+
+
+def test_check_against_payload():
+    specs = [
+        IndexSpec("timestamp", PayloadSchemaType.FLOAT),
+        IndexSpec("turn_number", PayloadSchemaType.INTEGER),
+    ]
+
+    check_against_payload(specs, {"timestamp": 1700000000, "turn_number": 3})
+
+    with pytest.raises(ValueError, match="timestamp"):
+        check_against_payload(specs, {"timestamp": "2024-06-20T23:33:34+00:00", "turn_number": 3})
+    with pytest.raises(ValueError, match="not written"):
+        check_against_payload(specs, {"timestamp": 1.0})
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Tests for the query encoding micro-batcher
+"""
+
+import asyncio
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add the project root to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api.query_batcher import QueryEncodeBatcher
+
+
+class RecordingEncoder:
+    """encode_batch stand-in that records each batch and can block or fail"""
+
+    def __init__(self, error=None):
+        self.batches = []
+        self.error = error
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, texts):
+        self.batches.append(list(texts))
+        self.release.wait(5)
+        if self.error:
+            raise self.error
+        return [text.upper() for text in texts]
+
+
+def run(coroutine_fn, encoder, **kwargs):
+    """Run coroutine_fn(batcher) on a fresh loop, closing the batcher afterwards"""
+    async def main():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            batcher = QueryEncodeBatcher(encoder, executor, **kwargs)
+            try:
+                return await coroutine_fn(batcher)
+            finally:
+                await batcher.close()
+
+    return asyncio.run(main())
+
+
+def test_concurrent_queries_share_a_batch_and_are_deduplicated():
+    encoder = RecordingEncoder()
+
+    async def scenario(batcher):
+        results = await asyncio.gather(*(batcher.encode(text) for text in ["a", "b", "a", "c"]))
+        return results, batcher.stats()
+
+    results, stats = run(scenario, encoder, max_batch_size=8, max_wait_ms=50)
+
+    assert results == ["A", "B", "A", "C"]
+    assert encoder.batches == [["a", "b", "c"]]
+    assert (stats["batches"], stats["queries"], stats["avg_batch_size"]) == (1, 4, 4.0)
+
+
+def test_batch_closes_at_max_batch_size():
+    encoder = RecordingEncoder()
+
+    async def scenario(batcher):
+        return await asyncio.gather(*(batcher.encode(str(i)) for i in range(5)))
+
+    assert run(scenario, encoder, max_batch_size=2, max_wait_ms=1000) == ["0", "1", "2", "3", "4"]
+    assert encoder.batches == [["0", "1"], ["2", "3"], ["4"]]
+
+
+def test_window_flushes_without_more_queries():
+    """A lone query is encoded once the window closes, not held for company"""
+    encoder = RecordingEncoder()
+
+    async def scenario(batcher):
+        first = await asyncio.wait_for(batcher.encode("a"), timeout=2)
+        second = await asyncio.wait_for(batcher.encode("b"), timeout=2)
+        return first, second
+
+    assert run(scenario, encoder, max_batch_size=8, max_wait_ms=20) == ("A", "B")
+    assert encoder.batches == [["a"], ["b"]]
+
+
+def test_errors_reach_every_waiter():
+    encoder = RecordingEncoder(error=ValueError("model failed"))
+
+    async def scenario(batcher):
+        return await asyncio.gather(*(batcher.encode(text) for text in ["a", "b", "a"]), return_exceptions=True)
+
+    results = run(scenario, encoder, max_batch_size=8, max_wait_ms=20)
+
+    assert [type(result) for result in results] == [ValueError] * 3
+    assert len(encoder.batches) == 1
+
+
+def test_wrong_result_count_fails_the_batch():
+    async def scenario(batcher):
+        return await asyncio.gather(batcher.encode("a"), batcher.encode("b"), return_exceptions=True)
+
+    results = run(scenario, lambda texts: ["only one"], max_batch_size=8, max_wait_ms=20)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_close_with_pending_requests():
+    """In-flight batches finish; queued and forming requests fail instead of hanging"""
+    encoder = RecordingEncoder()
+    encoder.release.clear()
+
+    async def scenario(batcher):
+        in_flight = asyncio.ensure_future(batcher.encode("a"))
+        while not encoder.batches:
+            await asyncio.sleep(0.01)
+
+        # Collector is waiting for a batch slot with "b"; "c" is still queued
+        forming = [asyncio.ensure_future(batcher.encode(text)) for text in ["b", "c"]]
+        await asyncio.sleep(0.05)
+
+        closing = asyncio.ensure_future(batcher.close())
+        await asyncio.sleep(0.05)
+        encoder.release.set()
+        await asyncio.wait_for(closing, timeout=2)
+
+        results = await asyncio.wait_for(asyncio.gather(in_flight, *forming, return_exceptions=True), timeout=2)
+        return results
+
+    results = run(scenario, encoder, max_batch_size=1, max_wait_ms=1)
+
+    assert results[0] == "A"
+    assert all(isinstance(result, RuntimeError) for result in results[1:])
+    assert encoder.batches == [["a"]]
+
+
+def test_close_is_idempotent():
+    async def scenario(batcher):
+        await batcher.close()
+        await batcher.close()
+        return await batcher.encode("x")
+
+    assert run(scenario, RecordingEncoder()) == "X"
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests for the in-process query embedding cache
+"""
+
+import sys
+from pathlib import Path
+
+# Add the project root to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api.query_cache import LRUTTLCache, normalize_query
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = LRUTTLCache(max_size=4, ttl_seconds=10, clock=clock)
+    cache.put("q", "vector")
+
+    clock.now += 10
+    assert cache.get("q") == "vector"
+
+    clock.now += 0.5
+    assert cache.get("q") is None
+    assert len(cache) == 0
+    assert cache.stats()["expirations"] == 1
+
+
+def test_put_refreshes_ttl():
+    clock = FakeClock()
+    cache = LRUTTLCache(max_size=4, ttl_seconds=10, clock=clock)
+    cache.put("q", 1)
+    clock.now += 8
+    cache.put("q", 2)
+    clock.now += 8
+
+    assert cache.get("q") == 2
+
+
+def test_no_ttl_never_expires():
+    clock = FakeClock()
+    cache = LRUTTLCache(max_size=4, ttl_seconds=None, clock=clock)
+    cache.put("q", 1)
+    clock.now += 10 ** 9
+
+    assert cache.get("q") == 1
+
+
+def test_lru_eviction_follows_reads():
+    cache = LRUTTLCache(max_size=2, ttl_seconds=None, clock=FakeClock())
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")          # "b" is now least recently used
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_zero_size_disables_cache():
+    cache = LRUTTLCache(max_size=0)
+    cache.put("a", 1)
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_stats():
+    cache = LRUTTLCache(max_size=2, ttl_seconds=None, clock=FakeClock())
+    cache.put("a", 1)
+    cache.get("a")
+    cache.get("missing")
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"], stats["size"]) == (1, 1, 0.5, 1)
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.stats()["hits"] == 1
+
+
+def test_normalize_query():
+    assert normalize_query("  café   au\tlait\n") == "café au lait"
+    assert normalize_query("BGE") != normalize_query("bge")
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Server-side fusion is only switched off for servers that cannot fuse
+
+Needs the API's runtime dependencies (qdrant-client, FlagEmbedding, torch);
+skipped when they are not installed.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("FlagEmbedding")
+pytest.importorskip("qdrant_client")
+
+import httpx
+from qdrant_client.http.exceptions import UnexpectedResponse
+
+# Add the project root to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api.search_service import SearchService
+
+
+def make_service() -> SearchService:
+    """SearchService without a model or client; only the fusion state is used"""
+    service = SearchService.__new__(SearchService)
+    service._server_fusion_supported = True
+    return service
+
+
+def failing(status):
+    async def call():
+        raise UnexpectedResponse(status_code=status, reason_phrase="", content=b"", headers=httpx.Headers())
+    return call
+
+
+def returning(value, calls=None):
+    async def call():
+        if calls is not None:
+            calls.append(value)
+        return value
+    return call
+
+
+@pytest.mark.parametrize("status", [401, 429, 500, 503])
+def test_other_errors_are_raised_and_keep_server_fusion(status):
+    service = make_service()
+    fallback_calls = []
+
+    with pytest.raises(UnexpectedResponse):
+        asyncio.run(service._fuse_on_server(failing(status), returning("client", fallback_calls)))
+
+    assert service._server_fusion_supported
+    assert fallback_calls == []
+
+
+@pytest.mark.parametrize("status", [400, 404])
+def test_unsupported_server_falls_back_and_disables(status):
+    service = make_service()
+
+    assert asyncio.run(service._fuse_on_server(failing(status), returning("client"))) == "client"
+    assert not service._server_fusion_supported
+
+
+def test_failed_fallback_keeps_server_fusion():
+    """A 404 because the collection is missing mid-swap fails both ways"""
+    service = make_service()
+
+    with pytest.raises(UnexpectedResponse):
+        asyncio.run(service._fuse_on_server(failing(404), failing(404)))
+
+    assert service._server_fusion_supported
+
+
+def test_server_result_is_returned():
+    service = make_service()
+
+    assert asyncio.run(service._fuse_on_server(returning("server"), failing(500))) == "server"
+    assert service._server_fusion_supported
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for the resumable upload progress file
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the project root to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from retrieval.upload_checkpoint import UploadCheckpoint, read_checkpoint_header
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "progress" / "conversations.progress")
+
+
+def open_checkpoint(path, resume, collection="conversations", mode="balanced"):
+    checkpoint = UploadCheckpoint(path, collection, mode)
+    checkpoint.start(resume=resume)
+    return checkpoint
+
+
+def test_resume_keeps_completed_ids(path):
+    checkpoint = open_checkpoint(path, resume=False)
+    checkpoint.mark_done(["a", "b"])
+    checkpoint.mark_done(["c"])
+    checkpoint.close()
+
+    resumed = open_checkpoint(path, resume=True)
+    assert resumed.completed == {"a", "b", "c"}
+    assert "b" in resumed and "z" not in resumed
+    assert len(resumed) == 3
+
+
+def test_partial_trailing_line_is_dropped(path):
+    """A crash mid-write leaves an unterminated ID that must not count as uploaded"""
+    open_checkpoint(path, resume=False).mark_done(["a", "b"])
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("c-partial")
+
+    resumed = open_checkpoint(path, resume=True)
+    assert resumed.completed == {"a", "b"}
+
+    resumed.mark_done(["c", "d"])
+    resumed.close()
+
+    lines = Path(path).read_text(encoding="utf-8").split("\n")
+    assert lines[-4:] == ["b", "c", "d", ""]
+    assert open_checkpoint(path, resume=True).completed == {"a", "b", "c", "d"}
+
+
+def test_start_without_resume_discards_progress(path):
+    open_checkpoint(path, resume=False).mark_done(["a"])
+
+    checkpoint = open_checkpoint(path, resume=False)
+    checkpoint.close()
+
+    assert checkpoint.completed == set()
+    assert open_checkpoint(path, resume=True).completed == set()
+
+
+@pytest.mark.parametrize("collection, mode", [("other", "balanced"), ("conversations", "minimal")])
+def test_resume_refuses_other_settings(path, collection, mode):
+    open_checkpoint(path, resume=False).mark_done(["a"])
+
+    with pytest.raises(ValueError, match="--resume"):
+        open_checkpoint(path, resume=True, collection=collection, mode=mode)
+
+
+@pytest.mark.parametrize("header", ["", "not json\n", "a\nb\n"])
+def test_resume_refuses_missing_or_garbled_header(path, header):
+    Path(path).parent.mkdir(parents=True)
+    Path(path).write_text(header, encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        open_checkpoint(path, resume=True)
+
+
+def test_finish_removes_file(path):
+    checkpoint = open_checkpoint(path, resume=False)
+    assert json.loads(Path(path).read_text(encoding="utf-8").splitlines()[0]) == checkpoint.header
+
+    checkpoint.finish()
+    assert not Path(path).exists()
+    assert open_checkpoint(path, resume=True).completed == set()
+
+
+def test_read_checkpoint_header_names_the_target(path):
+    """--resume takes the version to resume from the header"""
+    open_checkpoint(path, resume=False, collection="conversations_v20251027120628").mark_done(["a"])
+
+    assert read_checkpoint_header(path) == {
+        "collection": "conversations_v20251027120628",
+        "embedding_mode": "balanced",
+    }
+
+
+def test_read_checkpoint_header_missing_or_garbled(path):
+    assert read_checkpoint_header(path) is None
+
+    Path(path).parent.mkdir(parents=True)
+    Path(path).write_text("not json\n", encoding="utf-8")
+    assert read_checkpoint_header(path) is None
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Tests for the overlapped embed/upload pipeline
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add the project root to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from retrieval.upload_pipeline import PipelineConfig, UploadPipeline
+
+
+def embed(texts):
+    """Dense vector = text length, sparse = {length: 1.0}"""
+    return [[len(text)] for text in texts], [{len(text): 1.0} for text in texts]
+
+
+def make_pipeline(upserted, config=None, **stages):
+    stages.setdefault("make_text", lambda chunk: "x" * chunk)
+    stages.setdefault("embed", embed)
+    stages.setdefault("make_point", lambda chunk, dense, sparse: (chunk, dense[0], sparse))
+    stages.setdefault("upsert", upserted.append)
+    return UploadPipeline(config=config or PipelineConfig(text_batch_size=3, upsert_batch_size=4), **stages)
+
+
+def test_every_chunk_is_upserted_with_its_own_vectors():
+    upserted, acknowledged, progress = [], [], []
+    pipeline = make_pipeline(
+        upserted,
+        config=PipelineConfig(text_batch_size=3, upsert_batch_size=4, upsert_workers=1),
+        on_batch_uploaded=acknowledged.append,
+        progress=progress.append,
+    )
+
+    assert pipeline.run(range(1, 11)) == 10
+
+    # One worker keeps upserts in submission order
+    assert [len(batch) for batch in upserted] == [4, 4, 2]
+    assert [point for batch in upserted for point in batch] == [(n, n, {n: 1.0}) for n in range(1, 11)]
+    assert acknowledged == upserted
+    assert sum(progress) == 10
+
+
+def test_concurrent_upserts_cover_all_chunks():
+    upserted = []
+    pipeline = make_pipeline(upserted, config=PipelineConfig(text_batch_size=5, upsert_batch_size=3, upsert_workers=4))
+
+    assert pipeline.run(range(1, 101)) == 100
+    assert sorted(point[0] for batch in upserted for point in batch) == list(range(1, 101))
+
+
+def test_empty_input():
+    upserted = []
+
+    assert make_pipeline(upserted).run([]) == 0
+    assert upserted == []
+
+
+def test_slow_encoder_stalls_the_text_stage():
+    """The text stage stops queue_size (+ the batch in hand) ahead of the encoder"""
+    release = threading.Event()
+    texts_made = []
+
+    def make_text(chunk):
+        texts_made.append(chunk)
+        return "x"
+
+    def blocking_embed(texts):
+        release.wait(5)
+        return embed(texts)
+
+    config = PipelineConfig(text_batch_size=2, upsert_batch_size=2, queue_size=2)
+    pipeline = make_pipeline([], config=config, make_text=make_text, embed=blocking_embed)
+    runner = threading.Thread(target=pipeline.run, args=(range(100),))
+    runner.start()
+    time.sleep(0.3)
+
+    # Batch being encoded + queue_size queued + one batch waiting to be put
+    assert len(texts_made) <= (1 + config.queue_size + 1) * config.text_batch_size
+
+    release.set()
+    runner.join(5)
+    assert len(texts_made) == 100
+
+
+def test_slow_upserts_stall_the_encoder():
+    """At most 2 × upsert_workers upserts are in flight before encoding waits"""
+    release = threading.Event()
+    embedded = []
+
+    def counting_embed(texts):
+        embedded.append(len(texts))
+        return embed(texts)
+
+    def blocking_upsert(points):
+        release.wait(5)
+
+    config = PipelineConfig(text_batch_size=1, upsert_batch_size=1, upsert_workers=2)
+    pipeline = make_pipeline([], config=config, embed=counting_embed, upsert=blocking_upsert)
+    runner = threading.Thread(target=pipeline.run, args=(range(50),))
+    runner.start()
+    time.sleep(0.3)
+
+    # Four submitted upserts, plus the batch whose submission is blocked
+    assert len(embedded) <= 2 * config.upsert_workers + 1
+
+    release.set()
+    runner.join(5)
+    assert len(embedded) == 50
+
+
+@pytest.mark.parametrize("stage", ["make_text", "embed", "make_point", "upsert"])
+def test_stage_errors_propagate(stage):
+    class StageError(Exception):
+        pass
+
+    calls = {"count": 0}
+
+    def failing(*args):
+        calls["count"] += 1
+        if calls["count"] == 2:
+            raise StageError(stage)
+        return defaults[stage](*args)
+
+    upserted = []
+    defaults = {
+        "make_text": lambda chunk: "x" * chunk,
+        "embed": embed,
+        "make_point": lambda chunk, dense, sparse: (chunk, dense[0], sparse),
+        "upsert": upserted.append,
+    }
+    acknowledged = []
+    pipeline = make_pipeline(
+        upserted,
+        config=PipelineConfig(text_batch_size=2, upsert_batch_size=2, upsert_workers=1),
+        on_batch_uploaded=acknowledged.append,
+        **{stage: failing},
+    )
+
+    with pytest.raises(StageError, match=stage):
+        pipeline.run(range(1, 41))
+
+    # A failed upsert is never acknowledged (nothing is checkpointed for it)
+    assert acknowledged == upserted